@@ -0,0 +1,81 @@
+"""
+Measure throughput of saving and loading bar data with SQL database.
+
+Database settings are taken from vt_setting.json (database.*), and can be
+changed in SETTINGS below to compare SQLite, MySQL and PostgreSQL. Bars of
+a symbol only used by benchmark are written and cleaned afterwards.
+"""
+from datetime import datetime, timedelta
+from time import perf_counter
+
+import numpy as np
+
+from howtrader.trader.constant import Exchange, Interval
+from howtrader.trader.database.database import DB_TZ
+from howtrader.trader.database.initialize import init
+from howtrader.trader.object import BarData
+from howtrader.trader.setting import get_settings
+
+
+SETTINGS = get_settings("database.")
+# SETTINGS.update({"driver": "postgresql", "database": "howtrader", "host": "localhost",
+#                  "port": 5432, "user": "postgres", "password": ""})
+
+SYMBOL = "BENCHMARK"
+
+
+def generate_bars(count: int, offset: float = 0) -> list:
+    """"""
+    start = DB_TZ.localize(datetime(2020, 1, 1))
+    rng = np.random.default_rng(0)
+    prices = (100 + rng.standard_normal(count).cumsum() + offset).tolist()
+
+    return [
+        BarData(
+            symbol=SYMBOL,
+            exchange=Exchange.BINANCE,
+            datetime=start + timedelta(minutes=i),
+            interval=Interval.MINUTE,
+            volume=1,
+            open_price=price,
+            high_price=price + 1,
+            low_price=price - 1,
+            close_price=price,
+            gateway_name="DB"
+        )
+        for i, price in enumerate(prices)
+    ]
+
+
+def measure(name: str, count: int, func, *args, **kwargs) -> None:
+    """"""
+    start = perf_counter()
+    func(*args, **kwargs)
+    cost = perf_counter() - start
+    print(f"{name:<30}{cost:>8.2f}s{count / cost:>12.0f} rows/s")
+
+
+def run_benchmark(count: int = 500000) -> None:
+    """"""
+    manager = init(SETTINGS)
+    manager.clean(SYMBOL)
+    print(f"数据库：{SETTINGS['driver']}，K线数量：{count}")
+
+    bars = generate_bars(count)
+    new_bars = generate_bars(count, 1)
+    start, end = bars[0].datetime, bars[-1].datetime
+
+    try:
+        measure("save_bar_data (insert)", count, manager.save_bar_data, bars)
+        measure("save_bar_data (update)", count, manager.save_bar_data, new_bars)
+        measure("save_bar_data (staging)", count, manager.save_bar_data, bars, staging=True)
+        measure("load_bar_data", count, manager.load_bar_data,
+                SYMBOL, Exchange.BINANCE, Interval.MINUTE, start, end)
+        measure("load_bar_series", count, manager.load_bar_series,
+                SYMBOL, Exchange.BINANCE, Interval.MINUTE, start, end)
+    finally:
+        manager.clean(SYMBOL)
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,75 @@
+"""
+Compare speed of Rounder with the original Decimal implementation of
+round_to/floor_to/ceil_to, and check that results are the same.
+"""
+import random
+from decimal import Decimal
+from math import floor, ceil
+from time import perf_counter
+
+import numpy as np
+
+from howtrader.trader.utility import get_rounder, round_to, floor_to, ceil_to
+
+
+def decimal_round_to(value: float, target: float) -> float:
+    value = Decimal(str(value))
+    target = Decimal(str(target))
+    return float(int(round(value / target)) * target)
+
+
+def decimal_floor_to(value: float, target: float) -> float:
+    value = Decimal(str(value))
+    target = Decimal(str(target))
+    return float(int(floor(value / target)) * target)
+
+
+def decimal_ceil_to(value: float, target: float) -> float:
+    value = Decimal(str(value))
+    target = Decimal(str(target))
+    return float(int(ceil(value / target)) * target)
+
+
+def measure(func, values, target) -> float:
+    start = perf_counter()
+    for value in values:
+        func(value, target)
+    return (perf_counter() - start) / len(values) * 1e9
+
+
+def run_benchmark(count: int = 200000, target: float = 0.01) -> None:
+    random.seed(0)
+    values = [random.uniform(1000, 50000) for _ in range(count)]
+    rounder = get_rounder(target)
+
+    cases = [
+        ("round", decimal_round_to, round_to, rounder.round, rounder.round_array),
+        ("floor", decimal_floor_to, floor_to, rounder.floor, rounder.floor_array),
+        ("ceil", decimal_ceil_to, ceil_to, rounder.ceil, rounder.ceil_array),
+    ]
+
+    array = np.array(values)
+
+    for name, decimal_func, func, method, array_method in cases:
+        assert [decimal_func(v, target) for v in values] == [func(v, target) for v in values]
+
+        decimal_ns = measure(decimal_func, values, target)
+        func_ns = measure(func, values, target)
+
+        start = perf_counter()
+        for value in values:
+            method(value)
+        method_ns = (perf_counter() - start) / count * 1e9
+
+        start = perf_counter()
+        array_method(array)
+        array_ns = (perf_counter() - start) / count * 1e9
+
+        print(
+            f"{name}: decimal {decimal_ns:.0f}ns, {name}_to {func_ns:.0f}ns, "
+            f"rounder {method_ns:.0f}ns, array {array_ns:.1f}ns per value"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
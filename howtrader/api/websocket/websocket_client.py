@@ -131,8 +131,9 @@ class WebsocketClient:
         return self._send_text(text)
 
     def _log(self, msg, *args):
+        # Arguments are formatted by background thread of file logger.
         logger = self.logger
-        if logger:
+        if logger and logger.isEnabledFor(logging.DEBUG):
             logger.debug(msg, *args)
 
     def _send_text(self, text: str):
@@ -2,10 +2,10 @@
 from howtrader.event import EventEngine, Event
 from howtrader.trader.engine import BaseEngine, MainEngine
 from howtrader.trader.event import (
-    EVENT_TICK, EVENT_TIMER, EVENT_ORDER, EVENT_TRADE)
+    EVENT_TICK, EVENT_ORDER, EVENT_TRADE)
 from howtrader.trader.constant import (Direction, Offset, OrderType)
 from howtrader.trader.object import (SubscribeRequest, OrderRequest, LogData)
-from howtrader.trader.utility import load_json, save_json, round_to
+from howtrader.trader.utility import load_json, json_store, round_to
 from howtrader.trader.setting import SETTINGS
 
 from .template import AlgoTemplate
@@ -79,12 +79,12 @@ class AlgoEngine(BaseEngine):
 
     def save_algo_setting(self):
         """"""
-        save_json(self.setting_filename, self.algo_settings)
+        json_store.save(self.setting_filename, self.algo_settings)
 
     def register_event(self):
         """"""
         self.event_engine.register(EVENT_TICK, self.process_tick_event)
-        self.event_engine.register(EVENT_TIMER, self.process_timer_event)
+        self.event_engine.schedule(self.process_timer, 1)
         self.event_engine.register(EVENT_ORDER, self.process_order_event)
         self.event_engine.register(EVENT_TRADE, self.process_trade_event)
 
@@ -97,8 +97,10 @@ class AlgoEngine(BaseEngine):
             for algo in algos:
                 algo.update_tick(tick)
 
-    def process_timer_event(self, event: Event):
-        """"""
+    def process_timer(self):
+        """
+        Update timer of all algos every second.
+        """
         # Generate a list of algos first to avoid dict size change
         algos = list(self.algos.values())
 
@@ -3,7 +3,7 @@ from pathlib import Path
 from howtrader.trader.app import BaseApp
 from howtrader.trader.constant import Direction
 from howtrader.trader.object import TickData, BarData, TradeData, OrderData
-from howtrader.trader.utility import BarGenerator, ArrayManager
+from howtrader.trader.utility import BarGenerator, MultiBarGenerator, ArrayManager
 
 from .base import APP_NAME, StopOrder
 from .engine import CtaEngine
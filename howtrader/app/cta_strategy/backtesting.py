@@ -1,6 +1,6 @@
 from collections import defaultdict
 from datetime import date, datetime, timedelta
-from typing import Callable
+from typing import Callable, TYPE_CHECKING
 from itertools import product
 from functools import lru_cache
 from time import time
@@ -9,16 +9,13 @@ import random
 import traceback
 
 import numpy as np
-from pandas import DataFrame
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from deap import creator, base, tools, algorithms
 
 from howtrader.trader.constant import (Direction, Offset, Exchange,
                                   Interval, Status)
 from howtrader.trader.database import database_manager
 from howtrader.trader.object import OrderData, TradeData, BarData, TickData
-from howtrader.trader.utility import round_to
+from howtrader.trader.utility import round_to, BarGenerator
+from howtrader.trader.series import BarSeries
 
 from .base import (
     BacktestingMode,
@@ -30,10 +27,22 @@ from .base import (
 )
 from .template import CtaTemplate
 
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
-# Set deap algo
-creator.create("FitnessMax", base.Fitness, weights=(1.0,))
-creator.create("Individual", list, fitness=creator.FitnessMax)
+
+# pandas, plotly and deap take long to import, so they are only imported
+# when daily result, chart or genetic optimization is really needed.
+def init_deap() -> None:
+    """
+    Create fitness and individual classes used by genetic optimization.
+    """
+    from deap import creator, base
+
+    if not hasattr(creator, "FitnessMax"):
+        creator.create("FitnessMax", base.Fitness, weights=(1.0,))
+    if not hasattr(creator, "Individual"):
+        creator.create("Individual", list, fitness=creator.FitnessMax)
 
 
 class OptimizationSetting:
@@ -128,6 +137,7 @@ class BacktestingEngine:
         self.interval = None
         self.days = 0
         self.callback = None
+        self.generator = None
         self.history_data = []
 
         self.stop_order_count = 0
@@ -154,6 +164,7 @@ class BacktestingEngine:
         self.tick = None
         self.bar = None
         self.datetime = None
+        self.generator = None
 
         self.stop_order_count = 0
         self.stop_orders.clear()
@@ -219,13 +230,19 @@ class BacktestingEngine:
             self.output("起始日期必须小于结束日期")
             return
 
-        self.history_data.clear()       # Clear previously loaded history data
+        self.history_data = []          # Clear previously loaded history data
+        series_list = []
 
         # Load 30 days of data each time and allow for progress update
         progress_delta = timedelta(days=30)
         total_delta = self.end - self.start
         interval_delta = INTERVAL_DELTA_MAP[self.interval]
 
+        # Columnar database loads whole range at once, which is only a view
+        # of stored columns (or one copy if across months).
+        if database_manager.columnar:
+            progress_delta = total_delta
+
         start = self.start
         end = self.start + progress_delta
         progress = 0
@@ -234,7 +251,7 @@ class BacktestingEngine:
             end = min(end, self.end)  # Make sure end time stays within set range
 
             if self.mode == BacktestingMode.BAR:
-                data = load_bar_data(
+                data = load_bar_series(
                     self.symbol,
                     self.exchange,
                     self.interval,
@@ -242,14 +259,14 @@ class BacktestingEngine:
                     end
                 )
             else:
-                data = load_tick_data(
+                data = load_tick_series(
                     self.symbol,
                     self.exchange,
                     start,
                     end
                 )
 
-            self.history_data.extend(data)
+            series_list.append(data)
 
             progress += progress_delta / total_delta
             progress = min(progress, 1)
@@ -259,6 +276,13 @@ class BacktestingEngine:
             start = end + interval_delta
             end += (progress_delta + interval_delta)
 
+        # History data is kept in columnar series, and data objects are
+        # created one by one when replayed.
+        if len(series_list) == 1:
+            self.history_data = series_list[0]
+        elif series_list:
+            self.history_data = series_list[0].concat(series_list)
+
         self.output(f"历史数据加载完成，数据量：{len(self.history_data)}")
 
     def run_backtesting(self):
@@ -274,21 +298,38 @@ class BacktestingEngine:
         day_count = 1
         ix = 0
 
-        for ix, data in enumerate(self.history_data):
-            if self.datetime and data.datetime.day != self.datetime.day:
-                day_count += 1
-                if day_count >= self.days:
-                    break
-
-            self.datetime = data.datetime
-
+        if (
+            self.generator
+            and self.interval == Interval.MINUTE
+            and isinstance(self.history_data, BarSeries)
+        ):
+            # Window bars of generator are aggregated at once
+            ix, count = self.get_init_range()
             try:
-                self.callback(data)
+                self.generator.update_series(self.history_data[:count], self.callback)
             except Exception:
                 self.output("触发异常，回测终止")
                 self.output(traceback.format_exc())
                 return
 
+            if count:
+                self.datetime = self.history_data[count - 1].datetime
+        else:
+            for ix, data in enumerate(self.history_data):
+                if self.datetime and data.datetime.day != self.datetime.day:
+                    day_count += 1
+                    if day_count >= self.days:
+                        break
+
+                self.datetime = data.datetime
+
+                try:
+                    self.callback(data)
+                except Exception:
+                    self.output("触发异常，回测终止")
+                    self.output(traceback.format_exc())
+                    return
+
         self.strategy.inited = True
         self.output("策略初始化完成")
 
@@ -308,6 +349,21 @@ class BacktestingEngine:
         self.strategy.on_stop()
         self.output("历史数据回放结束")
 
+    def get_init_range(self):
+        """
+        Get index where backtesting starts and number of bars used for
+        initializing strategy, same as counting days bar by bar.
+        """
+        days = self.history_data["datetime"].astype("datetime64[D]")
+        changes = np.flatnonzero(days[1:] != days[:-1]) + 1
+
+        n = max(self.days, 2) - 2
+        if n < len(changes):
+            ix = int(changes[n])
+            return ix, ix
+        else:
+            return max(len(days) - 1, 0), len(days)
+
     def calculate_result(self):
         """"""
         self.output("开始计算逐日盯市盈亏")
@@ -346,12 +402,14 @@ class BacktestingEngine:
             for key, value in daily_result.__dict__.items():
                 results[key].append(value)
 
+        from pandas import DataFrame
+
         self.daily_df = DataFrame.from_dict(results).set_index("date")
 
         self.output("逐日盯市盈亏计算完成")
         return self.daily_df
 
-    def calculate_statistics(self, df: DataFrame = None, output=True):
+    def calculate_statistics(self, df: "DataFrame" = None, output=True):
         """"""
         self.output("开始计算策略统计指标")
 
@@ -518,7 +576,7 @@ class BacktestingEngine:
         self.output("策略统计指标计算完成")
         return statistics
 
-    def show_chart(self, df: DataFrame = None):
+    def show_chart(self, df: "DataFrame" = None):
         """"""
         # Check DataFrame input exterior
         if df is None:
@@ -528,6 +586,9 @@ class BacktestingEngine:
         if df is None:
             return
 
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+
         fig = make_subplots(
             rows=4,
             cols=1,
@@ -673,6 +734,10 @@ class BacktestingEngine:
         ga_inverse = self.inverse
 
         # Set up genetic algorithem
+        from deap import creator, base, tools, algorithms
+
+        init_deap()
+
         toolbox = base.Toolbox()
         toolbox.register("individual", tools.initIterate, creator.Individual, generate_parameter)
         toolbox.register("population", tools.initRepeat, list, toolbox.individual)
@@ -939,16 +1004,19 @@ class BacktestingEngine:
         days: int,
         interval: Interval,
         callback: Callable,
-        use_database: bool
+        use_database: bool,
+        generator: BarGenerator = None
     ):
         """"""
         self.days = days
         self.callback = callback
+        self.generator = generator
 
     def load_tick(self, vt_symbol: str, days: int, callback: Callable):
         """"""
         self.days = days
         self.callback = callback
+        self.generator = None
 
     def send_order(
         self,
@@ -1311,6 +1379,33 @@ def load_tick_data(
     )
 
 
+@lru_cache(maxsize=999)
+def load_bar_series(
+    symbol: str,
+    exchange: Exchange,
+    interval: Interval,
+    start: datetime,
+    end: datetime
+):
+    """"""
+    return database_manager.load_bar_series(
+        symbol, exchange, interval, start, end
+    )
+
+
+@lru_cache(maxsize=999)
+def load_tick_series(
+    symbol: str,
+    exchange: Exchange,
+    start: datetime,
+    end: datetime
+):
+    """"""
+    return database_manager.load_tick_series(
+        symbol, exchange, start, end
+    )
+
+
 # GA related global value
 ga_end = None
 ga_mode = None
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Any, Callable
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, RLock
 from copy import copy
 from tzlocal import get_localzone
 
@@ -37,7 +38,14 @@ from howtrader.trader.constant import (
     Offset,
     Status
 )
-from howtrader.trader.utility import load_json, save_json, extract_vt_symbol, round_to
+from howtrader.trader.utility import (
+    load_json,
+    json_store,
+    extract_vt_symbol,
+    round_to,
+    BarGenerator
+)
+from howtrader.trader.series import BarSeries
 from howtrader.trader.database import database_manager
 from howtrader.trader.converter import OffsetConverter
 
@@ -69,6 +77,10 @@ class CtaEngine(BaseEngine):
 
     engine_type = EngineType.LIVE  # live trading engine
 
+    # Each strategy trades one vt_symbol. Handlers use data in event only,
+    # since OmsEngine may not have processed the same event yet.
+    shard_safe_types = (EVENT_TICK, EVENT_BAR, EVENT_ORDER, EVENT_TRADE, EVENT_POSITION)
+
     setting_filename = "cta_strategy_setting.json"
     data_filename = "cta_strategy_data.json"
 
@@ -92,6 +104,9 @@ class CtaEngine(BaseEngine):
         self.stop_order_count = 0   # for generating stop_orderid
         self.stop_orders = {}       # stop_orderid: stop_order
 
+        self.lock = Lock()          # for state shared by all vt_symbols
+        self.strategy_locks = {}    # strategy_name: lock for callbacks
+
         self.init_executor = ThreadPoolExecutor(max_workers=1)
 
         self.vt_tradeids = set()    # for filtering duplicate trade
@@ -387,8 +402,9 @@ class CtaEngine(BaseEngine):
         """
         Create a new local stop order.
         """
-        self.stop_order_count += 1
-        stop_orderid = f"{STOPORDER_PREFIX}.{self.stop_order_count}"
+        with self.lock:
+            self.stop_order_count += 1
+            stop_orderid = f"{STOPORDER_PREFIX}.{self.stop_order_count}"
 
         stop_order = StopOrder(
             vt_symbol=strategy.vt_symbol,
@@ -514,7 +530,8 @@ class CtaEngine(BaseEngine):
         days: int,
         interval: Interval,
         callback: Callable[[BarData], None],
-        use_database: bool
+        use_database: bool,
+        generator: BarGenerator = None
     ):
         """"""
         symbol, exchange = extract_vt_symbol(vt_symbol)
@@ -522,6 +539,10 @@ class CtaEngine(BaseEngine):
         start = end - timedelta(days)
         bars = []
 
+        # Window bars of generator can only be aggregated from 1 minute bars
+        if generator and interval != Interval.MINUTE:
+            generator = None
+
         # Pass gateway and database if use_database set to True
         if not use_database:
             # Query bars from gateway if available
@@ -537,6 +558,21 @@ class CtaEngine(BaseEngine):
                 )
                 bars = self.main_engine.query_history(req, contract.gateway_name)
 
+        if generator:
+            if bars:
+                series = BarSeries.from_bars(bars)
+            else:
+                series = database_manager.load_bar_series(
+                    symbol=symbol,
+                    exchange=exchange,
+                    interval=interval,
+                    start=start,
+                    end=end,
+                )
+
+            generator.update_series(series, callback)
+            return
+
         # try to load the data from database if we query no data from api.
         if not bars:
             bars = database_manager.load_bar_data(
@@ -576,18 +612,34 @@ class CtaEngine(BaseEngine):
     ):
         """
         Call function of a strategy and catch any exception raised.
+
+        Callbacks of one strategy never run concurrently, though they may
+        be called from shard workers and serial worker of event engine.
         """
-        try:
-            if params:
-                func(params)
-            else:
-                func()
-        except Exception:
-            strategy.trading = False
-            strategy.inited = False
+        with self.strategy_locks[strategy.strategy_name]:
+            try:
+                if params:
+                    func(params)
+                else:
+                    func()
+            except Exception:
+                strategy.trading = False
+                strategy.inited = False
+
+                msg = f"触发异常已停止\n{traceback.format_exc()}"
+                self.write_log(msg, strategy)
+
+    def schedule(self, strategy: CtaTemplate, func: Callable, interval: float) -> int:
+        """
+        Schedule function of a strategy to be called every interval seconds
+        while strategy is trading. Return job id for cancelling by event
+        engine.
+        """
+        def callback() -> None:
+            if strategy.trading:
+                self.call_strategy_func(strategy, func)
 
-            msg = f"触发异常已停止\n{traceback.format_exc()}"
-            self.write_log(msg, strategy)
+        return self.event_engine.schedule(callback, interval)
 
     def add_strategy(
         self, class_name: str, strategy_name: str, vt_symbol: str, setting: dict
@@ -606,6 +658,7 @@ class CtaEngine(BaseEngine):
 
         strategy = strategy_class(self, strategy_name, vt_symbol, setting)
         self.strategies[strategy_name] = strategy
+        self.strategy_locks[strategy_name] = RLock()
 
         # Add vt_symbol to strategy map.
         strategies = self.symbol_strategy_map[vt_symbol]
@@ -737,6 +790,7 @@ class CtaEngine(BaseEngine):
 
         # Remove from strategies
         self.strategies.pop(strategy_name)
+        self.strategy_locks.pop(strategy_name)
 
         return True
 
@@ -790,8 +844,9 @@ class CtaEngine(BaseEngine):
         data.pop("inited")      # Strategy status (inited, trading) should not be synced.
         data.pop("trading")
 
-        self.strategy_data[strategy.strategy_name] = data
-        save_json(self.data_filename, self.strategy_data)
+        with self.lock:
+            self.strategy_data[strategy.strategy_name] = data
+            json_store.save(self.data_filename, self.strategy_data)
 
     def get_all_strategy_class_names(self):
         """
@@ -861,7 +916,7 @@ class CtaEngine(BaseEngine):
             "vt_symbol": strategy.vt_symbol,
             "setting": setting,
         }
-        save_json(self.setting_filename, self.strategy_setting)
+        json_store.save(self.setting_filename, self.strategy_setting)
 
     def remove_strategy_setting(self, strategy_name: str):
         """
@@ -871,7 +926,7 @@ class CtaEngine(BaseEngine):
             return
 
         self.strategy_setting.pop(strategy_name)
-        save_json(self.setting_filename, self.strategy_setting)
+        json_store.save(self.setting_filename, self.strategy_setting)
 
     def put_stop_order_event(self, stop_order: StopOrder):
         """
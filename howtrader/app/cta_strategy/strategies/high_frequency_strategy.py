@@ -8,8 +8,6 @@ from howtrader.app.cta_strategy import (
 )
 
 from howtrader.app.cta_strategy.engine import CtaEngine
-from howtrader.trader.event import EVENT_TIMER
-from howtrader.event import Event
 from howtrader.trader.object import Direction, Status
 from howtrader.trader.object import GridPositionCalculator
 
@@ -47,10 +45,9 @@ class HighFrequencyStrategy(CtaTemplate):
         self.stop_orders = []
         self.profit_orders = []
 
-        self.timer_count = 0
+        self.timer_jobids = []
         self.stop_loss_interval = 0
         self.trigger_stop_loss = False
-        self.cancel_order_interval = 0
 
         self.tick: TickData = None
         self.last_filled_order: OrderData = None
@@ -66,26 +63,36 @@ class HighFrequencyStrategy(CtaTemplate):
         Callback when strategy is started.
         """
         self.write_log("策略启动")
-        self.cta_engine.event_engine.register(EVENT_TIMER, self.process_timer_event)
+
+        # Run through cta engine, so that timer callbacks never run
+        # concurrently with on_tick/on_order/on_trade.
+        self.timer_jobids = [
+            self.cta_engine.schedule(self, self.cancel_stop_orders, 60),
+            self.cta_engine.schedule(self, self.update_grid_orders, 15),
+            self.cta_engine.schedule(self, self.process_timer, 1),
+        ]
 
     def on_stop(self):
         """
         Callback when strategy is stopped.
         """
         self.write_log("策略停止")
-        self.cta_engine.event_engine.unregister(EVENT_TIMER, self.process_timer_event)
-
-    def process_timer_event(self, event: Event):
 
-        self.timer_count += 1
+        for jobid in self.timer_jobids:
+            self.cta_engine.event_engine.cancel(jobid)
+        self.timer_jobids = []
 
-        if self.timer_count >= 60:
-            self.timer_count = 0
-
-            # 撤销止损单子.
-            for vt_id in self.stop_orders:
-                self.cancel_order(vt_id)
+    def cancel_stop_orders(self):
+        """
+        撤销止损单子, 每60秒运行一次.
+        """
+        for vt_id in self.stop_orders:
+            self.cancel_order(vt_id)
 
+    def process_timer(self):
+        """
+        每秒运行一次.
+        """
         if self.trigger_stop_loss:
             self.stop_loss_interval += 1
 
@@ -109,32 +116,30 @@ class HighFrequencyStrategy(CtaTemplate):
                 vts = self.cover(price, abs(self.position_calculator.pos))
                 self.profit_orders.extend(vts)
 
-        self.cancel_order_interval += 1
-
-        if self.cancel_order_interval >= 15:
-
-            self.cancel_order_interval = 0
-
-            if abs(self.position_calculator.pos) < self.fixed_size and (len(self.long_orders) == 0 or len(self.short_orders) == 0):
-                self.cancel_all()
+    def update_grid_orders(self):
+        """
+        每15秒运行一次.
+        """
+        if abs(self.position_calculator.pos) < self.fixed_size and (len(self.long_orders) == 0 or len(self.short_orders) == 0):
+            self.cancel_all()
 
-            elif 0 < abs(self.position_calculator.pos) < (self.max_pos * self.fixed_size):
-                if self.position_calculator.pos > 0 and len(self.long_orders) == 0 and self.last_filled_order:
+        elif 0 < abs(self.position_calculator.pos) < (self.max_pos * self.fixed_size):
+            if self.position_calculator.pos > 0 and len(self.long_orders) == 0 and self.last_filled_order:
 
-                    step = self.get_step()
-                    price = self.last_filled_order.price - self.grid_step * step
-                    price = min(price, self.tick.bid_price_1 * (1 - 0.0001))
-                    ids = self.buy(price, self.fixed_size)
-                    self.long_orders.extend(ids)
+                step = self.get_step()
+                price = self.last_filled_order.price - self.grid_step * step
+                price = min(price, self.tick.bid_price_1 * (1 - 0.0001))
+                ids = self.buy(price, self.fixed_size)
+                self.long_orders.extend(ids)
 
-                elif self.position_calculator.pos < 0 and len(self.short_orders) == 0 and self.last_filled_order:
+            elif self.position_calculator.pos < 0 and len(self.short_orders) == 0 and self.last_filled_order:
 
-                    step = self.get_step()
-                    price = self.last_filled_order.price + self.grid_step * step
-                    price = max(price, self.tick.ask_price_1 * (1 + 0.0001))
+                step = self.get_step()
+                price = self.last_filled_order.price + self.grid_step * step
+                price = max(price, self.tick.ask_price_1 * (1 + 0.0001))
 
-                    ids = self.short(price, self.fixed_size)
-                    self.short_orders.extend(ids)
+                ids = self.short(price, self.fixed_size)
+                self.short_orders.extend(ids)
 
     def on_tick(self, tick: TickData):
         """
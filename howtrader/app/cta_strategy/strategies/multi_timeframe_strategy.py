@@ -5,12 +5,10 @@ from howtrader.app.cta_strategy import (
     BarData,
     TradeData,
     OrderData,
-    BarGenerator,
+    MultiBarGenerator,
     ArrayManager,
 )
 
-import pandas_ta as ta
-import pandas as pd
 
 class MultiTimeframeStrategy(CtaTemplate):
     """"""
@@ -43,10 +41,11 @@ class MultiTimeframeStrategy(CtaTemplate):
         self.rsi_long = 50 + self.rsi_signal
         self.rsi_short = 50 - self.rsi_signal
 
-        self.bg5 = BarGenerator(self.on_bar, 5, self.on_5min_bar)
-        self.am5 = ArrayManager()
+        self.bg = MultiBarGenerator(self.on_bar)
+        self.bg.add_window(5, self.on_5min_bar)
+        self.bg.add_window(15, self.on_15min_bar)
 
-        self.bg15 = BarGenerator(self.on_bar, 15, self.on_15min_bar)
+        self.am5 = ArrayManager()
         self.am15 = ArrayManager()
 
     def on_init(self):
@@ -72,14 +71,13 @@ class MultiTimeframeStrategy(CtaTemplate):
         """
         Callback of new tick data update.
         """
-        self.bg5.update_tick(tick)
+        self.bg.update_tick(tick)
 
     def on_bar(self, bar: BarData):
         """
         Callback of new bar data update.
         """
-        self.bg5.update_bar(bar)
-        self.bg15.update_bar(bar)
+        self.bg.update_bar(bar)
 
     def on_5min_bar(self, bar: BarData):
         """"""
@@ -92,8 +90,7 @@ class MultiTimeframeStrategy(CtaTemplate):
         if not self.ma_trend:
             return
 
-        close_5 = pd.Series(self.am5.close_array)
-        self.rsi_value = ta.rsi(close_5, self.rsi_window).iloc[-1]
+        self.rsi_value = self.am5.rsi(self.rsi_window)
 
         if self.pos == 0:
             if self.ma_trend > 0 and self.rsi_value >= self.rsi_long:
@@ -117,10 +114,8 @@ class MultiTimeframeStrategy(CtaTemplate):
         if not self.am15.inited:
             return
 
-        close_15 = pd.Series(self.am15.close_array)
-
-        self.fast_ma = ta.sma(close_15, self.fast_window).iloc[-1]
-        self.slow_ma = ta.sma(close_15, self.slow_window).iloc[-1]
+        self.fast_ma = self.am15.sma(self.fast_window)
+        self.slow_ma = self.am15.sma(self.slow_window)
 
         if self.fast_ma > self.slow_ma:
             self.ma_trend = 1
@@ -5,7 +5,7 @@ from typing import Any, Callable
 
 from howtrader.trader.constant import Interval, Direction, Offset
 from howtrader.trader.object import BarData, TickData, OrderData, TradeData
-from howtrader.trader.utility import virtual
+from howtrader.trader.utility import virtual, BarGenerator
 
 from .base import StopOrder, EngineType
 
@@ -229,10 +229,18 @@ class CtaTemplate(ABC):
         days: int,
         interval: Interval = Interval.MINUTE,
         callback: Callable = None,
-        use_database: bool = False
+        use_database: bool = False,
+        generator: BarGenerator = None
     ):
         """
         Load historical bar data for initializing strategy.
+
+        If bar generator is given, its window bars are aggregated from
+        history 1 minute bars at once and pushed to on_window_bar, and
+        callback only receives bars of unfinished window. This is much
+        faster for long history, but callback is not called for every
+        bar, so it should only be used when on_bar just updates the bar
+        generator.
         """
         if not callback:
             callback = self.on_bar
@@ -242,7 +250,8 @@ class CtaTemplate(ABC):
             days,
             interval,
             callback,
-            use_database
+            use_database,
+            generator
         )
 
     def load_tick(self, days: int):
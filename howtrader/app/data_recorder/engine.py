@@ -4,6 +4,7 @@ import sys
 from threading import Thread
 from queue import Queue, Empty
 from copy import copy
+from typing import List
 
 from howtrader.event import Event, EventEngine
 from howtrader.trader.engine import BaseEngine, MainEngine
@@ -15,7 +16,7 @@ from howtrader.trader.object import (
     ContractData
 )
 from howtrader.trader.event import EVENT_TICK, EVENT_CONTRACT
-from howtrader.trader.utility import load_json, save_json, BarGenerator
+from howtrader.trader.utility import load_json, json_store, BarGenerator
 from howtrader.trader.database import database_manager
 from howtrader.app.spread_trading.base import EVENT_SPREAD_DATA, SpreadData
 
@@ -60,7 +61,7 @@ class RecorderEngine(BaseEngine):
             "tick": self.tick_recordings,
             "bar": self.bar_recordings
         }
-        save_json(self.setting_filename, setting)
+        json_store.save(self.setting_filename, setting)
 
     def run(self):
         """"""
@@ -70,9 +71,9 @@ class RecorderEngine(BaseEngine):
                 task_type, data = task
 
                 if task_type == "tick":
-                    database_manager.save_tick_data([data])
+                    database_manager.save_tick_data(data)
                 elif task_type == "bar":
-                    database_manager.save_bar_data([data])
+                    database_manager.save_bar_data(data)
 
             except Empty:
                 continue
@@ -178,7 +179,7 @@ class RecorderEngine(BaseEngine):
 
     def register_event(self):
         """"""
-        self.event_engine.register(EVENT_TICK, self.process_tick_event)
+        self.event_engine.register_batch(EVENT_TICK, self.process_tick_batch)
         self.event_engine.register(EVENT_CONTRACT, self.process_contract_event)
         self.event_engine.register(EVENT_SPREAD_DATA, self.process_spread_event)
 
@@ -196,6 +197,25 @@ class RecorderEngine(BaseEngine):
         tick = event.data
         self.update_tick(tick)
 
+    def process_tick_batch(self, events: List[Event]):
+        """
+        Record ticks of a batch with one database write.
+        """
+        ticks = []
+
+        for event in events:
+            tick = event.data
+
+            if tick.vt_symbol in self.tick_recordings:
+                ticks.append(copy(tick))
+
+            if tick.vt_symbol in self.bar_recordings:
+                bg = self.get_bar_generator(tick.vt_symbol)
+                bg.update_tick(tick)
+
+        if ticks:
+            self.queue.put(("tick", ticks))
+
     def process_contract_event(self, event: Event):
         """"""
         contract = event.data
@@ -242,12 +262,12 @@ class RecorderEngine(BaseEngine):
 
     def record_tick(self, tick: TickData):
         """"""
-        task = ("tick", copy(tick))
+        task = ("tick", [copy(tick)])
         self.queue.put(task)
 
     def record_bar(self, bar: BarData):
         """"""
-        task = ("bar", copy(bar))
+        task = ("bar", [copy(bar)])
         self.queue.put(task)
 
     def get_bar_generator(self, vt_symbol: str):
@@ -4,7 +4,7 @@ from datetime import datetime
 from tzlocal import get_localzone
 
 from howtrader.event import Event, EventEngine
-from howtrader.trader.utility import extract_vt_symbol, save_json, load_json
+from howtrader.trader.utility import extract_vt_symbol, json_store, load_json
 from howtrader.trader.engine import BaseEngine, MainEngine
 from howtrader.trader.object import (
     OrderRequest, CancelRequest, SubscribeRequest,
@@ -17,8 +17,7 @@ from howtrader.trader.event import (
     EVENT_TICK,
     EVENT_POSITION,
     EVENT_CONTRACT,
-    EVENT_LOG,
-    EVENT_TIMER
+    EVENT_LOG
 )
 from howtrader.trader.constant import (
     Status,
@@ -47,7 +46,7 @@ class PaperEngine(BaseEngine):
         self.instant_trade: bool = False
 
         self.order_count: int = 100000
-        self.timer_count: int = 0
+        self.timer_jobid: int = 0
 
         self.active_orders: Dict[str, Dict[str, OrderData]] = {}
         self.gateway_map: Dict[str, str] = {}
@@ -71,7 +70,19 @@ class PaperEngine(BaseEngine):
         """"""
         self.event_engine.register(EVENT_CONTRACT, self.process_contract_event)
         self.event_engine.register(EVENT_TICK, self.process_tick_event)
-        self.event_engine.register(EVENT_TIMER, self.process_timer_event)
+
+        self.schedule_timer()
+
+    def schedule_timer(self) -> None:
+        """
+        Update position pnl every timer_interval seconds.
+        """
+        if self.timer_jobid:
+            self.event_engine.cancel(self.timer_jobid)
+
+        self.timer_jobid = self.event_engine.schedule(
+            self.update_positions, self.timer_interval
+        )
 
     def process_contract_event(self, event: Event) -> None:
         """"""
@@ -105,13 +116,8 @@ class PaperEngine(BaseEngine):
             if not order.is_active():
                 active_orders.pop(orderid)
 
-    def process_timer_event(self, event: Event) -> None:
+    def update_positions(self) -> None:
         """"""
-        self.timer_count += 1
-        if self.timer_count < self.timer_interval:
-            return
-        self.timer_count = 0
-
         for position in self.positions.values():
             contract = self.main_engine.get_contract(position.vt_symbol)
             if contract:
@@ -425,7 +431,7 @@ class PaperEngine(BaseEngine):
             }
             position_data.append(d)
 
-        save_json(self.data_filename, position_data)
+        json_store.save(self.data_filename, position_data)
 
     def load_data(self) -> None:
         """"""
@@ -455,7 +461,7 @@ class PaperEngine(BaseEngine):
             "timer_interval": self.timer_interval,
             "instant_trade": self.instant_trade
         }
-        save_json(self.setting_filename, setting)
+        json_store.save(self.setting_filename, setting)
 
     def clear_position(self) -> None:
         """"""
@@ -476,6 +482,7 @@ class PaperEngine(BaseEngine):
         """"""
         self.timer_interval = timer_interval
         self.save_setting()
+        self.schedule_timer()
 
     def set_instant_trade(self, instant_trade: bool) -> None:
         """"""
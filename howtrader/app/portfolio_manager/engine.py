@@ -13,7 +13,7 @@ from howtrader.trader.object import (
     OrderRequest, CancelRequest, SubscribeRequest,
     OrderData, TradeData, TickData, ContractData
 )
-from howtrader.trader.utility import load_json, save_json
+from howtrader.trader.utility import load_json, json_store
 
 
 APP_NAME = "PortfolioManager"
@@ -80,7 +80,7 @@ class PortfolioEngine(BaseEngine):
                 "note_text": strategy.note_text,
             }
 
-        save_json(self.setting_filename, setting)
+        json_store.save(self.setting_filename, setting)
 
     def register_event(self):
         """"""
@@ -1,14 +1,11 @@
 from collections import defaultdict
 from datetime import date, datetime, timedelta
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Set, Tuple, TYPE_CHECKING
 from functools import lru_cache
 from copy import copy
 import traceback
 
 import numpy as np
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from pandas import DataFrame
 
 from howtrader.trader.constant import Direction, Offset, Interval, Status
 from howtrader.trader.database import database_manager
@@ -17,6 +14,9 @@ from howtrader.trader.utility import round_to, extract_vt_symbol
 
 from .template import StrategyTemplate
 
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
 
 INTERVAL_DELTA_MAP = {
     Interval.MINUTE: timedelta(minutes=1),
@@ -253,12 +253,14 @@ class BacktestingEngine:
                 value = getattr(daily_result, key)
                 results[key].append(value)
 
+        from pandas import DataFrame
+
         self.daily_df = DataFrame.from_dict(results).set_index("date")
 
         self.output("逐日盯市盈亏计算完成")
         return self.daily_df
 
-    def calculate_statistics(self, df: DataFrame = None, output=True) -> None:
+    def calculate_statistics(self, df: "DataFrame" = None, output=True) -> None:
         """"""
         self.output("开始计算策略统计指标")
 
@@ -428,7 +430,7 @@ class BacktestingEngine:
         self.output("策略统计指标计算完成")
         return statistics
 
-    def show_chart(self, df: DataFrame = None) -> None:
+    def show_chart(self, df: "DataFrame" = None) -> None:
         """"""
         # Check DataFrame input exterior
         if df is None:
@@ -438,6 +440,9 @@ class BacktestingEngine:
         if df is None:
             return
 
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+
         fig = make_subplots(
             rows=4,
             cols=1,
@@ -37,7 +37,7 @@ from howtrader.trader.constant import (
     Exchange,
     Offset
 )
-from howtrader.trader.utility import load_json, save_json, extract_vt_symbol, round_to
+from howtrader.trader.utility import load_json, json_store, extract_vt_symbol, round_to
 from howtrader.trader.database import database_manager
 from howtrader.trader.converter import OffsetConverter
 
@@ -509,7 +509,7 @@ class StrategyEngine(BaseEngine):
         data.pop("trading")
 
         self.strategy_data[strategy.strategy_name] = data
-        save_json(self.data_filename, self.strategy_data)
+        json_store.save(self.data_filename, self.strategy_data)
 
     def get_all_strategy_class_names(self):
         """
@@ -581,7 +581,7 @@ class StrategyEngine(BaseEngine):
                 "setting": strategy.get_parameters()
             }
 
-        save_json(self.setting_filename, strategy_setting)
+        json_store.save(self.setting_filename, strategy_setting)
 
     def put_strategy_event(self, strategy: StrategyTemplate):
         """
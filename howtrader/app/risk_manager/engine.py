@@ -2,11 +2,11 @@
 
 from collections import defaultdict
 from howtrader.trader.object import OrderRequest, LogData
-from howtrader.event import Event, EventEngine, EVENT_TIMER
-from howtrader.trader.engine import BaseEngine, MainEngine
+from howtrader.event import Event, EventEngine
+from howtrader.trader.engine import BaseEngine, MainEngine, MIN_INTERVAL
 from howtrader.trader.event import EVENT_TRADE, EVENT_ORDER, EVENT_LOG
 from howtrader.trader.constant import Status
-from howtrader.trader.utility import load_json, save_json
+from howtrader.trader.utility import load_json, json_store
 
 
 APP_NAME = "RiskManager"
@@ -26,7 +26,7 @@ class RiskManagerEngine(BaseEngine):
         self.order_flow_limit = 50
 
         self.order_flow_clear = 1
-        self.order_flow_timer = 0
+        self.order_flow_jobid = 0
 
         self.order_size_limit = 100
 
@@ -61,7 +61,11 @@ class RiskManagerEngine(BaseEngine):
         """"""
         self.active = setting["active"]
         self.order_flow_limit = setting["order_flow_limit"]
-        self.order_flow_clear = setting["order_flow_clear"]
+
+        if setting["order_flow_clear"] != self.order_flow_clear:
+            self.order_flow_clear = setting["order_flow_clear"]
+            self.schedule_order_flow_clear()
+
         self.order_size_limit = setting["order_size_limit"]
         self.trade_limit = setting["trade_limit"]
         self.active_order_limit = setting["active_order_limit"]
@@ -96,14 +100,29 @@ class RiskManagerEngine(BaseEngine):
     def save_setting(self):
         """"""
         setting = self.get_setting()
-        save_json(self.setting_filename, setting)
+        json_store.save(self.setting_filename, setting)
 
     def register_event(self):
         """"""
         self.event_engine.register(EVENT_TRADE, self.process_trade_event)
-        self.event_engine.register(EVENT_TIMER, self.process_timer_event)
         self.event_engine.register(EVENT_ORDER, self.process_order_event)
 
+        self.schedule_order_flow_clear()
+
+    def schedule_order_flow_clear(self):
+        """
+        Reset order flow count every order_flow_clear seconds, at least
+        every second as timer event does.
+        """
+        old_jobid = self.order_flow_jobid
+
+        self.order_flow_jobid = self.event_engine.schedule(
+            self.clear_order_flow, max(self.order_flow_clear, MIN_INTERVAL)
+        )
+
+        if old_jobid:
+            self.event_engine.cancel(old_jobid)
+
     def process_order_event(self, event: Event):
         """"""
         order = event.data
@@ -116,13 +135,9 @@ class RiskManagerEngine(BaseEngine):
         trade = event.data
         self.trade_count += trade.volume
 
-    def process_timer_event(self, event: Event):
+    def clear_order_flow(self):
         """"""
-        self.order_flow_timer += 1
-
-        if self.order_flow_timer >= self.order_flow_clear:
-            self.order_flow_count = 0
-            self.order_flow_timer = 0
+        self.order_flow_count = 0
 
     def write_log(self, msg: str):
         """"""
@@ -1,11 +1,8 @@
 from collections import defaultdict
 from datetime import date, datetime
-from typing import Callable, Type
+from typing import Callable, Type, TYPE_CHECKING
 
 import numpy as np
-from pandas import DataFrame
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 
 from howtrader.trader.constant import (Direction, Offset, Exchange,
                                   Interval, Status)
@@ -14,6 +11,9 @@ from howtrader.trader.object import TradeData, BarData, TickData
 from .template import SpreadStrategyTemplate, SpreadAlgoTemplate
 from .base import SpreadData, BacktestingMode, load_bar_data, load_tick_data
 
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
 
 class BacktestingEngine:
     """"""
@@ -217,12 +217,14 @@ class BacktestingEngine:
             for key, value in daily_result.__dict__.items():
                 results[key].append(value)
 
+        from pandas import DataFrame
+
         self.daily_df = DataFrame.from_dict(results).set_index("date")
 
         self.output("逐日盯市盈亏计算完成")
         return self.daily_df
 
-    def calculate_statistics(self, df: DataFrame = None, output=True):
+    def calculate_statistics(self, df: "DataFrame" = None, output=True):
         """"""
         self.output("开始计算策略统计指标")
 
@@ -378,7 +380,7 @@ class BacktestingEngine:
 
         return statistics
 
-    def show_chart(self, df: DataFrame = None):
+    def show_chart(self, df: "DataFrame" = None):
         """"""
         # Check DataFrame input exterior
         if df is None:
@@ -388,6 +390,9 @@ class BacktestingEngine:
         if df is None:
             return
 
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+
         fig = make_subplots(
             rows=4,
             cols=1,
@@ -439,6 +439,6 @@ def load_tick_data(
     end: datetime
 ):
     """"""
-    return database_manager.load_tick_data(
+    return database_manager.load_tick_series(
         spread.name, Exchange.LOCAL, start, end
     )
@@ -6,14 +6,15 @@ from collections import defaultdict
 from copy import copy
 from pathlib import Path
 from datetime import datetime, timedelta
+from threading import Lock
 
 from howtrader.event import EventEngine, Event
 from howtrader.trader.engine import BaseEngine, MainEngine
 from howtrader.trader.event import (
     EVENT_TICK, EVENT_POSITION, EVENT_CONTRACT,
-    EVENT_ORDER, EVENT_TRADE, EVENT_TIMER
+    EVENT_ORDER, EVENT_TRADE
 )
-from howtrader.trader.utility import load_json, save_json
+from howtrader.trader.utility import load_json, json_store
 from howtrader.trader.object import (
     TickData, ContractData, LogData,
     SubscribeRequest, OrderRequest
@@ -88,6 +89,9 @@ class SpreadDataEngine:
     """"""
     setting_filename = "spread_trading_setting.json"
 
+    # Spread calculation across legs is locked
+    shard_safe_types = (EVENT_TICK, EVENT_TRADE, EVENT_POSITION)
+
     def __init__(self, spread_engine: SpreadEngine):
         """"""
         self.spread_engine: SpreadEngine = spread_engine
@@ -102,6 +106,8 @@ class SpreadDataEngine:
 
         self.tradeid_history: Set[str] = set()
 
+        self.lock: Lock = Lock()
+
     def start(self):
         """"""
         self.load_setting()
@@ -153,7 +159,7 @@ class SpreadDataEngine:
             }
             setting.append(spread_setting)
 
-        save_json(self.setting_filename, setting)
+        json_store.save(self.setting_filename, setting)
 
     def register_event(self) -> None:
         """"""
@@ -171,9 +177,10 @@ class SpreadDataEngine:
             return
         leg.update_tick(tick)
 
-        for spread in self.symbol_spread_map[tick.vt_symbol]:
-            spread.calculate_price()
-            self.put_data_event(spread)
+        with self.lock:
+            for spread in self.symbol_spread_map[tick.vt_symbol]:
+                spread.calculate_price()
+                self.put_data_event(spread)
 
     def process_position_event(self, event: Event) -> None:
         """"""
@@ -184,9 +191,10 @@ class SpreadDataEngine:
             return
         leg.update_position(position)
 
-        for spread in self.symbol_spread_map[position.vt_symbol]:
-            spread.calculate_pos()
-            self.put_pos_event(spread)
+        with self.lock:
+            for spread in self.symbol_spread_map[position.vt_symbol]:
+                spread.calculate_pos()
+                self.put_pos_event(spread)
 
     def process_trade_event(self, event: Event) -> None:
         """"""
@@ -201,9 +209,10 @@ class SpreadDataEngine:
             return
         leg.update_trade(trade)
 
-        for spread in self.symbol_spread_map[trade.vt_symbol]:
-            spread.calculate_pos()
-            self.put_pos_event(spread)
+        with self.lock:
+            for spread in self.symbol_spread_map[trade.vt_symbol]:
+                spread.calculate_pos()
+                self.put_pos_event(spread)
 
     def process_contract_event(self, event: Event) -> None:
         """"""
@@ -371,7 +380,7 @@ class SpreadAlgoEngine:
         self.event_engine.register(EVENT_ORDER, self.process_order_event)
         self.event_engine.register(EVENT_TRADE, self.process_trade_event)
         self.event_engine.register(EVENT_POSITION, self.process_position_event)
-        self.event_engine.register(EVENT_TIMER, self.process_timer_event)
+        self.event_engine.schedule(self.process_timer, 1)
         self.event_engine.register(
             EVENT_SPREAD_DATA, self.process_spread_event
         )
@@ -426,8 +435,10 @@ class SpreadAlgoEngine:
 
         self.offset_converter.update_position(position)
 
-    def process_timer_event(self, event: Event):
-        """"""
+    def process_timer(self):
+        """
+        Update timer of all active algos every second.
+        """
         buf = list(self.algos.values())
 
         for algo in buf:
@@ -690,7 +701,7 @@ class SpreadStrategyEngine:
             "spread_name": strategy.spread_name,
             "setting": setting,
         }
-        save_json(self.setting_filename, self.strategy_setting)
+        json_store.save(self.setting_filename, self.strategy_setting)
 
     def remove_strategy_setting(self, strategy_name: str):
         """
@@ -700,7 +711,7 @@ class SpreadStrategyEngine:
             return
 
         self.strategy_setting.pop(strategy_name)
-        save_json(self.setting_filename, self.strategy_setting)
+        json_store.save(self.setting_filename, self.strategy_setting)
 
     def register_event(self):
         """"""
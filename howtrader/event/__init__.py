@@ -1 +1,11 @@
-from .engine import Event, EventEngine, EVENT_TIMER
+from .engine import Event, EventEngine, EventQueue, EVENT_TIMER, EVENT_METRICS, EVENT_SCHEDULE
+from .priority import (
+    PriorityEventEngine,
+    EventLane,
+    OVERFLOW_BLOCK,
+    OVERFLOW_DROP_OLDEST,
+    DRAIN_STRICT,
+    DRAIN_WEIGHTED
+)
+from .sharded import ShardedEventEngine
+from .async_engine import AsyncEventEngine
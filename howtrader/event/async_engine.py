@@ -0,0 +1,317 @@
+"""
+Event engine running on asyncio event loop.
+"""
+import asyncio
+import inspect
+import sys
+from collections import deque
+from itertools import count
+from threading import Thread, get_ident
+from time import perf_counter
+from typing import Any, Awaitable, Deque, Dict, Optional
+
+from .engine import (
+    BatchHandlerType,
+    Event,
+    EventEngine,
+    HandlerType,
+)
+from .scheduler import JobCallback, TimerJob
+
+# Max number of events processed before yielding to other tasks of loop.
+YIELD_COUNT = 1024
+
+
+class AsyncEventEngine(EventEngine):
+    """
+    Event engine which processes events in a task of asyncio event loop,
+    instead of a thread blocking on queue.
+
+    Both plain functions and coroutine functions can be registered as
+    handlers. Plain handlers are called in order as in EventEngine.
+    Coroutines returned by coroutine handlers are awaited one by one
+    after plain handlers of the batch are called, so that their order is
+    kept too.
+
+    put can be called from any thread, e.g. threaded websocket and rest
+    clients. Timer event and scheduled jobs are run by timer handles of
+    the loop, so no scheduler thread is needed.
+    """
+
+    def __init__(
+        self,
+        interval: float = 1,
+        loop: asyncio.AbstractEventLoop = None,
+        batch_size: int = 1
+    ):
+        """
+        If loop is given, event engine runs as a task in it, and the loop
+        should be run by caller. Otherwise a new loop is created and run
+        in its own thread when event engine starts.
+        """
+        super().__init__(interval, batch_size=batch_size)
+
+        if loop:
+            self._loop: asyncio.AbstractEventLoop = loop
+            self._thread: Optional[Thread] = None
+        else:
+            self._loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+            self._thread: Optional[Thread] = Thread(target=self._run_loop)
+
+        self._loop_ident: int = 0
+        self._pending: Deque[Event] = deque()
+        self._awaitables: Deque[Awaitable] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._waiting: bool = False
+
+        self._coroutine_wrappers: Dict[Any, HandlerType] = {}
+
+        self._jobs: Dict[int, TimerJob] = {}
+        self._job_handles: Dict[int, asyncio.TimerHandle] = {}
+        self._job_counter = count(1)
+
+    def _run_loop(self) -> None:
+        """
+        Run event loop owned by event engine in its own thread.
+        """
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._run_async())
+
+    async def _run_async(self) -> None:
+        """
+        Wait until events are available, and then process them in batch.
+        """
+        self._loop_ident = get_ident()
+        self._wakeup = asyncio.Event()
+
+        while self._active:
+            if not self._pending and not self._awaitables:
+                self._wakeup.clear()
+                self._waiting = True
+
+                # Check again in case event is put before flag is set
+                if not self._pending:
+                    await self._wakeup.wait()
+                self._waiting = False
+
+            processed = 0
+            while self._pending and processed < YIELD_COUNT:
+                n = min(len(self._pending), self._batch_size)
+                events = [self._pending.popleft() for _ in range(n)]
+                self._process_batch(events)
+                processed += n
+
+                if self._awaitables:
+                    await self._await_all()
+
+            if self._awaitables:
+                await self._await_all()
+
+            # Let other tasks and timer handles of loop run
+            await asyncio.sleep(0)
+
+    async def _await_all(self) -> None:
+        """
+        Await coroutines of handlers one by one in order.
+        """
+        while self._awaitables:
+            try:
+                await self._awaitables.popleft()
+            except Exception:
+                et, ev, tb = sys.exc_info()
+                sys.excepthook(et, ev, tb)
+
+    def _wake(self) -> None:
+        """
+        Wake up processing task if it is waiting for events.
+        """
+        if not self._waiting:
+            return
+        self._waiting = False
+
+        if get_ident() == self._loop_ident:
+            self._wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _call_in_loop(self, callback: Any, *args: Any) -> None:
+        """"""
+        if get_ident() == self._loop_ident:
+            callback(*args)
+        else:
+            self._loop.call_soon_threadsafe(callback, *args)
+
+    def _wrap(self, handler: Any) -> Any:
+        """
+        Wrap coroutine function handler into plain function which keeps
+        the coroutine to be awaited.
+        """
+        if not asyncio.iscoroutinefunction(handler):
+            return handler
+
+        wrapper = self._coroutine_wrappers.get(handler, None)
+        if not wrapper:
+            def wrapper(data: Any) -> None:
+                self._awaitables.append(handler(data))
+
+            self._coroutine_wrappers[handler] = wrapper
+
+        return wrapper
+
+    def _start_job(self, job: TimerJob, delay: float) -> None:
+        """"""
+        if not job.active:
+            return
+
+        job.deadline = self._loop.time() + delay
+        self._job_handles[job.jobid] = self._loop.call_at(
+            job.deadline, self._run_job, job
+        )
+
+    def _run_job(self, job: TimerJob) -> None:
+        """
+        Run callback of job, and schedule next run if repeat.
+        """
+        if not job.active:
+            return
+
+        if job.repeat:
+            # Advance from previous deadline to avoid drift, and skip
+            # missed runs if loop has fallen behind.
+            now = self._loop.time()
+            job.deadline += job.interval
+            if job.deadline <= now:
+                missed = int((now - job.deadline) / job.interval) + 1
+                job.deadline += missed * job.interval
+
+            self._job_handles[job.jobid] = self._loop.call_at(
+                job.deadline, self._run_job, job
+            )
+        else:
+            self._jobs.pop(job.jobid, None)
+            self._job_handles.pop(job.jobid, None)
+            job.active = False
+
+        try:
+            result = job.callback()
+            if inspect.isawaitable(result):
+                self._awaitables.append(result)
+                self._wake()
+        except Exception:
+            et, ev, tb = sys.exc_info()
+            sys.excepthook(et, ev, tb)
+
+    def _cancel_job(self, jobid: int) -> None:
+        """"""
+        handle = self._job_handles.pop(jobid, None)
+        if handle:
+            handle.cancel()
+
+    def start(self) -> None:
+        """
+        Start event engine to process events and generate timer events.
+        """
+        self._active = True
+
+        if self._thread:
+            self._thread.start()
+        else:
+            asyncio.run_coroutine_threadsafe(self._run_async(), self._loop)
+
+        self._timer_job = self._jobs[self.schedule(self._put_timer_event, self._interval)]
+
+    def stop(self) -> None:
+        """
+        Stop event engine.
+        """
+        self._active = False
+
+        for jobid in list(self._jobs):
+            self.cancel(jobid)
+
+        if self._wakeup:
+            self._call_in_loop(self._wakeup.set)
+
+        if self._thread and self._thread.is_alive():
+            self._thread.join()
+
+    def schedule(
+        self,
+        callback: JobCallback,
+        interval: float,
+        repeat: bool = True,
+        delay: float = None
+    ) -> int:
+        """
+        Schedule callback function (or coroutine function) to be run in
+        event loop after delay (interval by default), and then every
+        interval seconds if repeat.
+
+        Return job id which can be used to cancel the job.
+        """
+        if interval <= 0 and repeat:
+            raise ValueError(f"定时任务间隔必须大于0：{interval}")
+
+        if delay is None:
+            delay = interval
+
+        jobid = next(self._job_counter)
+        job = TimerJob(jobid, callback, interval, repeat, 0)
+        self._jobs[jobid] = job
+
+        self._call_in_loop(self._start_job, job, delay)
+        return jobid
+
+    def cancel(self, jobid: int) -> None:
+        """
+        Cancel a scheduled job.
+        """
+        job = self._jobs.pop(jobid, None)
+        if job:
+            job.active = False
+            self._call_in_loop(self._cancel_job, jobid)
+
+    def put(self, event: Event) -> None:
+        """
+        Put an event object into pending events, thread-safe.
+        """
+        if self._metrics:
+            event.put_time = perf_counter()
+
+        self._pending.append(event)
+        if self._waiting:
+            self._wake()
+
+    def qsize(self) -> int:
+        """
+        Get number of events waiting to be processed.
+        """
+        return len(self._pending)
+
+    def register(self, type: str, handler: HandlerType) -> None:
+        """
+        Register a plain or coroutine function handler for a specific
+        event type.
+        """
+        super().register(type, self._wrap(handler))
+
+    def unregister(self, type: str, handler: HandlerType) -> None:
+        """"""
+        super().unregister(type, self._wrap(handler))
+
+    def register_batch(self, type: str, handler: BatchHandlerType) -> None:
+        """"""
+        super().register_batch(type, self._wrap(handler))
+
+    def unregister_batch(self, type: str, handler: BatchHandlerType) -> None:
+        """"""
+        super().unregister_batch(type, self._wrap(handler))
+
+    def register_general(self, handler: HandlerType) -> None:
+        """"""
+        super().register_general(self._wrap(handler))
+
+    def unregister_general(self, handler: HandlerType) -> None:
+        """"""
+        super().unregister_general(self._wrap(handler))
+
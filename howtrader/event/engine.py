@@ -3,12 +3,19 @@ Event-driven framework of vn.py framework.
 """
 import sys
 from collections import defaultdict
-from queue import Empty, Queue
+from itertools import groupby
+from operator import attrgetter
+from queue import Queue
 from threading import Thread
-from time import sleep
-from typing import Any, Callable, List
+from time import perf_counter
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+from .metrics import EventMetrics, get_handler_name
+from .scheduler import JobCallback, Scheduler, TimerJob
 
 EVENT_TIMER = "eTimer"
+EVENT_METRICS = "eMetrics"
+EVENT_SCHEDULE = "eSchedule"
 
 
 class Event:
@@ -16,17 +23,130 @@ class Event:
     Event object consists of a type string which is used
     by event engine for distributing event, and a data
     object which contains the real data.
+
+    An optional key (e.g. vt_symbol) makes the event a topic event: it is
+    distributed to handlers of the type, and also to handlers registered
+    with the keyed type string "type + key".
     """
 
-    def __init__(self, type: str, data: Any = None):
+    def __init__(self, type: str, data: Any = None, key: str = ""):
         """"""
         self.type: str = type
         self.data: Any = data
+        self.key: str = key
+        self.put_time: float = 0       # set by engine when metrics is active
+
+    @property
+    def topic(self) -> str:
+        """
+        Get full topic string of the event.
+        """
+        return self.type + self.key
 
 
 # Defines handler function to be used in event engine.
 HandlerType = Callable[[Event], None]
 
+# Defines batch handler function which receives a list of events.
+BatchHandlerType = Callable[[List[Event]], None]
+
+
+class EventQueue(Queue):
+    """
+    Event queue which also supports getting events in batch.
+    """
+
+    def get_batch(self, max_count: int, timeout: float) -> List[Event]:
+        """
+        Get up to max_count events available with one lock acquire.
+
+        Wait up to timeout seconds if the queue is empty, and return an
+        empty list if still no event is available.
+        """
+        with self.not_empty:
+            if not self._qsize():
+                self.not_empty.wait(timeout)
+
+            count = min(self._qsize(), max_count)
+            if not count:
+                return []
+
+            events = [self._get() for _ in range(count)]
+            self.not_full.notify(count)
+            return events
+
+
+class _PendingSlot:
+    """
+    Queue slot holding the latest pending event of a conflation key.
+    """
+
+    __slots__ = ("key", "event")
+
+    def __init__(self, key: Hashable, event: Event):
+        """"""
+        self.key: Hashable = key
+        self.event: Event = event
+
+
+class ConflatingQueue(EventQueue):
+    """
+    Event queue which keeps only the latest pending event per
+    (type, vt_symbol) for event types to be conflated.
+
+    A conflated event replaces the pending one in place, so it keeps the
+    queue position of the first one. Events of other types are queued
+    as usual and never dropped.
+    """
+
+    def __init__(self, maxsize: int = 0, conflate_types: Sequence[str] = ()):
+        """"""
+        self.conflate_types: tuple = tuple(conflate_types)
+        self.conflated: int = 0
+
+        super().__init__(maxsize)
+
+    def _init(self, maxsize: int) -> None:
+        """"""
+        super()._init(maxsize)
+        self._pending: Dict[Hashable, _PendingSlot] = {}
+
+    def _put(self, event: Event) -> None:
+        """
+        Called by Queue.put with the queue mutex held.
+        """
+        if not event.type.startswith(self.conflate_types):
+            self.queue.append(event)
+            return
+
+        vt_symbol = getattr(event.data, "vt_symbol", None)
+        if vt_symbol is None:
+            self.queue.append(event)
+            return
+
+        key = (event.type, vt_symbol)
+        slot = self._pending.get(key, None)
+
+        if slot:
+            slot.event = event
+            self.conflated += 1
+        else:
+            slot = _PendingSlot(key, event)
+            self._pending[key] = slot
+            self.queue.append(slot)
+
+    def _get(self) -> Event:
+        """
+        Called by Queue.get with the queue mutex held.
+        """
+        item = self.queue.popleft()
+
+        if type(item) is _PendingSlot:
+            self._pending.pop(item.key)
+            return item.event
+
+        return item
+
 
 class EventEngine:
     """
@@ -34,59 +154,195 @@ class EventEngine:
     to those handlers registered.
 
     It also generates timer event by every interval seconds,
-    which can be used for timing purpose.
+    which can be used for timing purpose. For callbacks needing
+    their own interval, use schedule function instead.
     """
 
-    def __init__(self, interval: int = 1):
+    def __init__(
+        self,
+        interval: float = 1,
+        conflate_types: Sequence[str] = (),
+        batch_size: int = 1
+    ):
         """
         Timer event is generated every 1 second by default, if
-        interval not specified.
+        interval not specified. Sub-second interval is supported.
+
+        If conflate_types is given (e.g. [EVENT_TICK]), events of those
+        types are conflated: only the latest pending one of each
+        vt_symbol stays in the queue.
+
+        If batch_size is larger than 1, all events available in queue
+        (up to batch_size) are taken out at once and processed in batch.
         """
-        self._interval: int = interval
-        self._queue: Queue = Queue()
+        self._interval: float = interval
+        self._batch_size: int = max(batch_size, 1)
+        if conflate_types:
+            self._queue: EventQueue = ConflatingQueue(conflate_types=conflate_types)
+        else:
+            self._queue: EventQueue = EventQueue()
         self._active: bool = False
         self._thread: Thread = Thread(target=self._run)
-        self._timer: Thread = Thread(target=self._run_timer)
         self._handlers: defaultdict = defaultdict(list)
         self._general_handlers: List = []
+        self._batch_handlers: defaultdict = defaultdict(list)
+
+        self._scheduler: Scheduler = Scheduler(self._dispatch_job)
+        self._timer_job: Optional[TimerJob] = None
+        self.register(EVENT_SCHEDULE, self._process_schedule)
+
+        self._metrics: Optional[EventMetrics] = None
+        self._metrics_interval: int = 0
+        self._metrics_time: float = 0
 
     def _run(self) -> None:
         """
-        Get event from queue and then process it.
+        Get events available (up to batch size) from queue and then
+        process them.
         """
         while self._active:
-            try:
-                event = self._queue.get(block=True, timeout=1)
+            events = self._queue.get_batch(self._batch_size, 1)
+            if events:
+                self._process_batch(events)
+
+    def _process_batch(self, events: List[Event]) -> None:
+        """
+        Split events into runs of consecutive events of the same type, so
+        that events are still processed in the order they are put.
+
+        For each run, first distribute events in one list to those batch
+        handlers registered listening to this type, and then process
+        every event one by one.
+        """
+        if not self._batch_handlers:
+            for event in events:
+                self._process(event)
+            return
+
+        for type, group in groupby(events, key=attrgetter("type")):
+            batch = list(group)
+
+            if type in self._batch_handlers:
+                try:
+                    [handler(batch) for handler in self._batch_handlers[type]]
+                except Exception:
+                    et, ev, tb = sys.exc_info()
+                    sys.excepthook(et, ev, tb)
+
+            for event in batch:
                 self._process(event)
-            except Empty:
-                pass
 
     def _process(self, event: Event) -> None:
         """
         First distribute event to those handlers registered listening
-        to this type.
+        to this type, and to those listening to the keyed type if the
+        event has a key.
 
         Then distribute event to those general handlers which listens
         to all types.
         """
+        self._dispatch(event, self._handlers, self._general_handlers)
+
+    def _dispatch(
+        self,
+        event: Event,
+        handlers: Dict[str, List[HandlerType]],
+        general_handlers: List[HandlerType]
+    ) -> None:
+        """
+        Distribute event to handlers of its type/topic in handlers dict,
+        and then to general handlers.
+        """
+        if self._metrics:
+            self._dispatch_with_metrics(event, handlers, general_handlers)
+            return
+
         try:
-            if event.type in self._handlers:
-                [handler(event) for handler in self._handlers[event.type]]
+            if event.type in handlers:
+                [handler(event) for handler in handlers[event.type]]
 
-            if self._general_handlers:
-                [handler(event) for handler in self._general_handlers]
+            if event.key:
+                topic = event.type + event.key
+                if topic in handlers:
+                    [handler(event) for handler in handlers[topic]]
+
+            if general_handlers:
+                [handler(event) for handler in general_handlers]
         except Exception:
             et, ev, tb = sys.exc_info()
             sys.excepthook(et, ev, tb)
 
-    def _run_timer(self) -> None:
+    def _dispatch_with_metrics(
+        self,
+        event: Event,
+        handlers: Dict[str, List[HandlerType]],
+        general_handlers: List[HandlerType]
+    ) -> None:
         """
-        Sleep by interval second(s) and then generate a timer event.
+        Same as _dispatch, but records queue wait time of the event and
+        execution time of every handler.
         """
-        while self._active:
-            sleep(self._interval)
-            event = Event(EVENT_TIMER)
-            self.put(event)
+        metrics = self._metrics
+        start = perf_counter()
+
+        if event.put_time:
+            metrics.record_event(event.type, start - event.put_time, self.qsize())
+
+        handler_list = list(handlers.get(event.type, []))
+        if event.key:
+            handler_list.extend(handlers.get(event.type + event.key, []))
+        handler_list.extend(general_handlers)
+
+        try:
+            for handler in handler_list:
+                handler(event)
+
+                end = perf_counter()
+                metrics.record_handler(get_handler_name(handler), end - start)
+                start = end
+        except Exception:
+            et, ev, tb = sys.exc_info()
+            sys.excepthook(et, ev, tb)
+
+    def _dispatch_job(self, job: TimerJob) -> None:
+        """
+        Called by scheduler thread when a job is due.
+
+        Timer event is put directly, callbacks of other jobs are put into
+        event queue so that they are run by event processing thread.
+        """
+        if job is self._timer_job:
+            self._put_timer_event()
+        else:
+            self.put(Event(EVENT_SCHEDULE, job))
+
+    def _process_schedule(self, event: Event) -> None:
+        """
+        Run callback of a scheduled job unless it is cancelled.
+        """
+        job = event.data
+        if not job.active:
+            return
+
+        if not job.repeat:
+            self._scheduler.remove_job(job.jobid)
+        job.callback()
+
+    def _put_timer_event(self) -> None:
+        """
+        Generate a timer event.
+
+        Metrics event is also generated if metrics is active.
+        """
+        event = Event(EVENT_TIMER)
+        self.put(event)
+
+        metrics = self._metrics
+        if metrics and self._metrics_interval:
+            now = perf_counter()
+            if now - self._metrics_time >= self._metrics_interval:
+                self._metrics_time = now
+                self.put(Event(EVENT_METRICS, metrics.snapshot(new_window=True)))
 
     def start(self) -> None:
         """
@@ -94,26 +350,95 @@ class EventEngine:
         """
         self._active = True
         self._thread.start()
-        self._timer.start()
+
+        self._timer_job = self._scheduler.add_job(
+            self._put_timer_event, self._interval
+        )
+        self._scheduler.start()
 
     def stop(self) -> None:
         """
         Stop event engine.
         """
         self._active = False
-        self._timer.join()
+        self._scheduler.stop()
         self._thread.join()
 
+    def schedule(
+        self,
+        callback: JobCallback,
+        interval: float,
+        repeat: bool = True,
+        delay: float = None
+    ) -> int:
+        """
+        Schedule callback function to be run by event processing thread
+        after delay (interval by default), and then every interval
+        seconds if repeat. Sub-second interval is supported.
+
+        Return job id which can be used to cancel the job.
+        """
+        job = self._scheduler.add_job(callback, interval, repeat, delay)
+        return job.jobid
+
+    def cancel(self, jobid: int) -> None:
+        """
+        Cancel a scheduled job.
+        """
+        self._scheduler.remove_job(jobid)
+
     def put(self, event: Event) -> None:
         """
         Put an event object into event queue.
         """
+        if self._metrics:
+            event.put_time = perf_counter()
         self._queue.put(event)
 
+    def qsize(self) -> int:
+        """
+        Get number of events waiting in queue.
+        """
+        return self._queue.qsize()
+
+    def set_metrics_active(self, active: bool, interval: int = 60) -> None:
+        """
+        Switch on/off metrics collection at runtime.
+
+        When active, an EVENT_METRICS event with metrics snapshot data
+        is generated every interval seconds (0 to disable).
+        """
+        if active:
+            if not self._metrics:
+                self._metrics = EventMetrics()
+                self._metrics_time = perf_counter()
+            self._metrics_interval = interval
+        else:
+            self._metrics = None
+
+    def get_metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Get metrics snapshot data, or None if metrics is not active.
+        Events per second is calculated since last EVENT_METRICS.
+        """
+        metrics = self._metrics
+        if not metrics:
+            return None
+        return metrics.snapshot()
+
+    def get_conflated_count(self) -> int:
+        """
+        Get number of events dropped by conflation since engine created.
+        """
+        return getattr(self._queue, "conflated", 0)
+
     def register(self, type: str, handler: HandlerType) -> None:
         """
         Register a new handler function for a specific event type. Every
         function can only be registered once for each event type.
+
+        Keyed type string (e.g. EVENT_TICK + vt_symbol) receives topic
+        events of that key only.
         """
         handler_list = self._handlers[type]
         if handler not in handler_list:
@@ -131,6 +456,32 @@ class EventEngine:
         if not handler_list:
             self._handlers.pop(type)
 
+    def register_batch(self, type: str, handler: BatchHandlerType) -> None:
+        """
+        Register a new batch handler function for a specific event type,
+        which receives consecutive events of this type taken from queue
+        at once in one batch as a list.
+
+        Batch handlers of a batch are called before processing every
+        event of it with normal handlers, and after processing all
+        events put before the batch.
+        """
+        handler_list = self._batch_handlers[type]
+        if handler not in handler_list:
+            handler_list.append(handler)
+
+    def unregister_batch(self, type: str, handler: BatchHandlerType) -> None:
+        """
+        Unregister an existing batch handler function from event engine.
+        """
+        handler_list = self._batch_handlers[type]
+
+        if handler in handler_list:
+            handler_list.remove(handler)
+
+        if not handler_list:
+            self._batch_handlers.pop(type)
+
     def register_general(self, handler: HandlerType) -> None:
         """
         Register a new handler function for all event types. Every
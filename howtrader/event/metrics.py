@@ -0,0 +1,162 @@
+"""
+Runtime instrumentation of event engine.
+"""
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Dict, List
+
+# Histogram buckets are powers of 2 in microseconds: bucket n counts
+# durations in [2^(n-1), 2^n) us, the last bucket is open-ended.
+BUCKET_COUNT = 26
+
+
+class LatencyHistogram:
+    """
+    Fixed-size log2 histogram of durations.
+    """
+
+    def __init__(self):
+        """"""
+        self.count: int = 0
+        self.total: float = 0
+        self.max: float = 0
+        self.buckets: List[int] = [0] * BUCKET_COUNT
+
+    def add(self, duration: float) -> None:
+        """
+        Add a duration in seconds.
+        """
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+        n = int(duration * 1_000_000).bit_length()
+        if n >= BUCKET_COUNT:
+            n = BUCKET_COUNT - 1
+        self.buckets[n] += 1
+
+    def percentile(self, q: float) -> float:
+        """
+        Get approximate percentile (upper bound of bucket) in seconds.
+        """
+        if not self.count:
+            return 0
+
+        target = self.count * q
+        accumulated = 0
+        for n, c in enumerate(self.buckets):
+            accumulated += c
+            if accumulated >= target:
+                return min((1 << n) / 1_000_000, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """"""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "buckets": list(self.buckets),
+        }
+
+
+class EventMetrics:
+    """
+    Collects queue wait time per event type, execution time per handler,
+    queue depth high-water mark and event throughput.
+    """
+
+    def __init__(self):
+        """"""
+        self.start_time: float = perf_counter()
+        self.event_count: int = 0
+        self.depth_max: int = 0
+
+        self.wait_histograms: Dict[str, LatencyHistogram] = {}
+        self.handler_histograms: Dict[str, LatencyHistogram] = {}
+
+        self._last_time: float = self.start_time
+        self._last_count: int = 0
+
+    def record_event(self, type: str, wait: float, depth: int) -> None:
+        """
+        Record an event taken from queue.
+        """
+        self.event_count += 1
+
+        if depth > self.depth_max:
+            self.depth_max = depth
+
+        histogram = self.wait_histograms.get(type, None)
+        if not histogram:
+            histogram = LatencyHistogram()
+            self.wait_histograms[type] = histogram
+        histogram.add(wait)
+
+    def record_handler(self, name: str, duration: float) -> None:
+        """
+        Record execution time of a handler.
+        """
+        histogram = self.handler_histograms.get(name, None)
+        if not histogram:
+            histogram = LatencyHistogram()
+            self.handler_histograms[name] = histogram
+        histogram.add(duration)
+
+    def snapshot(self, new_window: bool = False) -> Dict[str, Any]:
+        """
+        Get current metrics data. Events per second is calculated since
+        start of current rate window, and a new window is started after
+        this snapshot only if new_window, so that reading metrics at any
+        time does not change the rate reported periodically.
+        """
+        now = perf_counter()
+        elapsed = now - self._last_time
+        count = self.event_count - self._last_count
+
+        if new_window:
+            self._last_time = now
+            self._last_count = self.event_count
+
+        return {
+            "datetime": datetime.now(),
+            "uptime": now - self.start_time,
+            "events": self.event_count,
+            "events_per_second": count / elapsed if elapsed else 0,
+            "queue_depth_max": self.depth_max,
+            "wait": {k: v.to_dict() for k, v in list(self.wait_histograms.items())},
+            "handlers": {k: v.to_dict() for k, v in list(self.handler_histograms.items())},
+        }
+
+
+def get_handler_name(handler: Any) -> str:
+    """
+    Get readable name of handler function, e.g. OmsEngine.process_tick_event
+    """
+    return getattr(handler, "__qualname__", None) or repr(handler)
+
+
+def format_metrics(data: Dict[str, Any], top: int = 3) -> str:
+    """
+    Format metrics snapshot into one line of log message, with the
+    slowest handlers by max execution time.
+    """
+    handlers = sorted(
+        data["handlers"].items(),
+        key=lambda item: item[1]["max"],
+        reverse=True
+    )[:top]
+
+    slowest = ", ".join(
+        f"{name} p99={d['p99'] * 1000:.3f}ms max={d['max'] * 1000:.3f}ms"
+        for name, d in handlers
+    )
+
+    return (
+        f"事件引擎统计：{data['events_per_second']:.1f}事件/秒，"
+        f"队列最大深度{data['queue_depth_max']}，"
+        f"最慢处理函数：{slowest}"
+    )
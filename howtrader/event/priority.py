@@ -0,0 +1,280 @@
+"""
+Multi-lane priority event engine.
+
+Events are classified into lanes by type prefix. Each lane has its own
+queue capacity and overflow behaviour, and a single worker thread drains
+the lanes by the configured drain policy, so that order/trade events are
+never stuck behind a burst of market data.
+"""
+from queue import Empty, Full, Queue
+from threading import Lock, Semaphore
+from time import perf_counter
+from typing import Dict, List, Sequence
+
+from .engine import ConflatingQueue, Event, EventEngine
+
+# Overflow behaviour of a lane when its capacity is reached.
+OVERFLOW_BLOCK = "block"                # producer waits until space is available
+OVERFLOW_DROP_OLDEST = "drop_oldest"    # oldest pending event is discarded
+
+# Drain policy of the priority event engine.
+DRAIN_STRICT = "strict"         # always serve the highest non-empty lane first,
+                                # lower lanes may starve during bursts
+DRAIN_WEIGHTED = "weighted"     # weighted round robin by lane weight
+
+
+class EventLane:
+    """
+    Event lane holds events whose type starts with one of its prefixes.
+
+    A lane with no prefixes is the default lane, which receives all event
+    types not claimed by any other lane.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        prefixes: Sequence[str] = (),
+        capacity: int = 0,
+        overflow: str = OVERFLOW_BLOCK,
+        weight: int = 1,
+        conflate_types: Sequence[str] = ()
+    ):
+        """
+        Capacity of 0 means the lane queue is unbounded. Events of
+        conflate_types keep only the latest pending one per vt_symbol.
+        """
+        if overflow not in (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST):
+            raise ValueError(f"不支持的溢出处理方式：{overflow}")
+
+        self.name: str = name
+        self.prefixes: tuple = tuple(prefixes)
+        self.capacity: int = capacity
+        self.overflow: str = overflow
+        self.weight: int = max(weight, 1)
+
+        self.dropped: int = 0
+
+        if conflate_types:
+            self._queue: Queue = ConflatingQueue(capacity, conflate_types)
+        else:
+            self._queue: Queue = Queue(maxsize=capacity)
+        self._lock: Lock = Lock()
+
+    def match(self, type: str) -> bool:
+        """
+        Check if event type belongs to this lane.
+        """
+        return type.startswith(self.prefixes)
+
+    def put(self, event: Event) -> None:
+        """
+        Put event into lane queue, obeying the overflow behaviour.
+        """
+        if self.overflow == OVERFLOW_BLOCK:
+            self._queue.put(event)
+            return
+
+        with self._lock:
+            try:
+                self._queue.put_nowait(event)
+            except Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except Empty:
+                    pass
+                self._queue.put_nowait(event)
+
+    def get(self) -> Event:
+        """
+        Get next event from lane queue without blocking.
+
+        Raises queue.Empty if the lane has no pending event.
+        """
+        return self._queue.get_nowait()
+
+    def qsize(self) -> int:
+        """
+        Get number of pending events in the lane.
+        """
+        return self._queue.qsize()
+
+    @property
+    def conflated(self) -> int:
+        """
+        Get number of events dropped by conflation.
+        """
+        return getattr(self._queue, "conflated", 0)
+
+
+def get_default_lanes() -> List[EventLane]:
+    """
+    Create default lanes: order/trade/position/contract first, then ticks,
+    then all the other events such as bar, log and timer.
+
+    Only ticks are dropped when the market lane is full, since a newer
+    tick of the same symbol follows. Bars are kept in default lane.
+
+    Prefixes are the event type strings defined in howtrader.trader.event.
+    """
+    return [
+        EventLane(
+            "trading",
+            ("eOrder.", "eTrade.", "ePosition.", "eAccount.", "eContract."),
+            weight=4
+        ),
+        EventLane(
+            "market",
+            ("eTick.",),
+            capacity=100000,
+            overflow=OVERFLOW_DROP_OLDEST,
+            weight=2
+        ),
+        EventLane("default")
+    ]
+
+
+class PriorityEventEngine(EventEngine):
+    """
+    Event engine which queues events in separate lanes by event class
+    and drains them by priority.
+
+    Register/put interface is identical to EventEngine, so it can be
+    passed into MainEngine directly. Events are taken out one by one to
+    keep priority, so batch handlers always receive one event.
+    """
+
+    def __init__(
+        self,
+        interval: float = 1,
+        lanes: Sequence[EventLane] = None,
+        drain_policy: str = DRAIN_WEIGHTED
+    ):
+        """
+        Lanes are given in priority order, the last lane without prefixes
+        is used as default lane. Default lanes are used if not specified.
+
+        Weighted drain policy is used by default, so that timer, schedule
+        and log events in default lane are still processed during a burst
+        of market data.
+        """
+        super().__init__(interval)
+
+        if drain_policy not in (DRAIN_STRICT, DRAIN_WEIGHTED):
+            raise ValueError(f"不支持的队列调度方式：{drain_policy}")
+
+        if not lanes:
+            lanes = get_default_lanes()
+
+        self._lanes: List[EventLane] = list(lanes)
+        self._default_lane: EventLane = None
+        for lane in self._lanes:
+            if not lane.prefixes:
+                self._default_lane = lane
+                break
+        else:
+            self._default_lane = EventLane("default")
+            self._lanes.append(self._default_lane)
+
+        self._drain_policy: str = drain_policy
+        self._credits: Dict[str, int] = {}
+        self._reset_credits()
+
+        self._lane_map: Dict[str, EventLane] = {}
+        self._semaphore: Semaphore = Semaphore(0)
+
+    def _run(self) -> None:
+        """
+        Wait for new event and then process the one of highest priority.
+        """
+        while self._active:
+            if not self._semaphore.acquire(timeout=1):
+                continue
+
+            event = self._next_event()
+            if event:
+                self._process_batch([event])
+
+    def _next_event(self) -> Event:
+        """
+        Get next event to be processed according to drain policy.
+        """
+        if self._drain_policy == DRAIN_STRICT:
+            for lane in self._lanes:
+                try:
+                    return lane.get()
+                except Empty:
+                    pass
+            return None
+
+        # Weighted round robin: serve lanes with remaining credit first,
+        # and refill credits of all lanes when they are used up.
+        for _ in range(2):
+            for lane in self._lanes:
+                if not self._credits[lane.name]:
+                    continue
+
+                try:
+                    event = lane.get()
+                except Empty:
+                    continue
+
+                self._credits[lane.name] -= 1
+                return event
+
+            self._reset_credits()
+
+        return None
+
+    def _reset_credits(self) -> None:
+        """"""
+        for lane in self._lanes:
+            self._credits[lane.name] = lane.weight
+
+    def get_lane(self, type: str) -> EventLane:
+        """
+        Get lane used for specific event type.
+        """
+        lane = self._lane_map.get(type, None)
+
+        if not lane:
+            for n in self._lanes:
+                if n.prefixes and n.match(type):
+                    lane = n
+                    break
+            else:
+                lane = self._default_lane
+
+            self._lane_map[type] = lane
+
+        return lane
+
+    def get_all_lanes(self) -> List[EventLane]:
+        """
+        Get all lanes in priority order.
+        """
+        return list(self._lanes)
+
+    def qsize(self) -> int:
+        """
+        Get number of events waiting in all lanes.
+        """
+        return sum(lane.qsize() for lane in self._lanes)
+
+    def get_conflated_count(self) -> int:
+        """
+        Get number of events dropped by conflation in all lanes.
+        """
+        return sum(lane.conflated for lane in self._lanes)
+
+    def put(self, event: Event) -> None:
+        """
+        Put an event object into its lane.
+        """
+        if self._metrics:
+            event.put_time = perf_counter()
+
+        lane = self.get_lane(event.type)
+        lane.put(event)
+        self._semaphore.release()
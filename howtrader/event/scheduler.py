@@ -0,0 +1,155 @@
+"""
+Heap based timer scheduler used by event engine.
+"""
+import sys
+from heapq import heappop, heappush
+from itertools import count
+from threading import Condition, Thread
+from time import monotonic
+from typing import Callable, Dict, List, Tuple
+
+# Defines callback function of timer job.
+JobCallback = Callable[[], None]
+
+
+class TimerJob:
+    """
+    Timer job scheduled to run once or repeatedly by interval.
+    """
+
+    def __init__(
+        self,
+        jobid: int,
+        callback: JobCallback,
+        interval: float,
+        repeat: bool,
+        deadline: float
+    ):
+        """"""
+        self.jobid: int = jobid
+        self.callback: JobCallback = callback
+        self.interval: float = interval
+        self.repeat: bool = repeat
+        self.deadline: float = deadline
+        self.active: bool = True
+
+
+class Scheduler:
+    """
+    Scheduler keeps timer jobs in a heap ordered by deadline, and calls
+    dispatch function with each job in its own thread when it is due.
+
+    Deadlines of a recurring job are advanced by interval from the previous
+    deadline (not from the time it ran), so that timers do not drift.
+
+    One-shot job is kept until remove_job is called by its dispatcher
+    after it is finished, so that it can still be cancelled before its
+    dispatched callback is run.
+    """
+
+    def __init__(self, dispatch: Callable[[TimerJob], None]):
+        """"""
+        self._dispatch: Callable[[TimerJob], None] = dispatch
+
+        self._heap: List[Tuple[float, int, TimerJob]] = []
+        self._jobs: Dict[int, TimerJob] = {}
+        self._counter = count(1)
+
+        self._condition: Condition = Condition()
+        self._active: bool = False
+        self._thread: Thread = Thread(target=self._run)
+
+    def start(self) -> None:
+        """"""
+        self._active = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        """"""
+        with self._condition:
+            self._active = False
+            self._condition.notify()
+
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def add_job(
+        self,
+        callback: JobCallback,
+        interval: float,
+        repeat: bool = True,
+        delay: float = None
+    ) -> TimerJob:
+        """
+        Add a new job which runs after delay (interval by default), and
+        then every interval seconds if repeat.
+        """
+        if interval <= 0 and repeat:
+            raise ValueError(f"定时任务间隔必须大于0：{interval}")
+
+        if delay is None:
+            delay = interval
+
+        with self._condition:
+            jobid = next(self._counter)
+            job = TimerJob(jobid, callback, interval, repeat, monotonic() + delay)
+
+            self._jobs[jobid] = job
+            heappush(self._heap, (job.deadline, jobid, job))
+
+            # Wake up scheduler thread if new job is the earliest one
+            if self._heap[0][2] is job:
+                self._condition.notify()
+
+        return job
+
+    def remove_job(self, jobid: int) -> None:
+        """
+        Cancel an existing job. Cancelled job is discarded from heap
+        lazily when its deadline is reached.
+        """
+        with self._condition:
+            job = self._jobs.pop(jobid, None)
+            if job:
+                job.active = False
+
+    def get_job(self, jobid: int) -> TimerJob:
+        """"""
+        return self._jobs.get(jobid, None)
+
+    def _run(self) -> None:
+        """
+        Wait until the earliest job is due, and then dispatch it.
+        """
+        while self._active:
+            with self._condition:
+                if not self._heap:
+                    self._condition.wait(1)
+                    continue
+
+                deadline, jobid, job = self._heap[0]
+                now = monotonic()
+
+                if deadline > now:
+                    self._condition.wait(deadline - now)
+                    continue
+
+                heappop(self._heap)
+
+                if not job.active:
+                    continue
+
+                if job.repeat:
+                    # Skip missed runs if scheduler has fallen behind
+                    job.deadline += job.interval
+                    if job.deadline <= now:
+                        missed = int((now - job.deadline) / job.interval) + 1
+                        job.deadline += missed * job.interval
+
+                    heappush(self._heap, (job.deadline, jobid, job))
+
+            try:
+                self._dispatch(job)
+            except Exception:
+                et, ev, tb = sys.exc_info()
+                sys.excepthook(et, ev, tb)
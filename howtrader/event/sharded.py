@@ -0,0 +1,168 @@
+"""
+Sharded multi-threaded event engine.
+
+Events carrying data with vt_symbol are hashed by vt_symbol to one of
+N shard worker threads, which run the shard-safe handlers, so that events
+of one symbol are always processed in order by the same thread. Events
+without vt_symbol (e.g. spread data) listened by shard-safe handlers are
+all put into the first shard, so they are also processed in order. All
+other handlers are processed by the serial worker thread as in
+EventEngine. Batch handlers are always run by the serial worker.
+
+A handler is shard-safe if the object it is bound to (e.g. an engine)
+lists the event type in class attribute shard_safe_types, or the function
+itself has attribute shard_safe = True. Shard-safe handlers must only
+touch state of the vt_symbol in the event, or guard shared state with a
+lock.
+
+Shard workers and serial worker run concurrently, so a shard-safe handler
+may be called before serial handlers (e.g. OmsEngine) have processed the
+same event. Shard-safe handlers should use data in the event itself,
+instead of querying state updated by serial handlers (e.g. get_order of
+MainEngine) for the same event.
+"""
+from collections import defaultdict
+from threading import Thread
+from time import perf_counter
+from typing import List, Sequence
+
+from .engine import ConflatingQueue, Event, EventEngine, EventQueue, HandlerType
+
+
+def is_shard_safe(type: str, handler: HandlerType) -> bool:
+    """
+    Check if handler is declared to be shard-safe for the event type
+    (or keyed type string of it).
+    """
+    if getattr(handler, "shard_safe", False):
+        return True
+
+    owner = getattr(handler, "__self__", None)
+    return type.startswith(tuple(getattr(owner, "shard_safe_types", ())))
+
+
+class ShardedEventEngine(EventEngine):
+    """
+    Event engine which processes shard-safe handlers in N worker threads
+    by vt_symbol, and all other handlers in a serial worker thread.
+    """
+
+    def __init__(
+        self,
+        interval: float = 1,
+        shard_count: int = 4,
+        conflate_types: Sequence[str] = (),
+        batch_size: int = 1
+    ):
+        """"""
+        super().__init__(interval, conflate_types, batch_size)
+
+        self._shard_count: int = shard_count
+        self._shard_queues: List[EventQueue] = []
+        self._shard_threads: List[Thread] = []
+
+        for _ in range(shard_count):
+            if conflate_types:
+                queue = ConflatingQueue(conflate_types=conflate_types)
+            else:
+                queue = EventQueue()
+            thread = Thread(target=self._run_shard, args=(queue,))
+
+            self._shard_queues.append(queue)
+            self._shard_threads.append(thread)
+
+        self._safe_handlers: defaultdict = defaultdict(list)
+
+    def _run_shard(self, queue: EventQueue) -> None:
+        """
+        Get events from shard queue and then process them with shard-safe
+        handlers.
+        """
+        while self._active:
+            events = queue.get_batch(self._batch_size, 1)
+            for event in events:
+                self._dispatch(event, self._safe_handlers, [])
+
+    def start(self) -> None:
+        """
+        Start shard workers, serial worker and timer.
+        """
+        self._active = True
+        for thread in self._shard_threads:
+            thread.start()
+        super().start()
+
+    def stop(self) -> None:
+        """
+        Stop event engine.
+        """
+        super().stop()
+        for thread in self._shard_threads:
+            thread.join()
+
+    def put(self, event: Event) -> None:
+        """
+        Put event into shard queue if any shard-safe handler listens to
+        it, and into serial queue if any other handler listens to it.
+        Events without vt_symbol are put into the first shard queue.
+        """
+        if self._metrics:
+            event.put_time = perf_counter()
+
+        type = event.type
+        topic = type + event.key if event.key else ""
+
+        if type in self._safe_handlers or (topic and topic in self._safe_handlers):
+            vt_symbol = getattr(event.data, "vt_symbol", None)
+            if vt_symbol is None:
+                queue = self._shard_queues[0]
+            else:
+                queue = self._shard_queues[hash(vt_symbol) % self._shard_count]
+            queue.put(event)
+
+        if (
+            self._general_handlers
+            or type in self._handlers
+            or type in self._batch_handlers
+            or (topic and topic in self._handlers)
+        ):
+            self._queue.put(event)
+
+    def qsize(self) -> int:
+        """
+        Get number of events waiting in serial and shard queues.
+        """
+        return self._queue.qsize() + sum(q.qsize() for q in self._shard_queues)
+
+    def get_conflated_count(self) -> int:
+        """"""
+        count = super().get_conflated_count()
+        for queue in self._shard_queues:
+            count += getattr(queue, "conflated", 0)
+        return count
+
+    def register(self, type: str, handler: HandlerType) -> None:
+        """
+        Register handler into shard-safe or serial handlers.
+        """
+        if not is_shard_safe(type, handler):
+            super().register(type, handler)
+            return
+
+        handler_list = self._safe_handlers[type]
+        if handler not in handler_list:
+            handler_list.append(handler)
+
+    def unregister(self, type: str, handler: HandlerType) -> None:
+        """"""
+        if not is_shard_safe(type, handler):
+            super().unregister(type, handler)
+            return
+
+        handler_list = self._safe_handlers[type]
+
+        if handler in handler_list:
+            handler_list.remove(handler)
+
+        if not handler_list:
+            self._safe_handlers.pop(type)
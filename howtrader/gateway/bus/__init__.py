@@ -0,0 +1 @@
+from .bus_gateway import BusGateway
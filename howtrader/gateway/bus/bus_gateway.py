@@ -0,0 +1,205 @@
+"""
+Gateway for connecting to event bus of another process on the same host.
+"""
+
+import traceback
+from threading import Thread
+from time import sleep
+from typing import Dict, List, Sequence
+
+from howtrader.event import Event, EventEngine
+from howtrader.trader.bus import EventBusClient
+from howtrader.trader.constant import Exchange
+from howtrader.trader.event import EVENT_CONTRACT, EVENT_ORDER
+from howtrader.trader.gateway import BaseGateway
+from howtrader.trader.object import (
+    BarData,
+    CancelRequest,
+    HistoryRequest,
+    OrderRequest,
+    QueryRequest,
+    SubscribeRequest
+)
+
+
+class BusGateway(BaseGateway):
+    """
+    Receives events published by EventBusServer through shared memory,
+    and sends requests back to main engine of server process.
+
+    gateway_name of received data is replaced by name of this gateway,
+    so that engines in this process send requests to this gateway.
+
+    密钥 can be left empty to use the key published by server.
+    """
+
+    default_setting: Dict[str, str] = {
+        "共享内存": "howtrader_bus",
+        "地址": "localhost",
+        "端口": 20250,
+        "密钥": ""
+    }
+
+    exchanges: List[Exchange] = list(Exchange)
+
+    def __init__(self, event_engine: EventEngine, gateway_name: str = "BUS"):
+        """Constructor"""
+        super().__init__(event_engine, gateway_name)
+
+        self.client: EventBusClient = None
+        self.symbol_gateway_map: Dict[str, str] = {}
+
+        self.active: bool = False
+        self.thread: Thread = None
+        self.lost: int = 0
+
+    def connect(self, setting: dict) -> None:
+        """"""
+        address = (setting["地址"], int(setting["端口"]))
+        authkey = setting["密钥"].encode()
+
+        try:
+            self.client = EventBusClient(setting["共享内存"], address, authkey)
+        except Exception as e:
+            self.write_log(f"事件总线连接失败：{e}")
+            return
+
+        # Reader position is fixed before querying snapshot of server,
+        # so that no update is missed.
+        for contract in self.client.request("get_all_contracts"):
+            self.on_remote_event(Event(EVENT_CONTRACT, contract))
+
+        for account in self.client.request("get_all_accounts"):
+            self.on_account(self.replace_gateway_name(account))
+
+        for position in self.client.request("get_all_positions"):
+            self.on_position(self.replace_gateway_name(position))
+
+        for order in self.client.request("get_all_active_orders"):
+            order = self.replace_gateway_name(order)
+            self.on_event(EVENT_ORDER, order, order.vt_orderid)
+
+        self.active = True
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+        self.write_log("事件总线连接成功")
+
+    def run(self) -> None:
+        """
+        Poll shared memory ring and push events into local event engine.
+        """
+        while self.active:
+            try:
+                events = self.client.get_events()
+            except Exception:
+                self.write_log(f"事件总线读取异常：\n{traceback.format_exc()}")
+                sleep(1)
+                continue
+
+            if not events:
+                sleep(0.001)
+                continue
+
+            for event in events:
+                self.on_remote_event(event)
+
+            if self.client.lost != self.lost:
+                self.lost = self.client.lost
+                self.write_log(f"事件总线读取落后或数据无法解析，已跳过{self.lost}次数据")
+
+    def on_remote_event(self, event: Event) -> None:
+        """"""
+        data = event.data
+
+        if event.type == EVENT_CONTRACT:
+            self.symbol_gateway_map[data.vt_symbol] = data.gateway_name
+
+        self.replace_gateway_name(data)
+        self.on_event(event.type, data, event.key)
+
+    def replace_gateway_name(self, data: object) -> object:
+        """"""
+        if hasattr(data, "gateway_name"):
+            data.gateway_name = self.gateway_name
+        return data
+
+    def get_remote_gateway(self, vt_symbol: str) -> str:
+        """"""
+        return self.symbol_gateway_map.get(vt_symbol, "")
+
+    def close(self) -> None:
+        """"""
+        if not self.client:
+            return
+
+        self.active = False
+        if self.thread:
+            self.thread.join()
+        self.client.close()
+
+    def subscribe(self, req: SubscribeRequest) -> None:
+        """"""
+        gateway_name = self.get_remote_gateway(req.vt_symbol)
+        self.client.request("subscribe", req, gateway_name)
+
+    def send_order(self, req: OrderRequest) -> str:
+        """"""
+        gateway_name = self.get_remote_gateway(req.vt_symbol)
+        try:
+            return self.client.request("send_order", req, gateway_name)
+        except (RuntimeError, OSError, EOFError) as e:
+            self.write_log(str(e))
+            return ""
+
+    def cancel_order(self, req: CancelRequest) -> None:
+        """"""
+        gateway_name = self.get_remote_gateway(req.vt_symbol)
+        try:
+            self.client.request("cancel_order", req, gateway_name)
+        except (RuntimeError, OSError, EOFError) as e:
+            self.write_log(str(e))
+
+    def send_orders(self, reqs: Sequence[OrderRequest]) -> List[str]:
+        """"""
+        if not reqs:
+            return []
+
+        gateway_name = self.get_remote_gateway(reqs[0].vt_symbol)
+        try:
+            return self.client.request("send_orders", reqs, gateway_name)
+        except (RuntimeError, OSError, EOFError) as e:
+            self.write_log(str(e))
+            return ["" for req in reqs]
+
+    def cancel_orders(self, reqs: Sequence[CancelRequest]) -> None:
+        """"""
+        if not reqs:
+            return
+
+        gateway_name = self.get_remote_gateway(reqs[0].vt_symbol)
+        try:
+            self.client.request("cancel_orders", reqs, gateway_name)
+        except (RuntimeError, OSError, EOFError) as e:
+            self.write_log(str(e))
+
+    def query_order(self, req: QueryRequest) -> None:
+        """"""
+        gateway_name = self.get_remote_gateway(req.vt_symbol)
+        self.client.request("query_order", req, gateway_name)
+
+    def query_account(self) -> None:
+        """Account is queried by server process."""
+        pass
+
+    def query_position(self) -> None:
+        """Position is queried by server process."""
+        pass
+
+    def query_history(self, req: HistoryRequest) -> List[BarData]:
+        """"""
+        gateway_name = self.get_remote_gateway(req.vt_symbol)
+        bars = self.client.request("query_history", req, gateway_name) or []
+        for bar in bars:
+            self.replace_gateway_name(bar)
+        return bars
@@ -0,0 +1,420 @@
+"""
+Cross-process event bus on one host.
+
+The process running gateways publishes events into a shared memory ring
+buffer with EventBusServer, and serves order requests from other processes
+through a multiprocessing connection. Worker processes running strategy
+engines connect to it with BusGateway (howtrader.gateway.bus).
+
+Ring buffer layout:
+    * header: magic, capacity, write position (total bytes written),
+      authkey of request channel
+    * data: records of length (uint32) + pickled (type, key, data),
+      aligned to 8 bytes, with padding record at end of buffer.
+
+There is one writer and any number of readers, and each reader keeps its
+own read position, so slow readers never block the writer. A reader which
+falls behind by more than buffer capacity skips to latest position, and
+lost events are counted.
+
+Request channel is authenticated with a random key generated by server
+(unless given), which is published in ring header for workers. Shared
+memory is only accessible by the same user, who can already write events
+into the ring.
+
+Worker processes are expected to be started as separate programs. Workers
+started by multiprocessing of server process share its resource tracker,
+which warns about unregistered shared memory on exit before Python 3.13.
+"""
+
+import pickle
+import secrets
+import struct
+import traceback
+from multiprocessing import AuthenticationError, resource_tracker
+from multiprocessing.connection import Client, Connection, Listener
+from threading import Lock, Thread
+from typing import Any, Iterator, List, Sequence, Tuple
+
+from howtrader.event import Event, EventEngine
+from .engine import MainEngine
+from .event import (
+    EVENT_TICK,
+    EVENT_BAR,
+    EVENT_ORDER,
+    EVENT_TRADE,
+    EVENT_POSITION,
+    EVENT_ACCOUNT,
+    EVENT_CONTRACT,
+)
+
+
+MAGIC = 0x48544253          # "HTBS"
+
+HEADER_SIZE = 64
+MAGIC_OFFSET = 0
+CAPACITY_OFFSET = 8
+WRITE_POS_OFFSET = 16
+AUTHKEY_LENGTH_OFFSET = 24
+AUTHKEY_OFFSET = 32
+AUTHKEY_SIZE = 32
+
+LENGTH = struct.Struct("<I")
+POSITION = struct.Struct("<Q")
+PADDING = 0xFFFFFFFF
+
+DEFAULT_TYPES = (
+    EVENT_TICK,
+    EVENT_BAR,
+    EVENT_ORDER,
+    EVENT_TRADE,
+    EVENT_POSITION,
+    EVENT_ACCOUNT,
+    EVENT_CONTRACT,
+)
+
+# Functions of MainEngine which can be called through request channel.
+REQUEST_FUNCTIONS = {
+    "subscribe",
+    "send_order",
+    "cancel_order",
+    "send_orders",
+    "cancel_orders",
+    "query_order",
+    "query_history",
+    "get_all_contracts",
+    "get_all_accounts",
+    "get_all_positions",
+    "get_all_active_orders",
+}
+
+
+def align(size: int) -> int:
+    """"""
+    return (size + 7) & ~7
+
+
+class SharedMemoryRing:
+    """
+    Single-writer, multi-reader ring buffer in shared memory.
+    """
+
+    def __init__(self, name: str, capacity: int = 0):
+        """
+        Create new shared memory if capacity is given, otherwise attach
+        to existing one.
+        """
+        # Imported here so that this module (and BusGateway) can still be
+        # imported on Python 3.7, which has no shared memory support.
+        try:
+            from multiprocessing.shared_memory import SharedMemory
+        except ImportError:
+            raise RuntimeError("事件总线需要Python 3.8及以上版本")
+
+        if capacity:
+            capacity = align(capacity)
+            self.shm: SharedMemory = SharedMemory(name, create=True, size=HEADER_SIZE + capacity)
+            self.owner: bool = True
+
+            POSITION.pack_into(self.shm.buf, MAGIC_OFFSET, MAGIC)
+            POSITION.pack_into(self.shm.buf, CAPACITY_OFFSET, capacity)
+            POSITION.pack_into(self.shm.buf, WRITE_POS_OFFSET, 0)
+        else:
+            self.owner: bool = False
+
+            # Only creator process should unlink shared memory on exit
+            try:
+                self.shm: SharedMemory = SharedMemory(name, track=False)
+            except TypeError:
+                self.shm: SharedMemory = SharedMemory(name)
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+
+            if POSITION.unpack_from(self.shm.buf, MAGIC_OFFSET)[0] != MAGIC:
+                self.shm.close()
+                raise ValueError(f"不是有效的事件总线共享内存：{name}")
+
+        self.buf: memoryview = self.shm.buf
+        self.capacity: int = POSITION.unpack_from(self.buf, CAPACITY_OFFSET)[0]
+        self.max_record: int = self.capacity // 4
+
+        self.write_pos: int = self.get_write_pos()
+
+    def get_write_pos(self) -> int:
+        """"""
+        return POSITION.unpack_from(self.buf, WRITE_POS_OFFSET)[0]
+
+    def set_authkey(self, authkey: bytes) -> None:
+        """
+        Publish authkey of request channel, which is not published if
+        longer than AUTHKEY_SIZE.
+        """
+        if len(authkey) > AUTHKEY_SIZE:
+            authkey = b""
+
+        self.buf[AUTHKEY_OFFSET:AUTHKEY_OFFSET + len(authkey)] = authkey
+        POSITION.pack_into(self.buf, AUTHKEY_LENGTH_OFFSET, len(authkey))
+
+    def get_authkey(self) -> bytes:
+        """"""
+        length = POSITION.unpack_from(self.buf, AUTHKEY_LENGTH_OFFSET)[0]
+        return bytes(self.buf[AUTHKEY_OFFSET:AUTHKEY_OFFSET + length])
+
+    def write(self, payload: bytes) -> None:
+        """
+        Append one record. Write position is published after record data
+        is written, so readers never see partial record.
+        """
+        length = len(payload)
+        size = align(LENGTH.size + length)
+        if size > self.max_record:
+            raise ValueError(f"事件数据过大：{length}字节")
+
+        pos = self.write_pos
+        offset = pos % self.capacity
+
+        if self.capacity - offset < size:
+            LENGTH.pack_into(self.buf, HEADER_SIZE + offset, PADDING)
+            pos += self.capacity - offset
+            offset = 0
+
+        start = HEADER_SIZE + offset + LENGTH.size
+        self.buf[start:start + length] = payload
+        LENGTH.pack_into(self.buf, HEADER_SIZE + offset, length)
+
+        self.write_pos = pos + size
+        POSITION.pack_into(self.buf, WRITE_POS_OFFSET, self.write_pos)
+
+    def read(self, pos: int) -> Iterator[Tuple[int, memoryview]]:
+        """
+        Iterate (next position, payload view) of records from pos to
+        current write position. Payload view is only valid before next
+        iteration.
+        """
+        write_pos = self.get_write_pos()
+
+        while pos < write_pos:
+            offset = pos % self.capacity
+            length = LENGTH.unpack_from(self.buf, HEADER_SIZE + offset)[0]
+
+            if length == PADDING:
+                pos += self.capacity - offset
+                continue
+
+            start = HEADER_SIZE + offset + LENGTH.size
+            pos += align(LENGTH.size + length)
+
+            yield pos, self.buf[start:start + length]
+
+    def is_overwritten(self, pos: int) -> bool:
+        """
+        Check if record at pos may have been overwritten by writer, who may
+        be writing at most one record beyond published write position.
+        """
+        return self.get_write_pos() - pos > self.capacity - self.max_record
+
+    def close(self) -> None:
+        """"""
+        self.shm.close()
+
+        if self.owner:
+            self.shm.unlink()
+
+
+class EventBusServer:
+    """
+    Publishes events of gateway process into shared memory ring, and
+    serves requests from worker processes with main engine.
+    """
+
+    def __init__(
+        self,
+        main_engine: MainEngine,
+        event_engine: EventEngine,
+        name: str = "howtrader_bus",
+        address: Tuple[str, int] = ("localhost", 20250),
+        authkey: bytes = b"",
+        capacity: int = 64 * 1024 * 1024,
+        types: Sequence[str] = DEFAULT_TYPES
+    ):
+        """
+        A random authkey is generated if not given.
+        """
+        self.main_engine: MainEngine = main_engine
+        self.event_engine: EventEngine = event_engine
+
+        self.name: str = name
+        self.address: Tuple[str, int] = address
+        self.authkey: bytes = authkey or secrets.token_bytes(AUTHKEY_SIZE)
+        self.capacity: int = capacity
+        self.types: Sequence[str] = types
+
+        self.ring: SharedMemoryRing = None
+        self.lock: Lock = Lock()
+
+        self.active: bool = False
+        self.listener: Listener = None
+        self.thread: Thread = None
+        self.connections: List[Connection] = []
+
+    def start(self) -> None:
+        """"""
+        self.ring = SharedMemoryRing(self.name, self.capacity)
+        self.ring.set_authkey(self.authkey)
+
+        for type in self.types:
+            self.event_engine.register(type, self.process_event)
+
+        self.active = True
+        self.listener = Listener(self.address, authkey=self.authkey)
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+        self.main_engine.write_log(f"事件总线启动，共享内存：{self.name}，请求地址：{self.address}")
+
+    def close(self) -> None:
+        """"""
+        if not self.active:
+            return
+        self.active = False
+
+        for type in self.types:
+            self.event_engine.unregister(type, self.process_event)
+
+        self.listener.close()
+        for conn in list(self.connections):
+            conn.close()
+
+        with self.lock:
+            self.ring.close()
+
+    def process_event(self, event: Event) -> None:
+        """"""
+        payload = pickle.dumps(
+            (event.type, event.key, event.data),
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+
+        with self.lock:
+            if self.active:
+                self.ring.write(payload)
+
+    def run(self) -> None:
+        """
+        Accept connections from worker processes.
+        """
+        while self.active:
+            try:
+                conn = self.listener.accept()
+            except AuthenticationError:
+                self.main_engine.write_log("事件总线拒绝连接：密钥错误")
+                continue
+            except OSError:
+                break
+
+            self.connections.append(conn)
+            Thread(target=self.serve, args=(conn,), daemon=True).start()
+
+    def serve(self, conn: Connection) -> None:
+        """
+        Process requests of one worker, each request is (name, args) of
+        main engine function, and reply is (success, result or error).
+        """
+        while self.active:
+            try:
+                name, args = conn.recv()
+            except (EOFError, OSError):
+                break
+
+            if name not in REQUEST_FUNCTIONS:
+                reply = (False, f"不支持的请求函数：{name}")
+            else:
+                try:
+                    result = getattr(self.main_engine, name)(*args)
+                    reply = (True, result)
+                except Exception:
+                    reply = (False, traceback.format_exc())
+
+            try:
+                conn.send(reply)
+            except (EOFError, OSError):
+                break
+
+        if conn in self.connections:
+            self.connections.remove(conn)
+        conn.close()
+
+
+class EventBusClient:
+    """
+    Reads events from shared memory ring, and sends requests to
+    EventBusServer.
+    """
+
+    def __init__(
+        self,
+        name: str = "howtrader_bus",
+        address: Tuple[str, int] = ("localhost", 20250),
+        authkey: bytes = b""
+    ):
+        """
+        Authkey published by server in shared memory is used if not given.
+        """
+        self.ring: SharedMemoryRing = SharedMemoryRing(name)
+        self.pos: int = self.ring.get_write_pos()
+        self.lost: int = 0      # count of skipped or undecodable records
+
+        authkey = authkey or self.ring.get_authkey()
+        if not authkey:
+            self.ring.close()
+            raise ValueError("事件总线密钥未设置")
+
+        self.conn: Connection = Client(address, authkey=authkey)
+        self.lock: Lock = Lock()
+
+    def request(self, name: str, *args: Any) -> Any:
+        """
+        Call main engine function in server process, and wait for result.
+        """
+        with self.lock:
+            self.conn.send((name, args))
+            success, result = self.conn.recv()
+
+        if not success:
+            raise RuntimeError(f"事件总线请求{name}失败：{result}")
+        return result
+
+    def get_events(self) -> List[Event]:
+        """
+        Get all new events since last call.
+        """
+        events = []
+
+        for pos, payload in self.ring.read(self.pos):
+            record = bytes(payload)
+            payload.release()
+
+            # Discard record which writer has wrapped around onto, checked
+            # after copied so that the copy is not torn.
+            if self.ring.is_overwritten(self.pos):
+                break
+            self.pos = pos
+
+            try:
+                type, key, data = pickle.loads(record)
+            except Exception:
+                self.lost += 1
+                continue
+
+            events.append(Event(type, data, key))
+
+        if self.ring.is_overwritten(self.pos):
+            self.pos = self.ring.get_write_pos()
+            self.lost += 1
+
+        return events
+
+    def close(self) -> None:
+        """"""
+        self.conn.close()
+        self.ring.close()
+
@@ -1,12 +1,42 @@
 import os
-from typing import TYPE_CHECKING
+from threading import Lock
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from howtrader.trader.database.database import BaseDatabaseManager
 
-if "VNPY_TESTING" not in os.environ:
-    from howtrader.trader.setting import get_settings
-    from .initialize import init
 
-    settings = get_settings("database.")
-    database_manager: "BaseDatabaseManager" = init(settings=settings)
+class LazyDatabaseManager:
+    """
+    Database manager created on first use, so that importing modules
+    which use database does not connect to database and create tables.
+    """
+
+    def __init__(self):
+        """"""
+        self._manager: Optional["BaseDatabaseManager"] = None
+        self._lock: Lock = Lock()
+
+    def get_manager(self) -> "BaseDatabaseManager":
+        """
+        Get real database manager, which is created with database settings
+        at the first call.
+        """
+        if self._manager is None:
+            with self._lock:
+                if self._manager is None:
+                    from howtrader.trader.setting import get_settings
+                    from .initialize import init
+
+                    settings = get_settings("database.")
+                    self._manager = init(settings=settings)
+
+        return self._manager
+
+    def __getattr__(self, name: str):
+        """"""
+        return getattr(self.get_manager(), name)
+
+
+if "VNPY_TESTING" not in os.environ:
+    database_manager: "BaseDatabaseManager" = LazyDatabaseManager()
@@ -9,6 +9,7 @@ from howtrader.trader.setting import SETTINGS
 if TYPE_CHECKING:
     from howtrader.trader.constant import Interval, Exchange  # noqa
     from howtrader.trader.object import BarData, TickData  # noqa
+    from howtrader.trader.series import BarSeries, TickSeries  # noqa
 
 
 DB_TZ = timezone(SETTINGS["database.timezone"])
@@ -20,10 +21,15 @@ class Driver(Enum):
     POSTGRESQL = "postgresql"
     MONGODB = "mongodb"
     INFLUX = "influxdb"
+    FILE = "file"
 
 
 class BaseDatabaseManager(ABC):
 
+    # Whether data is stored in columns, so that series of any range can
+    # be loaded at once cheaply.
+    columnar: bool = False
+
     @abstractmethod
     def load_bar_data(
         self,
@@ -45,17 +51,55 @@ class BaseDatabaseManager(ABC):
     ) -> Sequence["TickData"]:
         pass
 
+    def load_bar_series(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        interval: "Interval",
+        start: datetime,
+        end: datetime
+    ) -> "BarSeries":
+        """
+        Load bar data as columnar series. Database managers can override
+        this to build series from raw rows without creating BarData.
+        """
+        from howtrader.trader.series import BarSeries
+
+        bars = self.load_bar_data(symbol, exchange, interval, start, end)
+        return BarSeries.from_bars(bars, symbol=symbol, exchange=exchange, interval=interval)
+
+    def load_tick_series(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        start: datetime,
+        end: datetime
+    ) -> "TickSeries":
+        """
+        Load tick data as columnar series.
+        """
+        from howtrader.trader.series import TickSeries
+
+        ticks = self.load_tick_data(symbol, exchange, start, end)
+        return TickSeries.from_ticks(ticks, symbol=symbol, exchange=exchange)
+
     @abstractmethod
     def save_bar_data(
         self,
         datas: Sequence["BarData"],
+        staging: bool = False
     ):
+        """
+        Staging is a hint for saving very large amount of data, which can
+        be ignored by database managers without staging support.
+        """
         pass
 
     @abstractmethod
     def save_tick_data(
         self,
         datas: Sequence["TickData"],
+        staging: bool = False
     ):
         pass
 
@@ -0,0 +1,339 @@
+"""
+Database of local files, which stores bar and tick data in columns.
+
+Bar data of each month is saved as one numpy structured array (.npy) file:
+
+    {folder}/bar/{exchange}/{symbol}/{interval}/{YYYYMM}.npy
+
+Files are memory-mapped when loading, and rows in range are found by
+binary search on datetime column, so that only rows in range are read and
+copied into one array, without any conversion row by row.
+
+Tick data is saved in compressed blocks of each day by TickArchive:
+
+    {folder}/tick/{exchange}/{symbol}/{YYYYMMDD}.npz
+
+Folder is set by "database.database" in settings, relative to trader dir.
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime
+from operator import attrgetter
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from howtrader.trader.constant import Exchange, Interval
+from howtrader.trader.object import BarData, TickData
+from howtrader.trader.series import (
+    BAR_DTYPE,
+    BAR_FIELDS,
+    TICK_DTYPE,
+    TICK_FIELDS,
+    BarSeries,
+    TickSeries,
+    merge_arrays
+)
+from howtrader.trader.utility import get_folder_path
+
+from .database import BaseDatabaseManager, Driver, DB_TZ
+from .tick_archive import TickArchive
+
+
+def init(_: Driver, settings: dict):
+    folder_path = get_folder_path(settings["database"])
+    return FileManager(folder_path)
+
+
+def to_db_datetime(dt: datetime) -> datetime:
+    """
+    Change datetime to database timezone, and remove tzinfo.
+    """
+    if dt.tzinfo:
+        dt = dt.astimezone(DB_TZ).replace(tzinfo=None)
+    return dt
+
+
+class FileManager(BaseDatabaseManager):
+    """"""
+
+    columnar: bool = True
+
+    def __init__(self, folder_path: Path):
+        """"""
+        self.bar_path: Path = Path(folder_path).joinpath("bar")
+        self.tick_path: Path = Path(folder_path).joinpath("tick")
+
+        self.lock: Lock = Lock()
+
+    def get_bar_folder(self, symbol: str, exchange: Exchange, interval: Interval) -> Path:
+        """"""
+        return self.bar_path.joinpath(exchange.value, symbol, interval.value)
+
+    def get_tick_folder(self, symbol: str, exchange: Exchange) -> Path:
+        """"""
+        return self.tick_path.joinpath(exchange.value, symbol)
+
+    def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> Sequence[BarData]:
+        series = self.load_bar_series(symbol, exchange, interval, start, end)
+        return series.to_list()
+
+    def load_tick_data(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> Sequence[TickData]:
+        series = self.load_tick_series(symbol, exchange, start, end)
+        return series.to_list()
+
+    def load_bar_series(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> BarSeries:
+        folder = self.get_bar_folder(symbol, exchange, interval)
+        data = self.load_array(folder, BAR_DTYPE, start, end)
+        return BarSeries(symbol, exchange, interval, data=data, tz=DB_TZ)
+
+    def load_tick_series(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> TickSeries:
+        folder = self.get_tick_folder(symbol, exchange)
+        archive = TickArchive(folder)
+        data = archive.load(
+            np.datetime64(to_db_datetime(start), "us"),
+            np.datetime64(to_db_datetime(end), "us")
+        )
+        name = self.load_info(folder).get("name", "")
+        return TickSeries(symbol, exchange, data=data, tz=DB_TZ, name=name)
+
+    def load_array(
+        self,
+        folder: Path,
+        dtype: np.dtype,
+        start: datetime,
+        end: datetime
+    ) -> np.ndarray:
+        """
+        Load rows within [start, end] from memory-mapped month files.
+        """
+        start = to_db_datetime(start)
+        end = to_db_datetime(end)
+        start_month = start.strftime("%Y%m")
+        end_month = end.strftime("%Y%m")
+
+        start_dt = np.datetime64(start, "us")
+        end_dt = np.datetime64(end, "us")
+
+        arrays = []
+
+        for path in self.get_files(folder):
+            if not start_month <= path.stem <= end_month:
+                continue
+
+            data = np.load(path, mmap_mode="r")
+            dt = data["datetime"]
+            left = np.searchsorted(dt, start_dt, "left")
+            right = np.searchsorted(dt, end_dt, "right")
+
+            # Rows are copied out so that the file is unmapped once loaded.
+            # Series kept by readers (e.g. cached in backtesting) never hold
+            # the file mapped, which would make replacing or deleting it by
+            # save_array fail with PermissionError on Windows.
+            if right > left:
+                arrays.append(np.array(data[left:right]))
+
+        if not arrays:
+            return np.empty(0, dtype=dtype)
+        elif len(arrays) == 1:
+            return arrays[0]
+        return np.concatenate(arrays)
+
+    def get_files(self, folder: Path) -> List[Path]:
+        """
+        Get month files of a folder sorted by month.
+        """
+        if not folder.exists():
+            return []
+        return sorted(folder.glob("*.npy"))
+
+    def save_array(self, folder: Path, data: np.ndarray) -> None:
+        """
+        Merge data into month files. Each file is written into temp file
+        first and then replaced, so that readers loading it at the same time
+        never see partial file. Files are only mapped during loading, so
+        replacing works on Windows too.
+        """
+        folder.mkdir(parents=True, exist_ok=True)
+
+        months = data["datetime"].astype("datetime64[M]")
+
+        for month in np.unique(months):
+            path = folder.joinpath(month.item().strftime("%Y%m") + ".npy")
+            arrays = [data[months == month]]
+
+            if path.exists():
+                arrays.insert(0, np.load(path))
+
+            month_data = merge_arrays(arrays)
+
+            temp_path = path.with_suffix(".tmp")
+            with open(temp_path, "wb") as f:
+                np.save(f, month_data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+
+    def load_info(self, folder: Path) -> dict:
+        """"""
+        path = folder.joinpath("info.json")
+        if not path.exists():
+            return {}
+
+        with open(path, encoding="UTF-8") as f:
+            return json.load(f)
+
+    def save_info(self, folder: Path, info: dict) -> None:
+        """"""
+        if self.load_info(folder) == info:
+            return
+
+        with open(folder.joinpath("info.json"), "w", encoding="UTF-8") as f:
+            json.dump(info, f, ensure_ascii=False)
+
+    def save_bar_data(self, datas: Sequence[BarData], staging: bool = False):
+        get_values = attrgetter(*BAR_FIELDS)
+        groups: Dict[tuple, list] = {}
+
+        for bar in datas:
+            key = (bar.symbol, bar.exchange, bar.interval)
+            row = (bar.datetime.astimezone(DB_TZ).replace(tzinfo=None),) + get_values(bar)
+            groups.setdefault(key, []).append(row)
+
+        with self.lock:
+            for (symbol, exchange, interval), rows in groups.items():
+                folder = self.get_bar_folder(symbol, exchange, interval)
+                self.save_array(folder, np.array(rows, dtype=BAR_DTYPE))
+
+    def save_tick_data(self, datas: Sequence[TickData], staging: bool = False):
+        get_values = attrgetter(*TICK_FIELDS)
+        groups: Dict[tuple, list] = {}
+        names: Dict[tuple, str] = {}
+
+        for tick in datas:
+            key = (tick.symbol, tick.exchange)
+            row = (tick.datetime.astimezone(DB_TZ).replace(tzinfo=None),) + get_values(tick)
+            groups.setdefault(key, []).append(row)
+            names[key] = tick.name
+
+        with self.lock:
+            for (symbol, exchange), rows in groups.items():
+                folder = self.get_tick_folder(symbol, exchange)
+                TickArchive(folder).save(np.array(rows, dtype=TICK_DTYPE))
+                self.save_info(folder, {"name": names[(symbol, exchange)]})
+
+    def get_newest_bar_data(
+        self, symbol: str, exchange: "Exchange", interval: "Interval"
+    ) -> Optional["BarData"]:
+        folder = self.get_bar_folder(symbol, exchange, interval)
+        files = self.get_files(folder)
+        if not files:
+            return None
+
+        data = np.array(np.load(files[-1], mmap_mode="r")[-1:])
+        series = BarSeries(symbol, exchange, interval, data=data, tz=DB_TZ)
+        return series[0]
+
+    def get_oldest_bar_data(
+        self, symbol: str, exchange: "Exchange", interval: "Interval"
+    ) -> Optional["BarData"]:
+        folder = self.get_bar_folder(symbol, exchange, interval)
+        files = self.get_files(folder)
+        if not files:
+            return None
+
+        data = np.array(np.load(files[0], mmap_mode="r")[:1])
+        series = BarSeries(symbol, exchange, interval, data=data, tz=DB_TZ)
+        return series[0]
+
+    def get_newest_tick_data(
+        self, symbol: str, exchange: "Exchange"
+    ) -> Optional["TickData"]:
+        folder = self.get_tick_folder(symbol, exchange)
+        data = TickArchive(folder).get_last()
+        if not len(data):
+            return None
+
+        name = self.load_info(folder).get("name", "")
+        series = TickSeries(symbol, exchange, data=data, tz=DB_TZ, name=name)
+        return series[len(series) - 1]
+
+    def count_rows(self, folder: Path) -> int:
+        """
+        Count rows of month files, only headers of files are read.
+        """
+        return sum(len(np.load(path, mmap_mode="r")) for path in self.get_files(folder))
+
+    def get_bar_data_statistics(self) -> List[Dict]:
+        """"""
+        result = []
+
+        if not self.bar_path.exists():
+            return result
+
+        for exchange_path in sorted(self.bar_path.iterdir()):
+            for symbol_path in sorted(exchange_path.iterdir()):
+                for interval_path in sorted(symbol_path.iterdir()):
+                    count = self.count_rows(interval_path)
+                    if not count:
+                        continue
+
+                    result.append({
+                        "symbol": symbol_path.name,
+                        "exchange": exchange_path.name,
+                        "interval": interval_path.name,
+                        "count": count
+                    })
+
+        return result
+
+    def delete_bar_data(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        interval: "Interval"
+    ) -> int:
+        """
+        Delete all bar data with given symbol + exchange + interval.
+        """
+        folder = self.get_bar_folder(symbol, exchange, interval)
+
+        with self.lock:
+            count = self.count_rows(folder)
+            if folder.exists():
+                shutil.rmtree(folder)
+
+        return count
+
+    def clean(self, symbol: str):
+        with self.lock:
+            for path in [self.bar_path, self.tick_path]:
+                if not path.exists():
+                    continue
+
+                for exchange_path in path.iterdir():
+                    symbol_path = exchange_path.joinpath(symbol)
+                    if symbol_path.exists():
+                        shutil.rmtree(symbol_path)
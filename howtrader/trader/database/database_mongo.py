@@ -1,15 +1,28 @@
 from datetime import datetime
-from enum import Enum
-from typing import Optional, Sequence, List
+from operator import attrgetter
+from typing import Optional, Sequence, List, Tuple, Type
 
 from mongoengine import DateTimeField, Document, FloatField, StringField, connect
+import numpy as np
+from pymongo import ASCENDING, UpdateOne
 
 from howtrader.trader.constant import Exchange, Interval
 from howtrader.trader.object import BarData, TickData
+from howtrader.trader.series import BAR_FIELDS, TICK_FIELDS, BaseSeries, BarSeries, TickSeries
 
 from .database import BaseDatabaseManager, Driver, DB_TZ
 
 
+# Default number of documents written by one bulk_write.
+BATCH_SIZE = 5000
+
+# Number of documents fetched from server at a time when loading data.
+FETCH_SIZE = 50000
+
+BAR_KEYS: List[str] = ["symbol", "exchange", "interval", "datetime"]
+TICK_KEYS: List[str] = ["symbol", "exchange", "datetime"]
+
+
 def init(_: Driver, settings: dict):
     database = settings["database"]
     host = settings["host"]
@@ -32,7 +45,7 @@ def init(_: Driver, settings: dict):
         authentication_source=authentication_source,
     )
 
-    return MongoManager()
+    return MongoManager(settings.get("batch_size", BATCH_SIZE))
 
 
 class DbBarData(Document):
@@ -193,6 +206,10 @@ class DbTickData(Document):
 
 class MongoManager(BaseDatabaseManager):
 
+    def __init__(self, batch_size: int = BATCH_SIZE):
+        """"""
+        self.batch_size: int = batch_size
+
     def load_bar_data(
         self,
         symbol: str,
@@ -201,60 +218,146 @@ class MongoManager(BaseDatabaseManager):
         start: datetime,
         end: datetime,
     ) -> Sequence[BarData]:
-        s = DbBarData.objects(
-            symbol=symbol,
-            exchange=exchange.value,
-            interval=interval.value,
-            datetime__gte=start,
-            datetime__lte=end,
-        )
-        data = [db_bar.to_bar() for db_bar in s]
-        return data
+        series = self.load_bar_series(symbol, exchange, interval, start, end)
+        return series.to_list()
 
     def load_tick_data(
         self, symbol: str, exchange: Exchange, start: datetime, end: datetime
     ) -> Sequence[TickData]:
-        s = DbTickData.objects(
-            symbol=symbol,
-            exchange=exchange.value,
-            datetime__gte=start,
-            datetime__lte=end,
+        series = self.load_tick_series(symbol, exchange, start, end)
+        return series.to_list()
+
+    def load_bar_series(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> BarSeries:
+        query = {
+            "symbol": symbol,
+            "exchange": exchange.value,
+            "interval": interval.value,
+            "datetime": {"$gte": start, "$lte": end},
+        }
+
+        data, _ = self.find_array(DbBarData, query, BAR_KEYS, BarSeries)
+        return BarSeries(symbol, exchange, interval, data=data, tz=DB_TZ)
+
+    def load_tick_series(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> TickSeries:
+        query = {
+            "symbol": symbol,
+            "exchange": exchange.value,
+            "datetime": {"$gte": start, "$lte": end},
+        }
+
+        data, first = self.find_array(DbTickData, query, TICK_KEYS, TickSeries, ["name"])
+        name = first.get("name", "") if first else ""
+        return TickSeries(symbol, exchange, data=data, tz=DB_TZ, name=name)
+
+    def find_array(
+        self,
+        document: Type[Document],
+        query: dict,
+        keys: List[str],
+        series_class: Type[BaseSeries],
+        extra_fields: List[str] = None
+    ) -> Tuple[np.ndarray, Optional[dict]]:
+        """
+        Find documents with raw pymongo cursor, sorted by datetime with
+        the unique index of keys, and convert into structured array of
+        series_class chunk by chunk.
+
+        First document is also returned, with extra_fields projected.
+        """
+        names = ["datetime"] + series_class.fields
+        projection = {name: True for name in names + (extra_fields or [])}
+        projection["_id"] = False
+
+        cursor = (
+            document._get_collection()
+            .find(query, projection)
+            .sort("datetime", ASCENDING)
+            .hint([(key, ASCENDING) for key in keys])
+            .batch_size(FETCH_SIZE)
         )
-        data = [db_tick.to_tick() for db_tick in s]
-        return data
+
+        arrays = []
+        rows = []
+        first = None
+
+        for d in cursor:
+            if first is None:
+                first = d
+
+            rows.append(tuple(map(d.get, names)))
+            if len(rows) == FETCH_SIZE:
+                arrays.append(series_class.make_array(list(zip(*rows))))
+                rows = []
+
+        if rows:
+            arrays.append(series_class.make_array(list(zip(*rows))))
+
+        if not arrays:
+            return np.empty(0, dtype=series_class.dtype), first
+        return np.concatenate(arrays), first
 
     @staticmethod
-    def to_update_param(d) -> dict:
-        dt = d.datetime.astimezone(DB_TZ)
-        d.datetime = dt.replace(tzinfo=None)
+    def to_document(d, names: List[str]) -> dict:
+        """
+        Generate document of data to save, without changing data itself.
+        """
+        # Change datetime to database timezone without tzinfo
+        dt = d.datetime.astimezone(DB_TZ).replace(tzinfo=None)
 
-        param = {
-            "set__" + k: v.value if isinstance(v, Enum) else v
-            for k, v in d.__dict__.items()
+        doc = {
+            "symbol": d.symbol,
+            "exchange": d.exchange.value,
+            "datetime": dt,
         }
-        return param
+        doc.update(zip(names, map(float, attrgetter(*names)(d))))
+        return doc
 
-    def save_bar_data(self, datas: Sequence[BarData]):
+    def bulk_upsert(self, document: Type[Document], docs: List[dict], keys: List[str]) -> None:
+        """
+        Upsert documents with unordered bulk_write by batch, so that
+        server can apply writes of a batch in parallel with one round trip.
+        """
+        collection = document._get_collection()
+
+        # Order of unordered writes is not guaranteed, so only the last
+        # document of the same key is kept.
+        unique_docs = {tuple(doc[key] for key in keys): doc for doc in docs}
+        if len(unique_docs) != len(docs):
+            docs = list(unique_docs.values())
+
+        for i in range(0, len(docs), self.batch_size):
+            requests = [
+                UpdateOne({key: doc[key] for key in keys}, {"$set": doc}, upsert=True)
+                for doc in docs[i:i + self.batch_size]
+            ]
+            collection.bulk_write(requests, ordered=False)
+
+    def save_bar_data(self, datas: Sequence[BarData], staging: bool = False):
+        docs = []
         for d in datas:
-            updates = self.to_update_param(d)
-            updates.pop("set__gateway_name")
-            updates.pop("set__vt_symbol")
-            (
-                DbBarData.objects(
-                    symbol=d.symbol, interval=d.interval.value, datetime=d.datetime
-                ).update_one(upsert=True, **updates)
-            )
+            doc = self.to_document(d, BAR_FIELDS)
+            doc["interval"] = d.interval.value
+            docs.append(doc)
+
+        self.bulk_upsert(DbBarData, docs, BAR_KEYS)
 
-    def save_tick_data(self, datas: Sequence[TickData]):
+    def save_tick_data(self, datas: Sequence[TickData], staging: bool = False):
+        docs = []
         for d in datas:
-            updates = self.to_update_param(d)
-            updates.pop("set__gateway_name")
-            updates.pop("set__vt_symbol")
-            (
-                DbTickData.objects(
-                    symbol=d.symbol, exchange=d.exchange.value, datetime=d.datetime
-                ).update_one(upsert=True, **updates)
-            )
+            doc = self.to_document(d, TICK_FIELDS)
+            doc["name"] = d.name
+            docs.append(doc)
+
+        self.bulk_upsert(DbTickData, docs, TICK_KEYS)
 
     def get_newest_bar_data(
         self, symbol: str, exchange: "Exchange", interval: "Interval"
@@ -1,28 +1,49 @@
 """"""
+import sqlite3
 from datetime import datetime
+from operator import attrgetter
 from typing import List, Dict, Optional, Sequence, Type
 
+import numpy as np
 from peewee import (
     AutoField,
     CharField,
     Database,
     DateTimeField,
+    Field,
     FloatField,
     Model,
     MySQLDatabase,
     PostgresqlDatabase,
     SqliteDatabase,
-    chunked,
+    SQL,
     fn
 )
 
 from howtrader.trader.constant import Exchange, Interval
 from howtrader.trader.object import BarData, TickData
+from howtrader.trader.series import BAR_FIELDS, TICK_FIELDS, BaseSeries, BarSeries, TickSeries
 from howtrader.trader.utility import get_file_path
 
 from .database import BaseDatabaseManager, Driver, DB_TZ
 
 
+# Number of rows fetched from database cursor at a time when loading data.
+FETCH_SIZE = 50000
+
+# Max number of parameters in one statement, which decides how many rows
+# are written by one multi-row insert.
+MAX_PARAMS: Dict[Driver, int] = {
+    Driver.SQLITE: 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999,
+    Driver.MYSQL: 65535,
+    Driver.POSTGRESQL: 65535,
+}
+
+# Columns of rows written by BulkWriter.
+BAR_COLUMNS: List[str] = ["symbol", "exchange", "datetime", "interval"] + BAR_FIELDS
+TICK_COLUMNS: List[str] = ["symbol", "exchange", "datetime", "name"] + TICK_FIELDS
+
+
 def init(driver: Driver, settings: dict):
     init_funcs = {
         Driver.SQLITE: init_sqlite,
@@ -137,23 +158,8 @@ def init_models(db: Database, driver: Driver):
             """
             save a list of objects, update if exists.
             """
-            dicts = [i.to_dict() for i in objs]
-            with db.atomic():
-                if driver is Driver.POSTGRESQL:
-                    for bar in dicts:
-                        DbBarData.insert(bar).on_conflict(
-                            update=bar,
-                            conflict_target=(
-                                DbBarData.symbol,
-                                DbBarData.exchange,
-                                DbBarData.interval,
-                                DbBarData.datetime,
-                            ),
-                        ).execute()
-                else:
-                    for c in chunked(dicts, 50):
-                        DbBarData.insert_many(
-                            c).on_conflict_replace().execute()
+            rows = [tuple(getattr(obj, name) for name in BAR_COLUMNS) for obj in objs]
+            DbBarData.writer.upsert(rows)
 
     class DbTickData(ModelBase):
         """
@@ -315,32 +321,203 @@ def init_models(db: Database, driver: Driver):
 
         @staticmethod
         def save_all(objs: List["DbTickData"]):
-            dicts = [i.to_dict() for i in objs]
-            with db.atomic():
-                if driver is Driver.POSTGRESQL:
-                    for tick in dicts:
-                        DbTickData.insert(tick).on_conflict(
-                            update=tick,
-                            conflict_target=(
-                                DbTickData.symbol,
-                                DbTickData.exchange,
-                                DbTickData.datetime,
-                            ),
-                        ).execute()
-                else:
-                    for c in chunked(dicts, 50):
-                        DbTickData.insert_many(c).on_conflict_replace().execute()
+            rows = [tuple(getattr(obj, name) for name in TICK_COLUMNS) for obj in objs]
+            DbTickData.writer.upsert(rows)
+
+    DbBarData.writer = BulkWriter(
+        DbBarData,
+        driver,
+        BAR_COLUMNS,
+        ["symbol", "exchange", "interval", "datetime"]
+    )
+    DbTickData.writer = BulkWriter(
+        DbTickData,
+        driver,
+        TICK_COLUMNS,
+        ["symbol", "exchange", "datetime"]
+    )
 
     db.connect()
     db.create_tables([DbBarData, DbTickData])
     return DbBarData, DbTickData
 
 
+class BulkWriter:
+    """
+    Writes rows into table with multi-row insert statements, and updates
+    rows already existing (by unique index) with new values.
+
+    Number of rows of each statement is decided by max number of
+    parameters of database driver. SQL of full size statement is only
+    generated once, and executed again with parameters of following
+    batches like prepared statement.
+    """
+
+    def __init__(
+        self,
+        model: Type[Model],
+        driver: Driver,
+        columns: List[str],
+        conflict_target: List[str]
+    ):
+        """"""
+        self.model: Type[Model] = model
+        self.driver: Driver = driver
+        self.db: Database = model._meta.database
+
+        self.columns: List[str] = columns
+        self.conflict_target: List[str] = conflict_target
+        self.key_index: List[int] = [columns.index(name) for name in conflict_target]
+        self.batch_size: int = MAX_PARAMS[driver] // len(columns)
+
+        self.sqls: Dict[tuple, str] = {}
+        self.staging_model: Optional[Type[Model]] = None
+
+    def upsert(self, rows: List[tuple], staging: bool = False) -> None:
+        """
+        Insert rows (tuples of values in order of columns), or update
+        existing rows with the same key.
+
+        If staging is set, rows are written into a temporary table without
+        index first, and then merged into target table by one statement,
+        which is faster for very large amount of data.
+        """
+        rows = self.remove_duplicates(rows)
+        if not rows:
+            return
+
+        with self.db.atomic():
+            if staging:
+                self.merge(rows)
+            else:
+                self.insert(self.model, rows, True)
+
+    def remove_duplicates(self, rows: List[tuple]) -> List[tuple]:
+        """
+        Keep only the last row of each key, since PostgreSQL does not
+        allow one statement to update the same row twice.
+        """
+        key_index = self.key_index
+        unique_rows = {tuple(row[i] for i in key_index): row for row in rows}
+
+        if len(unique_rows) == len(rows):
+            return rows
+        return list(unique_rows.values())
+
+    def insert(self, model: Type[Model], rows: List[tuple], upsert: bool) -> None:
+        """"""
+        size = self.batch_size
+
+        for i in range(0, len(rows), size):
+            batch = rows[i:i + size]
+            params = [value for row in batch for value in row]
+
+            key = (model, upsert)
+            sql = self.sqls.get(key, "") if len(batch) == size else ""
+
+            if not sql:
+                sql, query_params = self.make_query(model, batch, upsert).sql()
+
+                # SQL is only reused when fields keep all values unchanged
+                if len(batch) == size and query_params == params:
+                    self.sqls[key] = sql
+                params = query_params
+
+            self.db.execute_sql(sql, params)
+
+    def make_query(self, model: Type[Model], rows: List[tuple], upsert: bool):
+        """"""
+        fields = self.get_fields(model)
+        query = model.insert_many(rows, fields=fields).returning()
+
+        if upsert:
+            query = self.on_conflict(query)
+        return query
+
+    def on_conflict(self, query):
+        """
+        Update all columns except key columns when row already exists.
+        """
+        preserve = [f for f in self.get_fields(self.model) if f.name not in self.conflict_target]
+
+        if self.driver is Driver.MYSQL:
+            return query.on_conflict(preserve=preserve)
+
+        conflict_target = [self.model._meta.fields[name] for name in self.conflict_target]
+        return query.on_conflict(conflict_target=conflict_target, preserve=preserve)
+
+    def merge(self, rows: List[tuple]) -> None:
+        """
+        Write rows into staging table, then merge into target table.
+        """
+        staging = self.get_staging_model()
+        staging.create_table(safe=True, temporary=True)
+        staging.delete().execute()
+
+        self.insert(staging, rows, False)
+
+        # SQLite requires WHERE clause to parse ON CONFLICT after SELECT
+        select = staging.select(*self.get_fields(staging)).where(SQL("1 = 1"))
+        query = self.model.insert_from(select, self.get_fields(self.model)).returning()
+        query = self.on_conflict(query)
+        self.db.execute_sql(*query.sql())
+
+        staging.drop_table()
+
+    def get_fields(self, model: Type[Model]) -> List[Field]:
+        """"""
+        return [model._meta.fields[name] for name in self.columns]
+
+    def get_staging_model(self) -> Type[Model]:
+        """
+        Model of temporary table with the same columns, but without id
+        and index.
+        """
+        if not self.staging_model:
+            attrs = {}
+            for field in self.get_fields(self.model):
+                attrs[field.name] = type(field)(null=True)
+
+            class Meta:
+                database = self.db
+                table_name = self.model._meta.table_name + "_staging"
+                primary_key = False
+
+            attrs["Meta"] = Meta
+            self.staging_model = type(self.model.__name__ + "Staging", (Model,), attrs)
+
+        return self.staging_model
+
+
 class SqlManager(BaseDatabaseManager):
 
     def __init__(self, class_bar: Type[Model], class_tick: Type[Model]):
         self.class_bar = class_bar
         self.class_tick = class_tick
+        self.db: Database = class_bar._meta.database
+
+    def fetch_array(self, query, series_class: Type[BaseSeries]) -> np.ndarray:
+        """
+        Fetch raw rows of query with database cursor chunk by chunk, and
+        convert each chunk into columns of structured array at once,
+        without creating model object or converting values row by row.
+        """
+        cursor = self.db.execute(query)
+        arrays = []
+
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+
+            columns = list(zip(*rows))
+            arrays.append(series_class.make_array(columns))
+
+        cursor.close()
+
+        if not arrays:
+            return np.empty(0, dtype=series_class.dtype)
+        return np.concatenate(arrays)
 
     def load_bar_data(
         self,
@@ -350,8 +527,26 @@ class SqlManager(BaseDatabaseManager):
         start: datetime,
         end: datetime,
     ) -> Sequence[BarData]:
+        series = self.load_bar_series(symbol, exchange, interval, start, end)
+        return series.to_list()
+
+    def load_tick_data(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> Sequence[TickData]:
+        series = self.load_tick_series(symbol, exchange, start, end)
+        return series.to_list()
+
+    def load_bar_series(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> BarSeries:
+        columns = [self.class_bar.datetime] + [getattr(self.class_bar, name) for name in BAR_FIELDS]
         s = (
-            self.class_bar.select()
+            self.class_bar.select(*columns)
                 .where(
                 (self.class_bar.symbol == symbol)
                 & (self.class_bar.exchange == exchange.value)
@@ -362,14 +557,15 @@ class SqlManager(BaseDatabaseManager):
             .order_by(self.class_bar.datetime)
         )
 
-        data = [db_bar.to_bar() for db_bar in s]
-        return data
+        data = self.fetch_array(s, BarSeries)
+        return BarSeries(symbol, exchange, interval, data=data, tz=DB_TZ)
 
-    def load_tick_data(
+    def load_tick_series(
         self, symbol: str, exchange: Exchange, start: datetime, end: datetime
-    ) -> Sequence[TickData]:
+    ) -> TickSeries:
+        columns = [self.class_tick.datetime] + [getattr(self.class_tick, name) for name in TICK_FIELDS]
         s = (
-            self.class_tick.select()
+            self.class_tick.select(*columns)
                 .where(
                 (self.class_tick.symbol == symbol)
                 & (self.class_tick.exchange == exchange.value)
@@ -379,16 +575,57 @@ class SqlManager(BaseDatabaseManager):
             .order_by(self.class_tick.datetime)
         )
 
-        data = [db_tick.to_tick() for db_tick in s]
-        return data
+        data = self.fetch_array(s, TickSeries)
+        if not len(data):
+            return TickSeries(symbol, exchange, tz=DB_TZ)
+
+        # Name is the same for all ticks of a symbol, so it is only
+        # queried from the first tick.
+        name = (
+            self.class_tick.select(self.class_tick.name)
+                .where(
+                (self.class_tick.symbol == symbol)
+                & (self.class_tick.exchange == exchange.value)
+                & (self.class_tick.datetime >= start)
+            )
+            .order_by(self.class_tick.datetime)
+            .scalar()
+        )
+
+        return TickSeries(symbol, exchange, data=data, tz=DB_TZ, name=name)
+
+    def save_bar_data(self, datas: Sequence[BarData], staging: bool = False):
+        """
+        Save bars with bulk upsert, set staging for very large amount of
+        data (see BulkWriter).
+        """
+        get_values = attrgetter(*BAR_FIELDS)
+        rows = []
+
+        for bar in datas:
+            # Change datetime to database timezone, then
+            # remove tzinfo since not supported by SQLite.
+            dt = bar.datetime.astimezone(DB_TZ).replace(tzinfo=None)
+
+            row = [bar.symbol, bar.exchange.value, dt, bar.interval.value]
+            row.extend(map(float, get_values(bar)))
+            rows.append(tuple(row))
+
+        self.class_bar.writer.upsert(rows, staging)
+
+    def save_tick_data(self, datas: Sequence[TickData], staging: bool = False):
+        """"""
+        get_values = attrgetter(*TICK_FIELDS)
+        rows = []
+
+        for tick in datas:
+            dt = tick.datetime.astimezone(DB_TZ).replace(tzinfo=None)
 
-    def save_bar_data(self, datas: Sequence[BarData]):
-        ds = [self.class_bar.from_bar(i) for i in datas]
-        self.class_bar.save_all(ds)
+            row = [tick.symbol, tick.exchange.value, dt, tick.name]
+            row.extend(map(float, get_values(tick)))
+            rows.append(tuple(row))
 
-    def save_tick_data(self, datas: Sequence[TickData]):
-        ds = [self.class_tick.from_tick(i) for i in datas]
-        self.class_tick.save_all(ds)
+        self.class_tick.writer.upsert(rows, staging)
 
     def get_newest_bar_data(
         self, symbol: str, exchange: "Exchange", interval: "Interval"
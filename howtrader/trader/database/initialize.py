@@ -6,6 +6,8 @@ def init(settings: dict) -> BaseDatabaseManager:
     driver = Driver(settings["driver"])
     if driver is Driver.MONGODB:
         return init_mongo(driver=driver, settings=settings)
+    elif driver is Driver.FILE:
+        return init_file(driver=driver, settings=settings)
     else:
         return init_sql(driver=driver, settings=settings)
 
@@ -21,3 +23,9 @@ def init_mongo(driver: Driver, settings: dict):
     from .database_mongo import init
     _database_manager = init(driver, settings=settings)
     return _database_manager
+
+
+def init_file(driver: Driver, settings: dict):
+    from .database_file import init
+    _database_manager = init(driver, settings=settings)
+    return _database_manager
@@ -0,0 +1,230 @@
+"""
+Compressed archive of tick data, with one block file for ticks of each
+symbol and day.
+
+Each column of a block is encoded as below before compressed:
+    * Values are changed into integers on their grid, e.g. prices into
+      number of priceticks. Grid is found from data itself: smallest
+      decimal places making all values integers, then greatest common
+      divisor of the integers.
+    * Integers are delta encoded (difference to previous value), and
+      stored in smallest integer type able to hold the differences.
+    * Columns can not be changed into integers exactly (e.g. calculated
+      values with many decimal places) are stored as float without loss.
+
+Index of blocks (first/last datetime and count of each block) is kept in
+index.json, so that range query only decodes blocks in range.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from howtrader.trader.series import TICK_DTYPE, merge_arrays
+
+
+# Max decimal places tried when changing values into integers.
+MAX_DECIMALS = 8
+
+# Integers larger than this can not be kept exactly in float.
+MAX_EXACT = 2 ** 53
+
+INT_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def encode_integers(ints: np.ndarray) -> Tuple[np.ndarray, dict]:
+    """
+    Delta encode integers in units of their greatest common divisor.
+    """
+    unit = int(np.gcd.reduce(ints)) or 1
+    values = ints // unit
+    deltas = np.diff(values)
+
+    dtype = np.int64
+    if len(deltas):
+        low, high = deltas.min(), deltas.max()
+        for int_type in INT_TYPES:
+            info = np.iinfo(int_type)
+            if info.min <= low and high <= info.max:
+                dtype = int_type
+                break
+
+    meta = {"unit": unit, "first": int(values[0])}
+    return deltas.astype(dtype), meta
+
+
+def decode_integers(deltas: np.ndarray, meta: dict) -> np.ndarray:
+    """"""
+    values = np.empty(len(deltas) + 1, dtype=np.int64)
+    values[0] = meta["first"]
+    np.cumsum(deltas, out=values[1:])
+    values[1:] += meta["first"]
+    return values * meta["unit"]
+
+
+def encode_column(column: np.ndarray) -> Tuple[np.ndarray, dict]:
+    """
+    Encode float column, exactly restored by decode_column.
+    """
+    for decimals in range(MAX_DECIMALS + 1):
+        scale = 10 ** decimals
+        ints = np.round(column * scale)
+
+        if np.abs(ints).max() >= MAX_EXACT:
+            break
+
+        if np.array_equal(ints / scale, column):
+            encoded, meta = encode_integers(ints.astype(np.int64))
+            meta["decimals"] = decimals
+            return encoded, meta
+
+    return column, {"decimals": -1}
+
+
+def decode_column(encoded: np.ndarray, meta: dict) -> np.ndarray:
+    """"""
+    decimals = meta["decimals"]
+    if decimals < 0:
+        return encoded
+
+    return decode_integers(encoded, meta) / 10 ** decimals
+
+
+class TickArchive:
+    """
+    Archive of ticks of one symbol in a folder.
+    """
+
+    def __init__(self, folder: Path):
+        """"""
+        self.folder: Path = Path(folder)
+        self.index_path: Path = self.folder.joinpath("index.json")
+        self.index: Dict[str, dict] = self.load_index()
+
+    def load_index(self) -> Dict[str, dict]:
+        """"""
+        if not self.index_path.exists():
+            return {}
+
+        with open(self.index_path, encoding="UTF-8") as f:
+            return json.load(f)
+
+    def save_index(self) -> None:
+        """"""
+        temp_path = self.index_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="UTF-8") as f:
+            json.dump(self.index, f, indent=4, sort_keys=True)
+        os.replace(temp_path, self.index_path)
+
+    def get_block_path(self, day: str) -> Path:
+        """"""
+        return self.folder.joinpath(f"{day}.npz")
+
+    def write_block(self, day: str, data: np.ndarray) -> None:
+        """"""
+        arrays = {}
+        metas = {}
+
+        dt, metas["datetime"] = encode_integers(data["datetime"].astype(np.int64))
+        arrays["datetime"] = dt
+
+        for name in TICK_DTYPE.names[1:]:
+            arrays[name], metas[name] = encode_column(data[name])
+
+        arrays["meta"] = np.array(json.dumps(metas))
+
+        path = self.get_block_path(day)
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(temp_path, path)
+
+        self.index[day] = {
+            "start": str(data["datetime"][0]),
+            "end": str(data["datetime"][-1]),
+            "count": len(data)
+        }
+
+    def read_block(self, day: str) -> np.ndarray:
+        """"""
+        with np.load(self.get_block_path(day)) as arrays:
+            metas = json.loads(arrays["meta"].item())
+
+            dt = decode_integers(arrays["datetime"], metas["datetime"])
+            data = np.empty(len(dt), dtype=TICK_DTYPE)
+            data["datetime"] = dt.astype("datetime64[us]")
+
+            for name in TICK_DTYPE.names[1:]:
+                data[name] = decode_column(arrays[name], metas[name])
+
+        return data
+
+    def save(self, data: np.ndarray) -> None:
+        """
+        Merge ticks (structured array of TICK_DTYPE) into blocks of days.
+        """
+        if not len(data):
+            return
+
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+        days = data["datetime"].astype("datetime64[D]")
+
+        for day in np.unique(days):
+            key = day.item().strftime("%Y%m%d")
+            arrays = [data[days == day]]
+
+            if key in self.index:
+                arrays.insert(0, self.read_block(key))
+
+            self.write_block(key, merge_arrays(arrays))
+
+        self.save_index()
+
+    def load(self, start: np.datetime64, end: np.datetime64) -> np.ndarray:
+        """
+        Load ticks within [start, end] from blocks in range.
+        """
+        arrays = []
+
+        for day in self.get_days(start, end):
+            data = self.read_block(day)
+            dt = data["datetime"]
+            left = np.searchsorted(dt, start, "left")
+            right = np.searchsorted(dt, end, "right")
+
+            if right > left:
+                arrays.append(data[left:right])
+
+        if not arrays:
+            return np.empty(0, dtype=TICK_DTYPE)
+        elif len(arrays) == 1:
+            return arrays[0]
+        return np.concatenate(arrays)
+
+    def get_days(self, start: np.datetime64, end: np.datetime64) -> List[str]:
+        """
+        Get days of blocks overlapping [start, end] in block index.
+        """
+        days = []
+
+        for day in sorted(self.index):
+            info = self.index[day]
+            if np.datetime64(info["end"]) < start or np.datetime64(info["start"]) > end:
+                continue
+            days.append(day)
+
+        return days
+
+    def get_last(self) -> np.ndarray:
+        """
+        Get array of the last tick, empty if no data.
+        """
+        if not self.index:
+            return np.empty(0, dtype=TICK_DTYPE)
+
+        day = max(self.index)
+        return self.read_block(day)[-1:]
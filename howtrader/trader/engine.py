@@ -3,26 +3,25 @@
 
 import logging
 import sys
-import smtplib
 import os
 from abc import ABC
 from datetime import datetime
-from email.message import EmailMessage
 from queue import Empty, Queue
 from threading import Thread
 from typing import Any, Sequence, Type, Dict, List, Optional
 
 from howtrader.event import Event, EventEngine
+from howtrader.event.metrics import format_metrics
 from .app import BaseApp
 from .event import (
     EVENT_TICK,
-    EVENT_TIMER,
     EVENT_ORDER,
     EVENT_TRADE,
     EVENT_POSITION,
     EVENT_ACCOUNT,
     EVENT_CONTRACT,
-    EVENT_LOG
+    EVENT_LOG,
+    EVENT_METRICS
 )
 from .gateway import BaseGateway
 from .object import (
@@ -42,7 +41,14 @@ from .object import (
     Exchange
 )
 from .setting import SETTINGS
-from .utility import get_folder_path, TRADER_DIR
+from .utility import get_folder_path, json_store, TRADER_DIR
+from .logger import LogWriter, QueueLogHandler, StreamTarget, RotatingFileTarget
+
+
+# Minimum interval (seconds) of jobs scheduled by user settings, same as
+# timer event by which these settings were counted before.
+MIN_INTERVAL = 1
+
 
 class MainEngine:
     """
@@ -247,12 +253,19 @@ class MainEngine:
         for gateway in self.gateways.values():
             gateway.close()
 
+        # Write all json files saved by engines into disk.
+        json_store.close()
+
 
 class BaseEngine(ABC):
     """
     Abstract class for implementing an function engine.
     """
 
+    # Event types whose handlers of the engine can be run concurrently for
+    # different vt_symbols by ShardedEventEngine.
+    shard_safe_types: Sequence[str] = ()
+
     def __init__(
         self,
         main_engine: MainEngine,
@@ -278,6 +291,8 @@ class LogEngine(BaseEngine):
         """"""
         super(LogEngine, self).__init__(main_engine, event_engine, "log")
 
+        self.writer: LogWriter = None
+
         if not SETTINGS["log.active"]:
             return
 
@@ -290,6 +305,10 @@ class LogEngine(BaseEngine):
             "%(asctime)s  %(levelname)s: %(message)s"
         )
 
+        # Log records are formatted and written by writer thread, so that
+        # event engine thread is not blocked by console or disk.
+        self.writer = LogWriter()
+
         self.add_null_handler()
 
         if SETTINGS["log.console"]:
@@ -298,6 +317,9 @@ class LogEngine(BaseEngine):
         if SETTINGS["log.file"]:
             self.add_file_handler()
 
+        self.logger.addHandler(QueueLogHandler(self.writer, self.level))
+        self.writer.start()
+
         self.register_event()
 
     def add_null_handler(self) -> None:
@@ -311,37 +333,52 @@ class LogEngine(BaseEngine):
         """
         Add console output of log.
         """
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(self.level)
-        console_handler.setFormatter(self.formatter)
-        self.logger.addHandler(console_handler)
+        console_target = StreamTarget(sys.stdout, self.formatter, self.level)
+        self.writer.add_target(console_target)
 
     def add_file_handler(self) -> None:
         """
-        Add file output of log.
+        Add file output of log, which is rolled over every day and when
+        file size reaches log.max_bytes.
         """
-        today_date = datetime.now().strftime("%Y%m%d")
-        filename = f"vt_{today_date}.log"
         log_path = get_folder_path("log")
-        file_path = log_path.joinpath(filename)
-
-        file_handler = logging.FileHandler(
-            file_path, mode="a", encoding="utf8"
+        file_path = log_path.joinpath("vt.log")
+
+        file_target = RotatingFileTarget(
+            file_path,
+            self.formatter,
+            self.level,
+            max_bytes=SETTINGS["log.max_bytes"],
+            daily=True
         )
-        file_handler.setLevel(self.level)
-        file_handler.setFormatter(self.formatter)
-        self.logger.addHandler(file_handler)
+        self.writer.add_target(file_target)
 
     def register_event(self) -> None:
         """"""
         self.event_engine.register(EVENT_LOG, self.process_log_event)
+        self.event_engine.register(EVENT_METRICS, self.process_metrics_event)
 
     def process_log_event(self, event: Event) -> None:
         """
         Process log event.
         """
         log = event.data
-        self.logger.log(log.level, log.msg)
+        if log.level >= self.level:
+            self.writer.log(self.logger.name, log.level, log.msg)
+
+    def process_metrics_event(self, event: Event) -> None:
+        """
+        Output event engine metrics summary into log.
+        """
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(format_metrics(event.data))
+
+    def close(self) -> None:
+        """
+        Write all log records left in queue.
+        """
+        if self.writer:
+            self.writer.close()
 
 
 class OmsEngine(BaseEngine):
@@ -364,9 +401,7 @@ class OmsEngine(BaseEngine):
 
         self.add_function()
         self.register_event()
-
-        self.order_update_interval = 0  # for counting the timer.
-        self.position_update_interval = 0
+        self.schedule_update()
 
     def add_function(self) -> None:
         """Add query function to main engine."""
@@ -386,19 +421,39 @@ class OmsEngine(BaseEngine):
 
     def register_event(self) -> None:
         """"""
-        self.event_engine.register(EVENT_TICK, self.process_tick_event)
+        self.event_engine.register_batch(EVENT_TICK, self.process_tick_batch)
         self.event_engine.register(EVENT_ORDER, self.process_order_event)
         self.event_engine.register(EVENT_TRADE, self.process_trade_event)
         self.event_engine.register(EVENT_POSITION, self.process_position_event)
         self.event_engine.register(EVENT_ACCOUNT, self.process_account_event)
         self.event_engine.register(EVENT_CONTRACT, self.process_contract_event)
-        self.event_engine.register(EVENT_TIMER, self.process_timer)
+
+    def schedule_update(self) -> None:
+        """
+        Schedule updating orders and positions by timer, for we may be
+        disconnected from server update push. Intervals are at least one
+        second as timer event does.
+        """
+        self.event_engine.schedule(
+            self.update_orders,
+            max(SETTINGS.get("order_update_interval", 120), MIN_INTERVAL)
+        )
+        self.event_engine.schedule(
+            self.main_engine.query_position,
+            max(SETTINGS.get("position_update_interval", 120), MIN_INTERVAL)
+        )
 
     def process_tick_event(self, event: Event) -> None:
         """"""
         tick = event.data
         self.ticks[tick.vt_symbol] = tick
 
+    def process_tick_batch(self, events: List[Event]) -> None:
+        """
+        Update latest ticks of a batch in one call.
+        """
+        self.ticks.update((event.data.vt_symbol, event.data) for event in events)
+
     def process_order_event(self, event: Event) -> None:
         """"""
         order = event.data
@@ -431,25 +486,15 @@ class OmsEngine(BaseEngine):
         contract = event.data
         self.contracts[contract.vt_symbol] = contract
 
-    def process_timer(self, event: Event) -> None:
+    def update_orders(self) -> None:
         """
-        update the orders, positions by timer, for we may be disconnected from server update push.
+        Query active orders which have not been updated for a while.
         """
-
-        self.order_update_interval += 1
-        self.position_update_interval += 1
-
-        if self.order_update_interval >= SETTINGS.get('order_update_interval', 120):
-            self.order_update_interval = 0
-            orders = self.get_all_active_orders()
-            for order in orders:
-                if order.datetime and (datetime.now(order.datetime.tzinfo) - order.datetime).seconds > SETTINGS.get('order_update_timer', 120):
-                    req = order.create_query_request()
-                    self.main_engine.query_order(req, order.gateway_name)
-
-        if self.position_update_interval >= SETTINGS.get('position_update_interval', 120):
-            self.main_engine.query_position()
-            self.position_update_interval = 0
+        orders = self.get_all_active_orders()
+        for order in orders:
+            if order.datetime and (datetime.now(order.datetime.tzinfo) - order.datetime).seconds > SETTINGS.get('order_update_timer', 120):
+                req = order.create_query_request()
+                self.main_engine.query_order(req, order.gateway_name)
 
     def get_tick(self, vt_symbol: str) -> Optional[TickData]:
         """
@@ -565,6 +610,9 @@ class EmailEngine(BaseEngine):
         if not receiver:
             receiver = SETTINGS["email.receiver"]
 
+        # Email modules are only imported when email is really sent.
+        from email.message import EmailMessage
+
         msg = EmailMessage()
         msg["From"] = SETTINGS["email.sender"]
         msg["To"] = receiver
@@ -575,6 +623,8 @@ class EmailEngine(BaseEngine):
 
     def run(self) -> None:
         """"""
+        import smtplib
+
         while self.active:
             try:
                 msg = self.queue.get(block=True, timeout=1)
@@ -2,7 +2,7 @@
 Event type string used in VN Trader.
 """
 
-from howtrader.event import EVENT_TIMER  # noqa
+from howtrader.event import EVENT_TIMER, EVENT_METRICS, EVENT_SCHEDULE  # noqa
 
 EVENT_TICK = "eTick."
 EVENT_BAR = 'eBar'  # Kline for 1min updating
@@ -88,11 +88,11 @@ class BaseGateway(ABC):
         self.gateway_name: str = gateway_name
         self.active_orders: Dict[str, OrderData] = {}  # {order_id: OrderData} for updating the trade event
 
-    def on_event(self, type: str, data: Any = None) -> None:
+    def on_event(self, type: str, data: Any = None, key: str = "") -> None:
         """
         General event push.
         """
-        event = Event(type, data)
+        event = Event(type, data, key)
         self.event_engine.put(event)
 
     def on_tick(self, tick: TickData) -> None:
@@ -100,32 +100,28 @@ class BaseGateway(ABC):
         Tick event push.
         Tick event of a specific vt_symbol is also pushed.
         """
-        self.on_event(EVENT_TICK, tick)
-        self.on_event(EVENT_TICK + tick.vt_symbol, tick)
+        self.on_event(EVENT_TICK, tick, tick.vt_symbol)
 
     def on_bar(self, bar: BarData) -> None:
         """
         Bar  event push.
         Bar event of a specific vt_symbol is also pushed.
         """
-        self.on_event(EVENT_BAR, bar)
-        self.on_event(EVENT_BAR + bar.vt_symbol, bar)
+        self.on_event(EVENT_BAR, bar, bar.vt_symbol)
 
     def on_trade(self, trade: TradeData) -> None:
         """
         Trade event push.
         Trade event of a specific vt_symbol is also pushed.
         """
-        self.on_event(EVENT_TRADE, trade)
-        self.on_event(EVENT_TRADE + trade.vt_symbol, trade)
+        self.on_event(EVENT_TRADE, trade, trade.vt_symbol)
 
     def on_order(self, order: OrderData) -> None:
         """
         Order event push.
         Order event of a specific vt_orderid is also pushed.
         """
-        self.on_event(EVENT_ORDER, order)
-        self.on_event(EVENT_ORDER + order.vt_orderid, order)
+        self.on_event(EVENT_ORDER, order, order.vt_orderid)
 
         # for updating the trade event
         pre_order = self.active_orders.get(order.vt_orderid, None)
@@ -158,16 +154,14 @@ class BaseGateway(ABC):
         Position event push.
         Position event of a specific vt_symbol is also pushed.
         """
-        self.on_event(EVENT_POSITION, position)
-        self.on_event(EVENT_POSITION + position.vt_symbol, position)
+        self.on_event(EVENT_POSITION, position, position.vt_symbol)
 
     def on_account(self, account: AccountData) -> None:
         """
         Account event push.
         Account event of a specific vt_accountid is also pushed.
         """
-        self.on_event(EVENT_ACCOUNT, account)
-        self.on_event(EVENT_ACCOUNT + account.vt_accountid, account)
+        self.on_event(EVENT_ACCOUNT, account, account.vt_accountid)
 
     def on_log(self, log: LogData) -> None:
         """
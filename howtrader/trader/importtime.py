@@ -0,0 +1,165 @@
+"""
+Report of startup import time, broken down by module and by package.
+
+Modules are imported in a new interpreter with "-X importtime", so the
+result is not affected by modules already imported. Usage:
+
+    python -m howtrader.trader.importtime howtrader.app.cta_strategy
+    python -m howtrader.trader.importtime --script examples/no_ui.py
+"""
+
+import re
+import subprocess
+import sys
+from argparse import ArgumentParser
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+
+LINE_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportRecord:
+    """
+    Import time of a module, in microseconds.
+    """
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    level: int
+
+    @property
+    def package(self) -> str:
+        """"""
+        return self.name.split(".")[0]
+
+
+def parse_importtime(text: str) -> List[ImportRecord]:
+    """
+    Parse output of "-X importtime".
+    """
+    records = []
+
+    for line in text.splitlines():
+        match = LINE_PATTERN.match(line)
+        if not match:
+            continue
+
+        self_us, cumulative_us, indent, name = match.groups()
+        records.append(ImportRecord(
+            name=name,
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            level=(len(indent) - 1) // 2
+        ))
+
+    return records
+
+
+def measure_import(modules: List[str] = None, script: str = "") -> List[ImportRecord]:
+    """
+    Import modules (or run only imports of a script) in a new interpreter
+    and return import time records.
+    """
+    if script:
+        code = get_script_imports(script)
+    else:
+        code = "\n".join(f"import {module}" for module in modules)
+
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        encoding="utf8",
+        errors="replace"
+    )
+
+    records = parse_importtime(process.stderr)
+    if process.returncode:
+        lines = [line for line in process.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError("导入失败：\n" + "\n".join(lines))
+
+    return records
+
+
+def get_script_imports(script: str) -> str:
+    """
+    Get top level import statements of a script, so that the script
+    itself is not run.
+    """
+    import ast
+
+    with open(script, encoding="utf8") as f:
+        tree = ast.parse(f.read())
+
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(format_import(node) for node in nodes)
+
+
+def format_import(node: Any) -> str:
+    """
+    Format import statement node into source code (ast.unparse is not
+    available before Python 3.9).
+    """
+    names = ", ".join(
+        f"{alias.name} as {alias.asname}" if alias.asname else alias.name
+        for alias in node.names
+    )
+
+    if hasattr(node, "module"):
+        module = "." * node.level + (node.module or "")
+        return f"from {module} import {names}"
+    return f"import {names}"
+
+
+def sum_by_package(records: List[ImportRecord]) -> Dict[str, int]:
+    """
+    Total self time of modules of each top level package.
+    """
+    result = defaultdict(int)
+    for record in records:
+        result[record.package] += record.self_us
+    return dict(sorted(result.items(), key=lambda item: item[1], reverse=True))
+
+
+def format_report(records: List[ImportRecord], top: int = 20) -> str:
+    """"""
+    total = sum(record.self_us for record in records)
+    lines = [f"导入模块总数：{len(records)}，总耗时：{total / 1000:.1f}ms", ""]
+
+    lines.append("按包统计（自身耗时合计）：")
+    for package, us in list(sum_by_package(records).items())[:top]:
+        lines.append(f"  {package:<40}{us / 1000:>10.1f}ms{us / total:>8.1%}")
+
+    lines.append("")
+    lines.append("按模块统计（累计耗时，含子模块）：")
+    records = sorted(records, key=lambda record: record.cumulative_us, reverse=True)
+    for record in records[:top]:
+        lines.append(
+            f"  {record.name:<60}{record.cumulative_us / 1000:>10.1f}ms"
+            f"{record.self_us / 1000:>10.1f}ms"
+        )
+
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """"""
+    parser = ArgumentParser(description="统计启动时各模块的导入耗时")
+    parser.add_argument("modules", nargs="*", help="要导入的模块")
+    parser.add_argument("--script", default="", help="只导入脚本中顶层import的模块")
+    parser.add_argument("--top", type=int, default=20, help="显示的条目数量")
+    args = parser.parse_args()
+
+    if not args.modules and not args.script:
+        parser.error("请指定模块或脚本")
+
+    records = measure_import(args.modules, args.script)
+    print(format_report(records, args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,471 @@
+"""
+Incremental technical indicators updated bar by bar, used by ArrayManager.
+
+Calculations follow default settings of pandas_ta:
+    * SMA: rolling mean
+    * EMA: seeded with SMA of first window, then ewm(adjust=False)
+    * RMA (Wilder's smoothing used by RSI and ATR): ewm(alpha=1/n, adjust=True)
+    * STD: rolling standard deviation with ddof=1
+    * BOLL: SMA +/- dev * rolling standard deviation with ddof=0
+    * KELTNER: EMA of close +/- dev * EMA of true range
+
+Values before an indicator has enough data are nan.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from math import nan, isnan, sqrt
+from typing import Deque, Tuple
+
+import numpy as np
+
+
+class RollingWindow:
+    """
+    Keeps latest n input values.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        self.n: int = n
+        self.values: Deque[float] = deque()
+
+    def push(self, value: float) -> float:
+        """
+        Add new value, and return value removed from window (nan if window
+        is not full yet).
+        """
+        self.values.append(value)
+        if len(self.values) > self.n:
+            return self.values.popleft()
+        return nan
+
+    def is_full(self) -> bool:
+        """"""
+        return len(self.values) == self.n
+
+
+class RollingMean:
+    """"""
+
+    def __init__(self, n: int):
+        """"""
+        self.window: RollingWindow = RollingWindow(n)
+        self.total: float = 0
+        self.count: int = 0
+
+    def push(self, value: float) -> float:
+        """"""
+        removed = self.window.push(value)
+        self.total += value
+        if not isnan(removed):
+            self.total -= removed
+
+        # Recalculate total from time to time to avoid accumulating
+        # floating point error
+        self.count += 1
+        if self.count % 10000 == 0:
+            self.total = sum(self.window.values)
+
+        if not self.window.is_full():
+            return nan
+        return self.total / self.window.n
+
+
+class RollingStd:
+    """
+    Rolling standard deviation updated with Welford's algorithm.
+    """
+
+    def __init__(self, n: int, ddof: int = 1):
+        """"""
+        self.window: RollingWindow = RollingWindow(n)
+        self.ddof: int = ddof
+        self.mean: float = 0
+        self.m2: float = 0
+
+    def push(self, value: float) -> float:
+        """"""
+        window = self.window
+        removed = window.push(value)
+
+        if isnan(removed):
+            count = len(window.values)
+            delta = value - self.mean
+            self.mean += delta / count
+            self.m2 += delta * (value - self.mean)
+        else:
+            old_mean = self.mean
+            self.mean += (value - removed) / window.n
+            self.m2 += (value - removed) * (value - self.mean + removed - old_mean)
+
+        if not window.is_full():
+            return nan
+        return sqrt(max(self.m2, 0) / (window.n - self.ddof))
+
+
+class RollingExtreme:
+    """
+    Rolling max (or min) with monotonic queue, amortized O(1).
+    """
+
+    def __init__(self, n: int, is_max: bool = True):
+        """"""
+        self.n: int = n
+        self.is_max: bool = is_max
+        self.count: int = 0
+        self.queue: Deque[Tuple[int, float]] = deque()
+
+    def push(self, value: float) -> float:
+        """"""
+        queue = self.queue
+        if self.is_max:
+            while queue and queue[-1][1] <= value:
+                queue.pop()
+        else:
+            while queue and queue[-1][1] >= value:
+                queue.pop()
+        queue.append((self.count, value))
+
+        if queue[0][0] <= self.count - self.n:
+            queue.popleft()
+
+        self.count += 1
+        if self.count < self.n:
+            return nan
+        return queue[0][1]
+
+
+class Ema:
+    """
+    EMA seeded with mean of first n values (nan values are skipped when
+    calculating the seed, as pandas does).
+    """
+
+    def __init__(self, n: int):
+        """"""
+        self.n: int = n
+        self.alpha: float = 2 / (n + 1)
+        self.count: int = 0
+        self.seed_total: float = 0
+        self.seed_count: int = 0
+        self.value: float = nan
+
+    def push(self, value: float) -> float:
+        """"""
+        self.count += 1
+
+        if self.count <= self.n:
+            if not isnan(value):
+                self.seed_total += value
+                self.seed_count += 1
+
+            if self.count == self.n and self.seed_count:
+                self.value = self.seed_total / self.seed_count
+            return self.value
+
+        if not isnan(value):
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class Rma:
+    """
+    Wilder's moving average, same as pandas ewm(alpha=1/n, adjust=True,
+    min_periods=n).
+    """
+
+    def __init__(self, n: int):
+        """"""
+        self.n: int = n
+        self.decay: float = 1 - 1 / n
+        self.numerator: float = 0
+        self.denominator: float = 0
+        self.count: int = 0
+
+    def push(self, value: float) -> float:
+        """"""
+        if isnan(value):
+            # Earlier observations still decay by position
+            self.numerator *= self.decay
+            self.denominator *= self.decay
+        else:
+            self.numerator = value + self.decay * self.numerator
+            self.denominator = 1 + self.decay * self.denominator
+            self.count += 1
+
+        if self.count < self.n:
+            return nan
+        return self.numerator / self.denominator
+
+
+class TrueRange:
+    """"""
+
+    def __init__(self):
+        """"""
+        self.pre_close: float = nan
+
+    def push(self, high: float, low: float, close: float) -> float:
+        """"""
+        pre_close = self.pre_close
+        self.pre_close = close
+
+        if isnan(pre_close):
+            return nan
+        return max(high - low, abs(high - pre_close), abs(low - pre_close))
+
+
+class Indicator(ABC):
+    """
+    Base class of indicator. Output values are kept in a ring buffer of
+    size values (stored twice, same as ArrayManager), so that latest
+    values can be returned as ordered array view.
+    """
+
+    outputs: int = 1
+
+    def __init__(self, size: int):
+        """"""
+        self.size: int = size
+        self._buffer: np.ndarray = np.full((self.outputs, size * 2), nan)
+        self._pos: int = 0
+
+    def update(
+        self,
+        open_price: float,
+        high_price: float,
+        low_price: float,
+        close_price: float,
+        volume: float
+    ) -> None:
+        """
+        Update indicator with new bar.
+        """
+        values = self.calculate(open_price, high_price, low_price, close_price, volume)
+
+        pos = self._pos
+        self._buffer[:, pos] = values
+        self._buffer[:, pos + self.size] = values
+
+        pos += 1
+        if pos == self.size:
+            pos = 0
+        self._pos = pos
+
+    @abstractmethod
+    def calculate(
+        self,
+        open_price: float,
+        high_price: float,
+        low_price: float,
+        close_price: float,
+        volume: float
+    ) -> Tuple[float, ...]:
+        """
+        Calculate output values of new bar.
+        """
+        pass
+
+    def get_value(self, output: int = 0) -> float:
+        """
+        Get latest value of an output.
+        """
+        return self._buffer[output, self._pos + self.size - 1]
+
+    def get_array(self, output: int = 0) -> np.ndarray:
+        """
+        Get ordered view of latest size values of an output.
+        """
+        return self._buffer[output, self._pos:self._pos + self.size]
+
+
+class SmaIndicator(Indicator):
+    """"""
+
+    def __init__(self, size: int, n: int):
+        """"""
+        super().__init__(size)
+        self.mean: RollingMean = RollingMean(n)
+
+    def calculate(self, open_price, high_price, low_price, close_price, volume):
+        """"""
+        return (self.mean.push(close_price),)
+
+
+class EmaIndicator(Indicator):
+    """"""
+
+    def __init__(self, size: int, n: int):
+        """"""
+        super().__init__(size)
+        self.ema: Ema = Ema(n)
+
+    def calculate(self, open_price, high_price, low_price, close_price, volume):
+        """"""
+        return (self.ema.push(close_price),)
+
+
+class StdIndicator(Indicator):
+    """"""
+
+    def __init__(self, size: int, n: int, ddof: int = 1):
+        """"""
+        super().__init__(size)
+        self.std: RollingStd = RollingStd(n, ddof)
+
+    def calculate(self, open_price, high_price, low_price, close_price, volume):
+        """"""
+        return (self.std.push(close_price),)
+
+
+class AtrIndicator(Indicator):
+    """"""
+
+    def __init__(self, size: int, n: int):
+        """"""
+        super().__init__(size)
+        self.tr: TrueRange = TrueRange()
+        self.rma: Rma = Rma(n)
+
+    def calculate(self, open_price, high_price, low_price, close_price, volume):
+        """"""
+        tr = self.tr.push(high_price, low_price, close_price)
+        return (self.rma.push(tr),)
+
+
+class RsiIndicator(Indicator):
+    """"""
+
+    def __init__(self, size: int, n: int):
+        """"""
+        super().__init__(size)
+        self.pre_close: float = nan
+        self.gain: Rma = Rma(n)
+        self.loss: Rma = Rma(n)
+
+    def calculate(self, open_price, high_price, low_price, close_price, volume):
+        """"""
+        change = close_price - self.pre_close
+        self.pre_close = close_price
+
+        gain = self.gain.push(max(change, 0) if not isnan(change) else nan)
+        loss = self.loss.push(max(-change, 0) if not isnan(change) else nan)
+
+        total = gain + loss
+        if not total:
+            return (nan,)
+        return (100 * gain / total,)
+
+
+class BollIndicator(Indicator):
+    """
+    Outputs: up, down
+    """
+
+    outputs: int = 2
+
+    def __init__(self, size: int, n: int, dev: float):
+        """"""
+        super().__init__(size)
+        self.dev: float = dev
+        self.mean: RollingMean = RollingMean(n)
+        self.std: RollingStd = RollingStd(n, 0)
+
+    def calculate(self, open_price, high_price, low_price, close_price, volume):
+        """"""
+        mid = self.mean.push(close_price)
+        std = self.std.push(close_price)
+        return (mid + std * self.dev, mid - std * self.dev)
+
+
+class DonchianIndicator(Indicator):
+    """
+    Outputs: up, down
+    """
+
+    outputs: int = 2
+
+    def __init__(self, size: int, n: int):
+        """"""
+        super().__init__(size)
+        self.high: RollingExtreme = RollingExtreme(n, True)
+        self.low: RollingExtreme = RollingExtreme(n, False)
+
+    def calculate(self, open_price, high_price, low_price, close_price, volume):
+        """"""
+        return (self.high.push(high_price), self.low.push(low_price))
+
+
+class KeltnerIndicator(Indicator):
+    """
+    Outputs: up, down
+    """
+
+    outputs: int = 2
+
+    def __init__(self, size: int, n: int, dev: float):
+        """"""
+        super().__init__(size)
+        self.dev: float = dev
+        self.basis: Ema = Ema(n)
+        self.tr: TrueRange = TrueRange()
+        self.band: Ema = Ema(n)
+
+    def calculate(self, open_price, high_price, low_price, close_price, volume):
+        """"""
+        basis = self.basis.push(close_price)
+        band = self.band.push(self.tr.push(high_price, low_price, close_price))
+        return (basis + band * self.dev, basis - band * self.dev)
+
+
+class MacdIndicator(Indicator):
+    """
+    Outputs: macd, signal, hist
+    """
+
+    outputs: int = 3
+
+    def __init__(self, size: int, fast_period: int, slow_period: int, signal_period: int):
+        """"""
+        super().__init__(size)
+        self.fast: Ema = Ema(fast_period)
+        self.slow: Ema = Ema(slow_period)
+        self.signal: Ema = Ema(signal_period)
+
+    def calculate(self, open_price, high_price, low_price, close_price, volume):
+        """"""
+        macd = self.fast.push(close_price) - self.slow.push(close_price)
+
+        # Signal starts from first valid macd value
+        if isnan(macd):
+            return (nan, nan, nan)
+
+        signal = self.signal.push(macd)
+        return (macd, signal, macd - signal)
+
+
+class CciIndicator(Indicator):
+    """
+    Mean deviation of typical price has to be calculated over the whole
+    window, so each update is O(n) instead of O(1).
+    """
+
+    def __init__(self, size: int, n: int, c: float = 0.015):
+        """"""
+        super().__init__(size)
+        self.n: int = n
+        self.c: float = c
+        self.mean: RollingMean = RollingMean(n)
+
+    def calculate(self, open_price, high_price, low_price, close_price, volume):
+        """"""
+        typical = (high_price + low_price + close_price) / 3
+        mean = self.mean.push(typical)
+        if isnan(mean):
+            return (nan,)
+
+        deviation = sum(abs(v - mean) for v in self.mean.window.values) / self.n
+        if not deviation:
+            return (nan,)
+        return ((typical - mean) / (self.c * deviation),)
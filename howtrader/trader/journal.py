@@ -0,0 +1,287 @@
+"""
+Binary event journal for recording live events and replaying them.
+
+Journal file layout:
+    * file header: MAGIC
+    * records: record header (kind, payload length, timestamp) + payload
+        * event record: pickled (type, key, data) of an event
+        * index record: offset of previous index record, and (timestamp,
+          offset) of every event record since previous index record
+        * footer record: offset of last index record, written on close
+
+Journal files are unpickled when read, so only replay files from trusted
+sources.
+"""
+
+import pickle
+import struct
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from time import sleep, time, perf_counter
+from typing import BinaryIO, Iterator, List, Sequence, Tuple, Union
+
+from howtrader.event import Event, EventEngine
+from .event import EVENT_TICK, EVENT_ORDER, EVENT_TRADE, EVENT_POSITION
+
+
+MAGIC = b"HTJ1"
+
+RECORD_EVENT = 1
+RECORD_INDEX = 2
+RECORD_FOOTER = 3
+
+RECORD_HEADER = struct.Struct("<BId")       # kind, payload length, timestamp
+INDEX_HEADER = struct.Struct("<QI")         # previous index offset, count
+INDEX_ITEM = struct.Struct("<dQ")           # timestamp, record offset
+FOOTER = struct.Struct("<Q")                # last index offset
+
+NO_OFFSET = 0xFFFFFFFFFFFFFFFF
+
+DEFAULT_TYPES = (EVENT_TICK, EVENT_ORDER, EVENT_TRADE, EVENT_POSITION)
+
+
+class EventJournal:
+    """
+    Appends events of specified types into journal file, attached to
+    event engine as a general handler.
+    """
+
+    def __init__(
+        self,
+        event_engine: EventEngine,
+        file_path: Union[str, Path],
+        types: Sequence[str] = DEFAULT_TYPES,
+        index_interval: int = 1000
+    ):
+        """"""
+        self.event_engine: EventEngine = event_engine
+        self.file_path: Path = Path(file_path)
+        self.types: set = set(types)
+        self.index_interval: int = index_interval
+
+        self.count: int = 0
+
+        self._file: BinaryIO = None
+        self._offset: int = 0
+        self._index: List[Tuple[float, int]] = []
+        self._last_index_offset: int = NO_OFFSET
+
+    def start(self) -> None:
+        """
+        Create journal file and start recording events.
+        """
+        self._file = open(self.file_path, mode="wb")
+        self._file.write(MAGIC)
+        self._offset = len(MAGIC)
+
+        self.event_engine.register_general(self.process_event)
+
+    def close(self) -> None:
+        """
+        Stop recording, and write last index and footer into file.
+        """
+        if not self._file:
+            return
+
+        self.event_engine.unregister_general(self.process_event)
+
+        self.write_index()
+        self.write_record(RECORD_FOOTER, FOOTER.pack(self._last_index_offset), time())
+
+        self._file.close()
+        self._file = None
+
+    def process_event(self, event: Event) -> None:
+        """"""
+        if event.type not in self.types:
+            return
+
+        payload = pickle.dumps(
+            (event.type, event.key, event.data),
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+        timestamp = time()
+
+        self._index.append((timestamp, self._offset))
+        self.write_record(RECORD_EVENT, payload, timestamp)
+        self.count += 1
+
+        if len(self._index) >= self.index_interval:
+            self.write_index()
+
+    def write_index(self) -> None:
+        """
+        Write index record of event records since last one.
+        """
+        if not self._index:
+            return
+
+        buf = [INDEX_HEADER.pack(self._last_index_offset, len(self._index))]
+        for timestamp, offset in self._index:
+            buf.append(INDEX_ITEM.pack(timestamp, offset))
+
+        self._last_index_offset = self._offset
+        self.write_record(RECORD_INDEX, b"".join(buf), self._index[-1][0])
+        self._index = []
+
+    def write_record(self, kind: int, payload: bytes, timestamp: float) -> None:
+        """"""
+        self._file.write(RECORD_HEADER.pack(kind, len(payload), timestamp))
+        self._file.write(payload)
+        self._offset += RECORD_HEADER.size + len(payload)
+
+    def flush(self) -> None:
+        """
+        Flush buffered records into disk.
+        """
+        if self._file:
+            self._file.flush()
+
+
+class JournalReader:
+    """
+    Reads events from journal file.
+    """
+
+    def __init__(self, file_path: Union[str, Path]):
+        """"""
+        self.file_path: Path = Path(file_path)
+
+    def load_index(self) -> List[Tuple[float, int]]:
+        """
+        Load (timestamp, offset) of all event records by following index
+        records backwards from footer. Return empty list if journal was
+        not closed properly.
+        """
+        tail_size = RECORD_HEADER.size + FOOTER.size
+        if self.file_path.stat().st_size < tail_size:
+            return []
+
+        with open(self.file_path, mode="rb") as f:
+            f.seek(-tail_size, 2)
+            data = f.read()
+
+            kind, length, _ = RECORD_HEADER.unpack_from(data)
+            if kind != RECORD_FOOTER or length != FOOTER.size:
+                return []
+
+            offset = FOOTER.unpack_from(data, RECORD_HEADER.size)[0]
+            blocks = []
+
+            while offset != NO_OFFSET:
+                f.seek(offset)
+                kind, length, _ = RECORD_HEADER.unpack(f.read(RECORD_HEADER.size))
+                payload = f.read(length)
+
+                offset, count = INDEX_HEADER.unpack_from(payload)
+                blocks.append([
+                    INDEX_ITEM.unpack_from(payload, INDEX_HEADER.size + n * INDEX_ITEM.size)
+                    for n in range(count)
+                ])
+
+        index = []
+        for block in reversed(blocks):
+            index.extend(block)
+        return index
+
+    def read(
+        self,
+        start: datetime = None,
+        end: datetime = None
+    ) -> Iterator[Tuple[float, Event]]:
+        """
+        Iterate (timestamp, event) of records between start and end.
+        """
+        start_ts = start.timestamp() if start else 0
+        end_ts = end.timestamp() if end else float("inf")
+
+        with open(self.file_path, mode="rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"不是有效的事件日志文件：{self.file_path}")
+
+            # Seek to first record after start time by index
+            if start:
+                index = self.load_index()
+                if index:
+                    n = bisect_left([ts for ts, _ in index], start_ts)
+                    if n >= len(index):
+                        return
+                    f.seek(index[n][1])
+
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    break
+
+                kind, length, timestamp = RECORD_HEADER.unpack(header)
+
+                if kind != RECORD_EVENT or timestamp < start_ts:
+                    f.seek(length, 1)
+                    continue
+
+                if timestamp > end_ts:
+                    break
+
+                payload = f.read(length)
+                if len(payload) < length:
+                    break
+
+                type, key, data = pickle.loads(payload)
+                yield timestamp, Event(type, data, key)
+
+
+class JournalReplayer:
+    """
+    Feeds events in journal file into event engine, at maximum speed or
+    at (multiple of) wall-clock pace.
+    """
+
+    def __init__(
+        self,
+        event_engine: EventEngine,
+        file_path: Union[str, Path],
+        max_pending: int = 10000
+    ):
+        """
+        Replay is paused when events waiting in event engine queue exceed
+        max_pending, to avoid building unbounded backlog.
+        """
+        self.event_engine: EventEngine = event_engine
+        self.reader: JournalReader = JournalReader(file_path)
+        self.max_pending: int = max_pending
+
+    def replay(
+        self,
+        speed: float = 0,
+        start: datetime = None,
+        end: datetime = None
+    ) -> Tuple[int, float]:
+        """
+        Replay events between start and end.
+
+        Speed of 0 means maximum speed, 1 means wall-clock pace,
+        2 means twice as fast, and so on.
+
+        Return number of events replayed and seconds used.
+        """
+        count = 0
+        begin = perf_counter()
+        first_ts = None
+
+        for timestamp, event in self.reader.read(start, end):
+            if speed:
+                if first_ts is None:
+                    first_ts = timestamp
+
+                wait = (timestamp - first_ts) / speed - (perf_counter() - begin)
+                if wait > 0:
+                    sleep(wait)
+            else:
+                while self.event_engine.qsize() > self.max_pending:
+                    sleep(0.001)
+
+            self.event_engine.put(event)
+            count += 1
+
+        return count, perf_counter() - begin
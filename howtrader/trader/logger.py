@@ -0,0 +1,297 @@
+"""
+Non-blocking logging, which writes log records in a background thread.
+"""
+
+import atexit
+import logging
+import sys
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from queue import Empty, SimpleQueue
+from threading import Thread
+from time import time
+from typing import IO, List, Optional, Union
+
+
+# Max number of records written into targets at a time.
+BATCH_SIZE = 1000
+
+# Default max size of log file before rolling over to next file.
+MAX_BYTES = 100 * 1024 * 1024
+
+
+class LogTarget(ABC):
+    """
+    Output of log records written by LogWriter.
+    """
+
+    def __init__(self, formatter: logging.Formatter, level: int = logging.NOTSET):
+        """"""
+        self.formatter: logging.Formatter = formatter
+        self.level: int = level
+
+    def format(self, records: List[logging.LogRecord]) -> str:
+        """
+        Format records with level not lower than level of target.
+        """
+        lines = []
+
+        for record in records:
+            if record.levelno < self.level:
+                continue
+
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                lines.append(f"日志格式化失败：{record.msg!r} {record.args!r}")
+
+        if not lines:
+            return ""
+
+        lines.append("")
+        return "\n".join(lines)
+
+    @abstractmethod
+    def write(self, text: str) -> None:
+        """"""
+        pass
+
+    def close(self) -> None:
+        """"""
+        pass
+
+
+class StreamTarget(LogTarget):
+    """
+    Writes log into stream, e.g. sys.stdout.
+    """
+
+    def __init__(
+        self,
+        stream: IO,
+        formatter: logging.Formatter,
+        level: int = logging.NOTSET
+    ):
+        """"""
+        super().__init__(formatter, level)
+        self.stream: IO = stream
+
+    def write(self, text: str) -> None:
+        """"""
+        self.stream.write(text)
+        self.stream.flush()
+
+
+class RotatingFileTarget(LogTarget):
+    """
+    Writes log into file, which is rolled over when its size reaches
+    max_bytes (name_1.log, name_2.log and so on), and also every day if
+    daily is set (name_YYYYMMDD.log).
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        formatter: logging.Formatter,
+        level: int = logging.NOTSET,
+        max_bytes: int = MAX_BYTES,
+        daily: bool = False
+    ):
+        """"""
+        super().__init__(formatter, level)
+
+        self.file_path: Path = Path(file_path)
+        self.max_bytes: int = max_bytes
+        self.daily: bool = daily
+
+        self.date: str = ""
+        self.index: int = 0
+        self.size: int = 0
+        self.file: Optional[IO] = None
+
+    def get_path(self) -> Path:
+        """"""
+        stem = self.file_path.stem
+        if self.daily:
+            stem = f"{stem}_{self.date}"
+        if self.index:
+            stem = f"{stem}_{self.index}"
+
+        return self.file_path.with_name(stem + self.file_path.suffix)
+
+    def open(self) -> None:
+        """
+        Open log file to append, skipping files already full.
+        """
+        if self.file:
+            self.file.close()
+
+        while True:
+            path = self.get_path()
+            size = path.stat().st_size if path.exists() else 0
+
+            if not self.max_bytes or size < self.max_bytes:
+                break
+            self.index += 1
+
+        self.file = open(path, mode="ab")
+        self.size = size
+
+    def write(self, text: str) -> None:
+        """"""
+        if self.daily:
+            date = datetime.now().strftime("%Y%m%d")
+            if date != self.date:
+                self.date = date
+                self.index = 0
+                self.open()
+
+        if not self.file:
+            self.open()
+        elif self.max_bytes and self.size >= self.max_bytes:
+            self.index += 1
+            self.open()
+
+        data = text.encode("utf8")
+        self.file.write(data)
+        self.file.flush()
+        self.size += len(data)
+
+    def close(self) -> None:
+        """"""
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+class LogWriter:
+    """
+    Takes log records from a queue and writes them into targets in a
+    background thread, as many records as available at a time.
+    """
+
+    def __init__(self, batch_size: int = BATCH_SIZE):
+        """"""
+        self.batch_size: int = batch_size
+        self.targets: List[LogTarget] = []
+
+        self.queue: SimpleQueue = SimpleQueue()
+        self.thread: Thread = Thread(target=self.run, daemon=True)
+        self.active: bool = False
+
+        atexit.register(self.close)
+
+    def add_target(self, target: LogTarget) -> None:
+        """"""
+        self.targets.append(target)
+
+    def start(self) -> None:
+        """"""
+        self.active = True
+        self.thread.start()
+
+    def put(self, record: logging.LogRecord) -> None:
+        """"""
+        self.queue.put(record)
+
+    def log(self, name: str, level: int, msg: str) -> None:
+        """
+        Put a message without creating log record, which is much faster
+        than logging through logger. Record is created later by writer
+        thread with time of this call.
+        """
+        self.queue.put((name, level, msg, time()))
+
+    def make_record(self, name: str, level: int, msg: str, created: float) -> logging.LogRecord:
+        """"""
+        record = logging.LogRecord(name, level, "", 0, msg, None, None)
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+        return record
+
+    def run(self) -> None:
+        """"""
+        queue = self.queue
+        stopped = False
+
+        while not stopped:
+            record = queue.get()
+            if record is None:
+                break
+
+            records = [record]
+            try:
+                while len(records) < self.batch_size:
+                    record = queue.get_nowait()
+                    if record is None:
+                        stopped = True
+                        break
+                    records.append(record)
+            except Empty:
+                pass
+
+            self.write(records)
+
+        for target in self.targets:
+            target.close()
+
+    def write(self, records: List[Union[logging.LogRecord, tuple]]) -> None:
+        """"""
+        records = [
+            r if isinstance(r, logging.LogRecord) else self.make_record(*r)
+            for r in records
+        ]
+
+        for target in self.targets:
+            try:
+                text = target.format(records)
+                if text:
+                    target.write(text)
+            except Exception:
+                et, ev, tb = sys.exc_info()
+                sys.excepthook(et, ev, tb)
+
+    def close(self) -> None:
+        """
+        Write all records in queue and stop background thread.
+        """
+        if not self.active:
+            return
+        self.active = False
+
+        self.queue.put(None)
+        self.thread.join()
+
+
+class QueueLogHandler(logging.Handler):
+    """
+    Logging handler which only puts records into queue of LogWriter, so
+    that formatting and writing is done in background thread.
+
+    Record arguments are formatted later, so they should not be changed
+    after logging.
+    """
+
+    def __init__(self, writer: LogWriter, level: int = logging.NOTSET):
+        """"""
+        super().__init__(level)
+        self.writer: LogWriter = writer
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        """
+        Put record without acquiring handler lock.
+        """
+        result = self.filter(record)
+        if result:
+            self.writer.put(record)
+        return result
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """"""
+        self.writer.put(record)
+
+    def close(self) -> None:
+        """"""
+        self.writer.close()
+        super().close()
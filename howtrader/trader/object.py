@@ -2,14 +2,70 @@
 Basic data structure used for general trading function in VN Trader.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
 from logging import INFO
+from operator import attrgetter
+from typing import Callable, Dict, Tuple
 
 from .constant import Direction, Exchange, Interval, Offset, Status, Product, OptionType, OrderType
 
 ACTIVE_STATUSES = set([Status.SUBMITTING, Status.NOTTRADED, Status.PARTTRADED])
 
+# Interned vt_symbol strings shared by all tick and bar objects.
+VT_SYMBOLS: Dict[Tuple[str, Exchange], str] = {}
+
+
+def get_vt_symbol(symbol: str, exchange: Exchange) -> str:
+    """
+    Get interned vt_symbol string of symbol and exchange.
+    """
+    vt_symbol = VT_SYMBOLS.get((symbol, exchange), None)
+    if not vt_symbol:
+        vt_symbol = f"{symbol}.{exchange.value}"
+        VT_SYMBOLS[(symbol, exchange)] = vt_symbol
+    return vt_symbol
+
+
+def add_slots(*extra: str) -> Callable[[type], type]:
+    """
+    Recreate dataclass with __slots__ of its own fields (and extra names),
+    so that its objects have no per-object __dict__. Same as
+    dataclass(slots=True) of Python 3.10, which is not available in older
+    versions. All base classes should have __slots__ too.
+    """
+    def decorator(cls: type) -> type:
+        """"""
+        annotations = cls.__dict__.get("__annotations__", {})
+        names = tuple(f.name for f in fields(cls) if f.name in annotations)
+
+        cls_dict = dict(cls.__dict__)
+        cls_dict["__slots__"] = names + extra
+        for name in names:
+            cls_dict.pop(name, None)        # default values are kept by __init__
+        cls_dict.pop("__dict__", None)
+        cls_dict.pop("__weakref__", None)
+
+        new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+        # Create copy with __init__ of dataclass, which is much faster than
+        # default copy protocol for objects without __dict__.
+        get_values = attrgetter(*[f.name for f in fields(new_cls)])
+
+        def __copy__(self):
+            """"""
+            obj = new_cls(*get_values(self))
+            for name in extra:
+                value = getattr(self, name, None)
+                if value is not None:
+                    setattr(obj, name, value)
+            return obj
+
+        new_cls.__copy__ = __copy__
+        return new_cls
+
+    return decorator
+
 
 @dataclass
 class BaseData:
@@ -18,9 +74,12 @@ class BaseData:
     and should inherit base data.
     """
 
+    __slots__ = ("gateway_name",)
+
     gateway_name: str
 
 
+@add_slots("_vt_symbol")
 @dataclass
 class TickData(BaseData):
     """
@@ -71,11 +130,24 @@ class TickData(BaseData):
     ask_volume_4: float = 0
     ask_volume_5: float = 0
 
-    def __post_init__(self):
+    @property
+    def vt_symbol(self) -> str:
+        """
+        vt_symbol is generated on first access.
+        """
+        try:
+            return self._vt_symbol
+        except AttributeError:
+            self._vt_symbol = get_vt_symbol(self.symbol, self.exchange)
+            return self._vt_symbol
+
+    @vt_symbol.setter
+    def vt_symbol(self, vt_symbol: str) -> None:
         """"""
-        self.vt_symbol = f"{self.symbol}.{self.exchange.value}"
+        self._vt_symbol = vt_symbol
 
 
+@add_slots("_vt_symbol")
 @dataclass
 class BarData(BaseData):
     """
@@ -94,9 +166,21 @@ class BarData(BaseData):
     low_price: float = 0
     close_price: float = 0
 
-    def __post_init__(self):
+    @property
+    def vt_symbol(self) -> str:
+        """
+        vt_symbol is generated on first access.
+        """
+        try:
+            return self._vt_symbol
+        except AttributeError:
+            self._vt_symbol = get_vt_symbol(self.symbol, self.exchange)
+            return self._vt_symbol
+
+    @vt_symbol.setter
+    def vt_symbol(self, vt_symbol: str) -> None:
         """"""
-        self.vt_symbol = f"{self.symbol}.{self.exchange.value}"
+        self._vt_symbol = vt_symbol
 
 
 @dataclass
@@ -0,0 +1,458 @@
+"""
+Columnar containers of bar and tick data backed by numpy structured array.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime, tzinfo
+from typing import Any, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .constant import Exchange, Interval
+from .object import BarData, TickData
+
+
+BAR_FIELDS: List[str] = [
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+    "volume",
+    "open_interest",
+]
+
+TICK_FIELDS: List[str] = [
+    "volume",
+    "open_interest",
+    "last_price",
+    "last_volume",
+    "limit_up",
+    "limit_down",
+    "open_price",
+    "high_price",
+    "low_price",
+    "pre_close",
+] + [
+    f"{side}_{kind}_{n}"
+    for kind in ["price", "volume"]
+    for side in ["bid", "ask"]
+    for n in range(1, 6)
+]
+
+BAR_DTYPE = np.dtype([("datetime", "datetime64[us]")] + [(name, "f8") for name in BAR_FIELDS])
+TICK_DTYPE = np.dtype([("datetime", "datetime64[us]")] + [(name, "f8") for name in TICK_FIELDS])
+
+# numpy unit of interval used for resampling
+INTERVAL_UNITS = {
+    Interval.MINUTE: "m",
+    Interval.HOUR: "h",
+    Interval.DAILY: "D",
+}
+
+# Number of rows converted to python objects at a time when iterating.
+ITER_CHUNK = 4096
+
+
+def merge_arrays(arrays: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Concatenate structured arrays, sorted by datetime and without
+    duplicated datetime (row of later array is kept).
+    """
+    data = np.concatenate(arrays)
+
+    # Stable sort keeps order of rows with same datetime, then keep
+    # the last one of each datetime.
+    data = data[np.argsort(data["datetime"], kind="stable")]
+    if len(data) > 1:
+        dt = data["datetime"]
+        keep = np.ones(len(data), dtype=bool)
+        keep[:-1] = dt[1:] != dt[:-1]
+        data = data[keep]
+
+    return data
+
+
+class BaseSeries(ABC):
+    """
+    Data of one symbol stored in columns of a numpy structured array.
+    Each row can be accessed as data object, which is created on demand
+    and does not write back to the series when changed.
+
+    Datetime column keeps wall-clock time without timezone, and tz is
+    attached again when data object is created.
+    """
+
+    dtype: np.dtype = None
+    fields: List[str] = []
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        data: np.ndarray = None,
+        tz: tzinfo = None,
+        gateway_name: str = "DB"
+    ):
+        """"""
+        self.symbol: str = symbol
+        self.exchange: Exchange = exchange
+        self.tz: tzinfo = tz
+        self.gateway_name: str = gateway_name
+
+        if data is None:
+            data = np.empty(0, dtype=self.dtype)
+        self.data: np.ndarray = data
+
+    @property
+    def vt_symbol(self) -> str:
+        """"""
+        return f"{self.symbol}.{self.exchange.value}"
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Tuple],
+        symbol: str,
+        exchange: Exchange,
+        tz: tzinfo = None,
+        **kwargs: Any
+    ) -> "BaseSeries":
+        """
+        Create series from rows of (datetime, *fields) tuples, e.g. raw
+        rows from database query. Datetimes should not have tzinfo, and
+        None values are filled with 0.
+        """
+        data = np.array(rows, dtype=cls.dtype)
+
+        for name in cls.fields:
+            column = data[name]
+            np.nan_to_num(column, copy=False)
+
+        return cls(symbol, exchange, data=data, tz=tz, **kwargs)
+
+    @classmethod
+    def make_array(cls, columns: Sequence[Sequence[Any]]) -> np.ndarray:
+        """
+        Create structured array from columns of (datetime, *fields), which
+        are converted column by column instead of row by row. Datetimes can
+        be datetime without tzinfo or ISO format string (as returned by
+        SQLite), and None values are filled with 0.
+        """
+        data = np.empty(len(columns[0]), dtype=cls.dtype)
+        data["datetime"] = columns[0]
+
+        for name, column in zip(cls.fields, columns[1:]):
+            data[name] = np.nan_to_num(np.array(column, dtype="f8"), copy=False)
+
+        return data
+
+    def _get_rows(self, objs: Sequence[Any]) -> Tuple[List[Tuple], tzinfo]:
+        """
+        Convert data objects into rows.
+        """
+        tz = objs[0].datetime.tzinfo if objs else self.tz
+        rows = []
+
+        for obj in objs:
+            dt = obj.datetime
+            if dt.tzinfo:
+                dt = dt.astimezone(tz).replace(tzinfo=None)
+
+            row = [dt]
+            row.extend(getattr(obj, name) for name in self.fields)
+            rows.append(tuple(row))
+
+        return rows, tz
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.data)
+
+    def __getitem__(self, key: Union[int, slice, str, np.ndarray]) -> Any:
+        """
+        series[n] gives data object of row n, series[a:b] (or bool mask)
+        gives a new series sharing the same array, and series["name"]
+        gives column array.
+        """
+        if isinstance(key, str):
+            return self.data[key]
+
+        if isinstance(key, (int, np.integer)):
+            row = self.data[key]
+            values = [row[name].item() for name in self.dtype.names]
+            return self._create(values)
+
+        return self._new(self.data[key])
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Iterate data objects of all rows, which are created chunk by chunk.
+        """
+        names = self.dtype.names
+
+        for start in range(0, len(self.data), ITER_CHUNK):
+            chunk = self.data[start:start + ITER_CHUNK]
+            columns = [chunk[name].tolist() for name in names]
+
+            for values in zip(*columns):
+                yield self._create(values)
+
+    def _new(self, data: np.ndarray) -> "BaseSeries":
+        """
+        Create series with same attributes but different array.
+        """
+        series = object.__new__(type(self))
+        series.__dict__.update(self.__dict__)
+        series.data = data
+        return series
+
+    @abstractmethod
+    def _create(self, values: Sequence[Any]) -> Any:
+        """
+        Create data object of one row.
+        """
+        pass
+
+    def _get_datetime(self, dt: datetime) -> datetime:
+        """"""
+        if self.tz:
+            return dt.replace(tzinfo=self.tz)
+        return dt
+
+    def to_list(self) -> list:
+        """"""
+        return list(self)
+
+    def append(self, obj: Any) -> None:
+        """
+        Append one data object. Use merge for large amount of data.
+        """
+        rows, tz = self._get_rows([obj])
+        if self.tz is None:
+            self.tz = tz
+
+        self.data = np.concatenate([self.data, np.array(rows, dtype=self.dtype)])
+
+    def merge(self, other: "BaseSeries") -> "BaseSeries":
+        """
+        Merge data of other series, sorted by datetime. For rows with the
+        same datetime, row from other series is kept.
+        """
+        return self.concat([self, other])
+
+    @classmethod
+    def concat(cls, series_list: Sequence["BaseSeries"]) -> "BaseSeries":
+        """
+        Concatenate series of the same symbol, sorted by datetime and
+        without duplicated datetime (later one is kept).
+        """
+        series_list = [s for s in series_list if len(s)] or series_list[:1]
+        if not series_list:
+            raise ValueError("合并数据序列不能为空")
+
+        first = series_list[0]
+        data = merge_arrays([s.data for s in series_list])
+        return first._new(data)
+
+    def get_datetime_index(self, dt: datetime) -> int:
+        """
+        Get index of first row with datetime not earlier than dt.
+        """
+        if dt.tzinfo:
+            dt = dt.astimezone(self.tz).replace(tzinfo=None)
+        return int(np.searchsorted(self.data["datetime"], np.datetime64(dt, "us")))
+
+
+class BarSeries(BaseSeries):
+    """
+    Columnar bar data of one symbol and interval.
+    """
+
+    dtype: np.dtype = BAR_DTYPE
+    fields: List[str] = BAR_FIELDS
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval = None,
+        data: np.ndarray = None,
+        tz: tzinfo = None,
+        gateway_name: str = "DB"
+    ):
+        """"""
+        super().__init__(symbol, exchange, data, tz, gateway_name)
+        self.interval: Interval = interval
+
+    @classmethod
+    def from_bars(cls, bars: Sequence[BarData], **kwargs: Any) -> "BarSeries":
+        """
+        Create series from list of bar data. Symbol, exchange and interval
+        are taken from first bar if not given.
+        """
+        if bars:
+            bar = bars[0]
+            kwargs.setdefault("symbol", bar.symbol)
+            kwargs.setdefault("exchange", bar.exchange)
+            kwargs.setdefault("interval", bar.interval)
+            kwargs.setdefault("gateway_name", bar.gateway_name)
+
+        series = cls(**kwargs)
+        rows, series.tz = series._get_rows(bars)
+        series.data = np.array(rows, dtype=cls.dtype)
+        return series
+
+    def _create(self, values: Sequence[Any]) -> BarData:
+        """"""
+        dt, open_price, high_price, low_price, close_price, volume, open_interest = values
+
+        return BarData(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            datetime=self._get_datetime(dt),
+            interval=self.interval,
+            volume=volume,
+            open_interest=open_interest,
+            open_price=open_price,
+            high_price=high_price,
+            low_price=low_price,
+            close_price=close_price,
+            gateway_name=self.gateway_name
+        )
+
+    def resample(self, window: int, interval: Interval = None) -> "BarSeries":
+        """
+        Aggregate bars into bars of window * interval, aligned to whole
+        intervals of the day (e.g. 15 minute bars start from minute 0, 15,
+        30 and 45). Datetime of each new bar is the datetime of its first
+        bar, same as BarGenerator.
+        """
+        if not interval:
+            interval = self.interval
+
+        unit = INTERVAL_UNITS.get(interval, None)
+        if not unit:
+            raise ValueError(f"不支持的K线周期：{interval}")
+
+        data = self.data
+        if not len(data):
+            return self._new(data.copy())
+
+        keys = data["datetime"].astype(f"datetime64[{unit}]").astype(np.int64) // window
+        starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+        ends = np.concatenate([starts[1:], [len(data)]]) - 1
+
+        new_data = np.empty(len(starts), dtype=self.dtype)
+        new_data["datetime"] = data["datetime"][starts]
+        new_data["open_price"] = data["open_price"][starts]
+        new_data["high_price"] = np.maximum.reduceat(data["high_price"], starts)
+        new_data["low_price"] = np.minimum.reduceat(data["low_price"], starts)
+        new_data["close_price"] = data["close_price"][ends]
+        new_data["volume"] = np.add.reduceat(data["volume"], starts)
+        new_data["open_interest"] = data["open_interest"][ends]
+
+        series = self._new(new_data)
+        series.interval = interval
+        return series
+
+    def aggregate(
+        self,
+        window: int,
+        interval: Interval = Interval.MINUTE
+    ) -> Tuple["BarSeries", int]:
+        """
+        Aggregate 1 minute bars into x minute or x hour bars with the same
+        window boundaries as BarGenerator.update_bar: x minute bar is
+        finished by bar of minute m with (m + 1) divisible by x, and x hour
+        bar is finished by every x-th bar of minute 59.
+
+        Return series of finished window bars and number of 1 minute bars
+        used for them. Bars after that belong to the unfinished window,
+        and can be passed to BarGenerator to continue.
+        """
+        data = self.data
+        minutes = data["datetime"].astype("datetime64[m]").astype(np.int64) % 60
+
+        if interval == Interval.MINUTE:
+            ends = np.flatnonzero((minutes + 1) % window == 0)
+            unit = "m"
+        elif interval == Interval.HOUR:
+            ends = np.flatnonzero(minutes == 59)[window - 1::window]
+            unit = "h"
+        else:
+            raise ValueError(f"不支持的K线周期：{interval}")
+
+        new_data = np.empty(len(ends), dtype=self.dtype)
+        series = self._new(new_data)
+        series.interval = None
+
+        if not len(ends):
+            return series, 0
+
+        count = int(ends[-1]) + 1
+        starts = np.concatenate([[0], ends[:-1] + 1])
+        data = data[:count]
+
+        new_data["datetime"] = data["datetime"][starts].astype(f"datetime64[{unit}]")
+        new_data["open_price"] = data["open_price"][starts]
+        new_data["high_price"] = np.maximum.reduceat(data["high_price"], starts)
+        new_data["low_price"] = np.minimum.reduceat(data["low_price"], starts)
+        new_data["close_price"] = data["close_price"][ends]
+        new_data["volume"] = np.add.reduceat(data["volume"], starts)
+        new_data["open_interest"] = data["open_interest"][ends]
+
+        return series, count
+
+
+class TickSeries(BaseSeries):
+    """
+    Columnar tick data of one symbol.
+    """
+
+    dtype: np.dtype = TICK_DTYPE
+    fields: List[str] = TICK_FIELDS
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        data: np.ndarray = None,
+        tz: tzinfo = None,
+        gateway_name: str = "DB",
+        name: str = ""
+    ):
+        """"""
+        super().__init__(symbol, exchange, data, tz, gateway_name)
+        self.name: str = name
+
+    @classmethod
+    def from_ticks(cls, ticks: Sequence[TickData], **kwargs: Any) -> "TickSeries":
+        """
+        Create series from list of tick data. Symbol, exchange and name
+        are taken from first tick if not given.
+        """
+        if ticks:
+            tick = ticks[0]
+            kwargs.setdefault("symbol", tick.symbol)
+            kwargs.setdefault("exchange", tick.exchange)
+            kwargs.setdefault("gateway_name", tick.gateway_name)
+            kwargs.setdefault("name", tick.name)
+
+        series = cls(**kwargs)
+        rows, series.tz = series._get_rows(ticks)
+        series.data = np.array(rows, dtype=cls.dtype)
+        return series
+
+    def _create(self, values: Sequence[Any]) -> TickData:
+        """"""
+        kwargs = dict(zip(TICK_FIELDS, values[1:]))
+
+        return TickData(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            datetime=self._get_datetime(values[0]),
+            name=self.name,
+            gateway_name=self.gateway_name,
+            **kwargs
+        )
+
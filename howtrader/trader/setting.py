@@ -17,6 +17,7 @@ SETTINGS: Dict[str, Any] = {
     "log.level": CRITICAL,
     "log.console": True,
     "log.file": True,
+    "log.max_bytes": 100 * 1024 * 1024,         # 0 for no size limit of log file
 
     "email.server": "smtp.qq.com",
     "email.port": 465,
@@ -33,6 +34,7 @@ SETTINGS: Dict[str, Any] = {
     "database.user": "root",
     "database.password": "",
     "database.authentication_source": "admin",  # for mongodb
+    "database.batch_size": 5000,                # for mongodb, documents written by one bulk_write
 }
 
 # Load global setting from json file.
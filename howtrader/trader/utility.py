@@ -2,18 +2,37 @@
 General utility functions.
 """
 
+import atexit
 import json
 import logging
+import os
 import sys
+from datetime import datetime, time, timedelta
 from pathlib import Path
-from typing import Callable, Dict, Tuple, Optional
+from threading import Event as ThreadEvent, Lock, Thread
+from typing import Any, Callable, Dict, List, Tuple, Optional, Type, Union
 from decimal import Decimal
 from math import floor, ceil
 
 import numpy as np
 
 from .object import BarData, TickData
+from .series import BarSeries
 from .constant import Exchange, Interval
+from .logger import LogWriter, QueueLogHandler, RotatingFileTarget
+from .indicator import (
+    Indicator,
+    SmaIndicator,
+    EmaIndicator,
+    StdIndicator,
+    AtrIndicator,
+    RsiIndicator,
+    BollIndicator,
+    DonchianIndicator,
+    KeltnerIndicator,
+    MacdIndicator,
+    CciIndicator
+)
 
 
 log_formatter = logging.Formatter('[%(asctime)s] %(message)s')
@@ -91,6 +110,9 @@ def load_json(filename: str) -> dict:
     """
     Load data from json file in temp path.
     """
+    # Write data not saved yet first
+    json_store.flush(filename)
+
     filepath = get_file_path(filename)
 
     if filepath.exists():
@@ -105,45 +127,282 @@ def load_json(filename: str) -> dict:
 def save_json(filename: str, data: dict) -> None:
     """
     Save data into json file in temp path.
+
+    Data is written into a temp file first and then renamed, so that the
+    file is never left half written.
     """
+    text = json.dumps(data, indent=4, ensure_ascii=False)
+
     filepath = get_file_path(filename)
-    with open(filepath, mode="w+", encoding="UTF-8") as f:
-        json.dump(
-            data,
-            f,
-            indent=4,
-            ensure_ascii=False
-        )
+    temp_path = filepath.with_name(filepath.name + ".tmp")
+
+    with open(temp_path, mode="w+", encoding="UTF-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(temp_path, filepath)
+
+
+class JsonStore:
+    """
+    Saves json files in a background thread instead of the caller (usually
+    event engine thread).
+
+    Saving the same file again before it is written only replaces data to
+    be written, so frequent updates are written at most once per interval.
+    Data is serialized when written, so it should be the latest state
+    kept by caller rather than a temporary copy.
+    """
+
+    def __init__(self, interval: float = 1):
+        """"""
+        self.interval: float = interval
+
+        self.pending: Dict[str, Any] = {}
+        self.lock: Lock = Lock()                # for pending data
+        self.write_lock: Lock = Lock()          # for writing files
+
+        self.active: bool = False
+        self.thread: Thread = None
+        self.wakeup: ThreadEvent = ThreadEvent()
+
+        atexit.register(self.close)
+
+    def save(self, filename: str, data: Any) -> None:
+        """
+        Mark file to be saved with data.
+        """
+        with self.lock:
+            self.pending[filename] = data
+
+            if not self.active:
+                self.start()
+
+    def start(self) -> None:
+        """"""
+        self.active = True
+        self.wakeup.clear()
+
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        """"""
+        while self.active:
+            self.wakeup.wait(self.interval)
+            self.flush()
+
+    def flush(self, filename: str = "") -> None:
+        """
+        Write pending data into files immediately, or only the given file.
+        """
+        with self.write_lock:
+            with self.lock:
+                if filename:
+                    if filename not in self.pending:
+                        return
+                    items = [(filename, self.pending.pop(filename))]
+                else:
+                    items = list(self.pending.items())
+                    self.pending.clear()
+
+            for filename, data in items:
+                try:
+                    save_json(filename, data)
+                except RuntimeError:
+                    # Data changed by other thread while being serialized,
+                    # retry in next flush unless saved again.
+                    with self.lock:
+                        self.pending.setdefault(filename, data)
+                except Exception:
+                    et, ev, tb = sys.exc_info()
+                    sys.excepthook(et, ev, tb)
+
+    def close(self) -> None:
+        """
+        Stop background thread and write all pending data.
+        """
+        with self.lock:
+            active = self.active
+            self.active = False
+
+        if active:
+            self.wakeup.set()
+            self.thread.join()
+
+        self.flush()
+
+
+json_store: JsonStore = JsonStore()
+
+
+class Rounder:
+    """
+    Round value to multiple of target (e.g. pricetick or min volume),
+    with the same result as calculating in Decimal of str(value).
+
+    Target is kept as integer tick / integer scale, so result is created
+    from integer multiple exactly. Multiple is calculated with float, and
+    Decimal is only used when the float is too close to a rounding
+    boundary to be decided.
+    """
+
+    # Relative error allowed for float multiple, far larger than error of
+    # float calculation.
+    epsilon: float = 1e-12
+
+    # Integer multiple of tick below this can be compared as float exactly
+    max_exact: int = 10 ** 15
+
+    def __init__(self, target: float):
+        """"""
+        self.target: float = target
+        self.decimal_target: Decimal = Decimal(str(target))
+
+        sign, digits, exponent = self.decimal_target.as_tuple()
+        tick = int("".join(map(str, digits)) or 0)
+
+        if exponent >= 0:
+            self.tick: int = tick * 10 ** exponent
+            self.scale: int = 1
+        else:
+            self.tick: int = tick
+            self.scale: int = 10 ** -exponent
+
+        if sign or not self.tick:
+            raise ValueError(f"取整目标必须为正数：{target}")
+
+        self.factor: float = self.scale / self.tick
+
+    def round(self, value: float) -> float:
+        """
+        Round value to nearest multiple of target (half to even).
+        """
+        q = value * self.factor
+        n = round(q)
+
+        if abs(abs(q - n) - 0.5) <= (abs(q) + 1) * self.epsilon:
+            return self.round_decimal(value, round)
+        return n * self.tick / self.scale
+
+    def floor(self, value: float) -> float:
+        """
+        Similar to math.floor function, but to multiple of target.
+        """
+        q = value * self.factor
+        n = round(q)
+
+        if abs(q - n) <= (abs(q) + 1) * self.epsilon:
+            return self.snap(value, n, floor)
+        return floor(q) * self.tick / self.scale
+
+    def ceil(self, value: float) -> float:
+        """
+        Similar to math.ceil function, but to multiple of target.
+        """
+        q = value * self.factor
+        n = round(q)
+
+        if abs(q - n) <= (abs(q) + 1) * self.epsilon:
+            return self.snap(value, n, ceil)
+        return ceil(q) * self.tick / self.scale
+
+    def snap(self, value: float, n: int, func: Callable) -> float:
+        """
+        Value close to multiple n of target is usually exactly on it, which
+        can be checked without Decimal.
+        """
+        if abs(n) < self.max_exact:
+            result = n * self.tick / self.scale
+            if result == value:
+                return result
+
+        return self.round_decimal(value, func)
+
+    def round_decimal(self, value: float, func: Callable) -> float:
+        """
+        Calculate with Decimal, same as original implementation.
+        """
+        target = self.decimal_target
+        return float(int(func(Decimal(str(value)) / target)) * target)
+
+    def round_array(self, values: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of round.
+        """
+        q = np.asarray(values, dtype=float) * self.factor
+        n = np.rint(q)
+        result = n * self.tick / self.scale
+
+        close = np.abs(np.abs(q - n) - 0.5) <= (np.abs(q) + 1) * self.epsilon
+        for i in np.flatnonzero(close):
+            result[i] = self.round(float(values[i]))
+
+        return result
+
+    def floor_array(self, values: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of floor.
+        """
+        return self._calculate_array(values, np.floor, self.floor)
+
+    def ceil_array(self, values: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of ceil.
+        """
+        return self._calculate_array(values, np.ceil, self.ceil)
+
+    def _calculate_array(
+        self,
+        values: np.ndarray,
+        array_func: Callable,
+        func: Callable
+    ) -> np.ndarray:
+        """"""
+        q = np.asarray(values, dtype=float) * self.factor
+        result = array_func(q) * self.tick / self.scale
+
+        close = np.abs(q - np.rint(q)) <= (np.abs(q) + 1) * self.epsilon
+        for i in np.flatnonzero(close):
+            result[i] = func(float(values[i]))
+
+        return result
+
+
+ROUNDERS: Dict[float, Rounder] = {}
+
+
+def get_rounder(target: float) -> Rounder:
+    """
+    Get rounder of target, which is created once and then cached.
+    """
+    rounder = ROUNDERS.get(target, None)
+    if not rounder:
+        rounder = Rounder(target)
+        ROUNDERS[target] = rounder
+    return rounder
 
 
 def round_to(value: float, target: float) -> float:
     """
     Round price to price tick value.
     """
-    value = Decimal(str(value))
-    target = Decimal(str(target))
-    rounded = float(int(round(value / target)) * target)
-    return rounded
+    return get_rounder(target).round(value)
 
 
 def floor_to(value: float, target: float) -> float:
     """
     Similar to math.floor function, but to target float number.
     """
-    value = Decimal(str(value))
-    target = Decimal(str(target))
-    result = float(int(floor(value / target)) * target)
-    return result
+    return get_rounder(target).floor(value)
 
 
 def ceil_to(value: float, target: float) -> float:
     """
     Similar to math.ceil function, but to target float number.
     """
-    value = Decimal(str(value))
-    target = Decimal(str(target))
-    result = float(int(ceil(value / target)) * target)
-    return result
+    return get_rounder(target).ceil(value)
 
 
 def get_digits(value: float) -> int:
@@ -306,6 +565,41 @@ class BarGenerator:
         # Cache last bar object
         self.last_bar = bar
 
+    def update_series(self, series: BarSeries, callback: Callable = None) -> None:
+        """
+        Update history 1 minute bar series into generator, e.g. for
+        initializing strategy.
+
+        Window bars are aggregated from the series with numpy at once and
+        pushed to on_window_bar directly. Only bars of the unfinished
+        window at beginning and end of series are passed to callback
+        (update_bar by default) one by one, so that generator can continue
+        with following bars.
+        """
+        if not callback:
+            callback = self.update_bar
+
+        if not self.window or not self.on_window_bar:
+            for bar in series:
+                callback(bar)
+            return
+
+        # Finish current window bar first
+        ix = 0
+        while self.window_bar and ix < len(series):
+            callback(series[ix])
+            ix += 1
+
+        window_series, count = series[ix:].aggregate(self.window, self.interval)
+        for window_bar in window_series:
+            self.on_window_bar(window_bar)
+
+        if count:
+            self.last_bar = series[ix + count - 1]
+
+        for bar in series[ix + count:]:
+            callback(bar)
+
     def generate(self) -> Optional[BarData]:
         """
         Generate the bar data and call callback immediately.
@@ -320,11 +614,194 @@ class BarGenerator:
         return bar
 
 
+class BarWindow:
+    """
+    State of one window of MultiBarGenerator. Prices are kept as plain
+    floats, and bar data object is only created when window is finished.
+    """
+
+    __slots__ = (
+        "minutes", "interval", "callback", "start",
+        "datetime", "open_price", "high_price", "low_price",
+        "close_price", "volume", "open_interest"
+    )
+
+    def __init__(self, minutes: int, interval: Interval, callback: Callable):
+        """"""
+        self.minutes: int = minutes
+        self.interval: Interval = interval
+        self.callback: Callable = callback
+
+        self.start: int = -1        # session minute index of window start, -1 if empty
+        self.datetime: datetime = None
+        self.open_price: float = 0
+        self.high_price: float = 0
+        self.low_price: float = 0
+        self.close_price: float = 0
+        self.volume: float = 0
+        self.open_interest: float = 0
+
+
+class MultiBarGenerator:
+    """
+    For:
+    1. generating 1 minute bar data from tick data
+    2. generating bars of many windows (e.g. 5 minute, 15 minute, 1 hour
+       and 4 hour) at once from 1 minute data
+
+    All windows are aligned to start of trading session, which is
+    midnight by default and can be changed with session_start (e.g.
+    time(21, 0) for night session of futures). So minute windows do not
+    have to divide 60 and hour windows do not depend on first bar.
+
+    A window is finished with its last minute bar (same as BarGenerator),
+    or when bar of next window arrives if some minute bars are missing.
+    Last window of a session may be shorter if window does not divide the
+    session.
+    """
+
+    def __init__(self, on_bar: Callable = None, session_start: time = None):
+        """Constructor"""
+        self.on_bar: Callable = on_bar
+        self.windows: List[BarWindow] = []
+
+        if session_start:
+            self.offset: int = session_start.hour * 60 + session_start.minute
+        else:
+            self.offset: int = 0
+
+        self.symbol: str = ""
+        self.exchange: Exchange = None
+        self.gateway_name: str = ""
+
+        # Ticks are aggregated into 1 minute bar by BarGenerator
+        self.bar_generator: BarGenerator = BarGenerator(self.on_minute_bar)
+
+    def add_window(
+        self,
+        window: int,
+        on_window_bar: Callable,
+        interval: Interval = Interval.MINUTE
+    ) -> None:
+        """
+        Add a window of x minute, x hour or x day bar.
+        """
+        if interval == Interval.MINUTE:
+            minutes = window
+        elif interval == Interval.HOUR:
+            minutes = window * 60
+        elif interval == Interval.DAILY:
+            minutes = window * 1440
+        else:
+            raise ValueError(f"不支持的K线周期：{interval}")
+
+        if minutes <= 0 or (minutes > 1440 and minutes % 1440):
+            raise ValueError(f"不支持的K线窗口：{window}{interval.value}")
+
+        self.windows.append(BarWindow(minutes, interval, on_window_bar))
+
+    def update_tick(self, tick: TickData) -> None:
+        """
+        Update new tick data into generator.
+        """
+        self.bar_generator.update_tick(tick)
+
+    def on_minute_bar(self, bar: BarData) -> None:
+        """
+        Callback of 1 minute bar generated from tick data.
+        """
+        if self.on_bar:
+            self.on_bar(bar)
+        else:
+            self.update_bar(bar)
+
+    def update_bar(self, bar: BarData) -> None:
+        """
+        Update 1 minute bar into all windows.
+        """
+        self.symbol = bar.symbol
+        self.exchange = bar.exchange
+        self.gateway_name = bar.gateway_name
+
+        # Minute index of bar shifted by session start, so that every
+        # session starts at a multiple of 1440. Shared by all windows.
+        dt = bar.datetime
+        index = dt.toordinal() * 1440 + dt.hour * 60 + dt.minute - self.offset
+        minute = index % 1440
+
+        for w in self.windows:
+            minutes = w.minutes
+            if minutes < 1440:
+                pos = minute % minutes
+                last = pos + 1 == minutes or minute == 1439
+            else:
+                pos = index % minutes
+                last = pos + 1 == minutes
+            start = index - pos
+
+            if w.start != start:
+                if w.start >= 0:
+                    self.finish_window(w)
+
+                w.start = start
+                w.datetime = dt.replace(second=0, microsecond=0) - timedelta(minutes=pos)
+                w.open_price = bar.open_price
+                w.high_price = bar.high_price
+                w.low_price = bar.low_price
+                w.volume = 0
+            else:
+                if bar.high_price > w.high_price:
+                    w.high_price = bar.high_price
+                if bar.low_price < w.low_price:
+                    w.low_price = bar.low_price
+
+            w.close_price = bar.close_price
+            w.volume += bar.volume
+            w.open_interest = bar.open_interest
+
+            if last:
+                self.finish_window(w)
+
+    def finish_window(self, w: BarWindow) -> None:
+        """
+        Create bar data of window and push it to callback.
+        """
+        bar = BarData(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            datetime=w.datetime,
+            gateway_name=self.gateway_name,
+            volume=w.volume,
+            open_interest=w.open_interest,
+            open_price=w.open_price,
+            high_price=w.high_price,
+            low_price=w.low_price,
+            close_price=w.close_price
+        )
+        w.start = -1
+        w.callback(bar)
+
+    def generate(self) -> None:
+        """
+        Generate 1 minute bar from ticks received so far immediately.
+        """
+        self.bar_generator.generate()
+
+
 class ArrayManager(object):
     """
     For:
     1. time series container of bar data
     2. calculating technical indicator value
+
+    Data is kept in a ring buffer which stores every value twice (at n
+    and n + size), so that appending a bar is O(1) and the latest size
+    values are always available as a contiguous ordered view. Views
+    returned by properties are only valid until next update_bar.
+
+    Indicator functions (sma, atr, rsi and so on) register an incremental
+    indicator on first call, which is warmed up with bars already in the
+    array manager and then updated with every new bar.
     """
 
     def __init__(self, size: int = 100):
@@ -333,12 +810,11 @@ class ArrayManager(object):
         self.size: int = size
         self.inited: bool = False
 
-        self.open_array: np.ndarray = np.zeros(size)
-        self.high_array: np.ndarray = np.zeros(size)
-        self.low_array: np.ndarray = np.zeros(size)
-        self.close_array: np.ndarray = np.zeros(size)
-        self.volume_array: np.ndarray = np.zeros(size)
-        self.open_interest_array: np.ndarray = np.zeros(size)
+        # Rows: open, high, low, close, volume, open_interest
+        self._buffer: np.ndarray = np.zeros((6, size * 2))
+        self._pos: int = 0          # position of oldest value in ring
+
+        self._indicators: Dict[Tuple, Indicator] = {}
 
     def update_bar(self, bar: BarData) -> None:
         """
@@ -348,61 +824,229 @@ class ArrayManager(object):
         if not self.inited and self.count >= self.size:
             self.inited = True
 
-        self.open_array[:-1] = self.open_array[1:]
-        self.high_array[:-1] = self.high_array[1:]
-        self.low_array[:-1] = self.low_array[1:]
-        self.close_array[:-1] = self.close_array[1:]
-        self.volume_array[:-1] = self.volume_array[1:]
-        self.open_interest_array[:-1] = self.open_interest_array[1:]
+        values = (
+            bar.open_price,
+            bar.high_price,
+            bar.low_price,
+            bar.close_price,
+            bar.volume,
+            bar.open_interest
+        )
 
-        self.open_array[-1] = bar.open_price
-        self.high_array[-1] = bar.high_price
-        self.low_array[-1] = bar.low_price
-        self.close_array[-1] = bar.close_price
-        self.volume_array[-1] = bar.volume
-        self.open_interest_array[-1] = bar.open_interest
+        pos = self._pos
+        self._buffer[:, pos] = values
+        self._buffer[:, pos + self.size] = values
+
+        pos += 1
+        if pos == self.size:
+            pos = 0
+        self._pos = pos
+
+        for indicator in self._indicators.values():
+            indicator.update(
+                bar.open_price,
+                bar.high_price,
+                bar.low_price,
+                bar.close_price,
+                bar.volume
+            )
+
+    def _get_array(self, row: int) -> np.ndarray:
+        """
+        Get ordered view of latest size values in a row of buffer.
+        """
+        return self._buffer[row, self._pos:self._pos + self.size]
 
     @property
     def open(self) -> np.ndarray:
         """
         Get open price time series.
         """
-        return self.open_array
+        return self._get_array(0)
 
     @property
     def high(self) -> np.ndarray:
         """
         Get high price time series.
         """
-        return self.high_array
+        return self._get_array(1)
 
     @property
     def low(self) -> np.ndarray:
         """
         Get low price time series.
         """
-        return self.low_array
+        return self._get_array(2)
 
     @property
     def close(self) -> np.ndarray:
         """
         Get close price time series.
         """
-        return self.close_array
+        return self._get_array(3)
 
     @property
     def volume(self) -> np.ndarray:
         """
         Get trading volume time series.
         """
-        return self.volume_array
+        return self._get_array(4)
 
     @property
     def open_interest(self) -> np.ndarray:
         """
         Get trading volume time series.
         """
-        return self.open_interest_array
+        return self._get_array(5)
+
+    # Kept for strategies accessing arrays directly
+    open_array = open
+    high_array = high
+    low_array = low
+    close_array = close
+    volume_array = volume
+    open_interest_array = open_interest
+
+    def get_indicator(
+        self,
+        key: Tuple,
+        indicator_class: Type[Indicator],
+        *args: Any
+    ) -> Indicator:
+        """
+        Get indicator registered with key, or create and register a new one.
+        """
+        indicator = self._indicators.get(key, None)
+
+        if not indicator:
+            indicator = indicator_class(self.size, *args)
+
+            # Warm up with bars already in array manager
+            count = min(self.count, self.size)
+            if count:
+                arrays = [self._get_array(row)[-count:] for row in range(5)]
+                for values in zip(*[array.tolist() for array in arrays]):
+                    indicator.update(*values)
+
+            self._indicators[key] = indicator
+
+        return indicator
+
+    def sma(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
+        """
+        Simple moving average.
+        """
+        indicator = self.get_indicator(("sma", n), SmaIndicator, n)
+        if array:
+            return indicator.get_array()
+        return indicator.get_value()
+
+    def ema(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
+        """
+        Exponential moving average.
+        """
+        indicator = self.get_indicator(("ema", n), EmaIndicator, n)
+        if array:
+            return indicator.get_array()
+        return indicator.get_value()
+
+    def std(self, n: int, ddof: int = 1, array: bool = False) -> Union[float, np.ndarray]:
+        """
+        Standard deviation.
+        """
+        indicator = self.get_indicator(("std", n, ddof), StdIndicator, n, ddof)
+        if array:
+            return indicator.get_array()
+        return indicator.get_value()
+
+    def atr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
+        """
+        Average True Range.
+        """
+        indicator = self.get_indicator(("atr", n), AtrIndicator, n)
+        if array:
+            return indicator.get_array()
+        return indicator.get_value()
+
+    def rsi(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
+        """
+        Relative Strenght Index.
+        """
+        indicator = self.get_indicator(("rsi", n), RsiIndicator, n)
+        if array:
+            return indicator.get_array()
+        return indicator.get_value()
+
+    def cci(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
+        """
+        Commodity Channel Index.
+        """
+        indicator = self.get_indicator(("cci", n), CciIndicator, n)
+        if array:
+            return indicator.get_array()
+        return indicator.get_value()
+
+    def macd(
+        self,
+        fast_period: int,
+        slow_period: int,
+        signal_period: int,
+        array: bool = False
+    ) -> Union[Tuple[float, float, float], Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        MACD: (macd, signal, hist)
+        """
+        indicator = self.get_indicator(
+            ("macd", fast_period, slow_period, signal_period),
+            MacdIndicator,
+            fast_period,
+            slow_period,
+            signal_period
+        )
+        if array:
+            return indicator.get_array(0), indicator.get_array(1), indicator.get_array(2)
+        return indicator.get_value(0), indicator.get_value(1), indicator.get_value(2)
+
+    def boll(
+        self,
+        n: int,
+        dev: float,
+        array: bool = False
+    ) -> Union[Tuple[float, float], Tuple[np.ndarray, np.ndarray]]:
+        """
+        Bollinger Channel: (up, down)
+        """
+        indicator = self.get_indicator(("boll", n, dev), BollIndicator, n, dev)
+        if array:
+            return indicator.get_array(0), indicator.get_array(1)
+        return indicator.get_value(0), indicator.get_value(1)
+
+    def keltner(
+        self,
+        n: int,
+        dev: float,
+        array: bool = False
+    ) -> Union[Tuple[float, float], Tuple[np.ndarray, np.ndarray]]:
+        """
+        Keltner Channel: (up, down)
+        """
+        indicator = self.get_indicator(("keltner", n, dev), KeltnerIndicator, n, dev)
+        if array:
+            return indicator.get_array(0), indicator.get_array(1)
+        return indicator.get_value(0), indicator.get_value(1)
+
+    def donchian(
+        self,
+        n: int,
+        array: bool = False
+    ) -> Union[Tuple[float, float], Tuple[np.ndarray, np.ndarray]]:
+        """
+        Donchian Channel: (up, down)
+        """
+        indicator = self.get_indicator(("donchian", n), DonchianIndicator, n)
+        if array:
+            return indicator.get_array(0), indicator.get_array(1)
+        return indicator.get_value(0), indicator.get_value(1)
 
 def virtual(func: Callable) -> Callable:
     """
@@ -413,23 +1057,27 @@ def virtual(func: Callable) -> Callable:
     return func
 
 
-file_handlers: Dict[str, logging.FileHandler] = {}
+file_handlers: Dict[str, QueueLogHandler] = {}
 
 
-def _get_file_logger_handler(filename: str) -> logging.FileHandler:
+def _get_file_logger_handler(filename: str) -> QueueLogHandler:
     handler = file_handlers.get(filename, None)
     if handler is None:
-        handler = logging.FileHandler(filename)
+        writer = LogWriter()
+        writer.add_target(RotatingFileTarget(Path(filename), log_formatter))
+        writer.start()
+
+        handler = QueueLogHandler(writer)
         file_handlers[filename] = handler  # Am i need a lock?
     return handler
 
 
 def get_file_logger(filename: str) -> logging.Logger:
     """
-    return a logger that writes records into a file.
+    return a logger that writes records into a file. Records are written
+    by a background thread, and file is rolled over when it is too large.
     """
     logger = logging.getLogger(filename)
     handler = _get_file_logger_handler(filename)  # get singleton handler.
-    handler.setFormatter(log_formatter)
     logger.addHandler(handler)  # each handler will be added only once.
     return logger